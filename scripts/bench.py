@@ -0,0 +1,249 @@
+#!/usr/bin/env -S uv run
+
+"""
+Measure the throughput of the scanner over synthetic metadata corpora.
+
+A corpus of PyPI-like JSON files is generated for every size, mixing SPDX
+expressions, long embedded license texts and classifier heavy packages. Each
+corpus is measured in a fresh interpreter so the peak RSS reported belongs to
+that corpus alone.
+
+Stages:
+
+- scan: scan_directory, reading and decoding the JSON files
+- classify: PackageLicenses.licenses over the scanned packages
+- emit: the json and ndjson writers over the resulting records
+- cli: Application.run end to end, writing json to /dev/null
+- decode-<backend>: every installed backend of license_scanner.decoder over
+  the JSON files already in memory
+
+The bytes retained per package are reported as well, holding the results as
+PackageLicenses and as the compact PackageResult.
+
+Usage:
+
+```bash
+$ make bench
+$ uv run ./scripts/bench.py --sizes 1000 10000
+```
+
+Results are printed and saved as JSON under `.cache/bench/` unless --output is
+given, so runs of different releases can be compared.
+"""
+
+import gc
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import SUPPRESS, ArgumentParser, RawDescriptionHelpFormatter
+from contextlib import redirect_stdout
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+import trove_classifiers
+
+from license_scanner.__about__ import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+ROOT_DIR = Path(__file__).parent.parent
+SIZES = (1_000, 10_000, 100_000)
+
+EXPRESSIONS = (
+    "MIT",
+    "Apache-2.0",
+    "BSD-3-Clause",
+    "BSD-2-Clause",
+    "ISC",
+    "MPL-2.0",
+    "GPL-3.0-or-later",
+    "LGPL-2.1-only",
+    "MIT OR Apache-2.0",
+    "(MIT OR Apache-2.0) AND BSD-3-Clause",
+    "Apache-2.0 WITH LLVM-exception",
+    "mit",
+    "MIT License",
+    "BSD",
+    "Proprietary",
+)
+
+PARAGRAPH = (
+    "Permission is hereby granted, free of charge, to any person obtaining a "
+    "copy of this software and associated documentation files (the "
+    '"Software"), to deal in the Software without restriction, including '
+    "without limitation the rights to use, copy, modify, merge, publish, "
+    "distribute, sublicense, and/or sell copies of the Software.\n\n"
+)
+
+
+def generate(directory: Path, size: int, seed: int = 0) -> None:
+    rng = random.Random(seed)  # noqa: S311
+    classifiers = sorted(trove_classifiers.classifiers)
+    licenses = [c for c in classifiers if c.startswith("License")]
+    texts = [
+        f"Copyright (c) {year} Example Authors\n\n" + PARAGRAPH * rng.randint(2, 40)
+        for year in range(2000, 2020)
+    ]
+
+    for number in range(size):
+        package: dict[str, object] = {
+            "name": f"package-{number}",
+            "version": f"{rng.randint(0, 9)}.{rng.randint(0, 30)}.0",
+            "license": None,
+            "license_expression": None,
+            "classifiers": [],
+            "description": PARAGRAPH * rng.randint(0, 50),
+        }
+
+        kind = rng.random()
+        if kind < 0.4:  # noqa: PLR2004
+            package["license_expression"] = rng.choice(EXPRESSIONS)
+        elif kind < 0.6:  # noqa: PLR2004
+            package["license"] = rng.choice(texts)
+        elif kind < 0.9:  # noqa: PLR2004
+            package["classifiers"] = [
+                *rng.sample(licenses, rng.randint(1, 3)),
+                *rng.sample(classifiers, rng.randint(20, 40)),
+            ]
+        else:
+            package["license"] = rng.choice(EXPRESSIONS)
+
+        (directory / f"package-{number}.json").write_text(json.dumps(package))
+
+
+def measure(directory: Path) -> dict[str, dict[str, dict[str, float]]]:
+    from license_scanner import PackageLicenses, PackageResult
+    from license_scanner.cli import Application
+    from license_scanner.decoder import DECODERS, get_decoder
+    from license_scanner.scanner import scan_directory
+    from license_scanner.writers import WRITERS
+
+    results: dict[str, dict[str, float]] = {}
+
+    def stage(name: str, count: int, func: "Callable[[], T]") -> T:
+        start = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "seconds": elapsed,
+            "packages_per_second": count / elapsed if elapsed else 0.0,
+            "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        return value
+
+    count = sum(1 for _ in directory.glob("*.json"))
+    packages = stage("scan", count, lambda: list(scan_directory(directory)))
+    stage("classify", count, lambda: [p.licenses for p in packages])
+
+    records = [
+        {
+            "package-name": p.name,
+            "package-version": p.version,
+            "license": lic.text,
+            "source": lic.source.capitalize(),
+            "state": lic.state.upper(),
+            "canonical": lic.canonical,
+            "confidence": lic.confidence,
+        }
+        for p in packages
+        for lic in p.licenses
+    ]
+    with Path(os.devnull).open("w") as devnull:
+        for name, write in WRITERS.items():
+            if name == "arrow" and find_spec("pyarrow") is None:
+                continue
+            stage(f"emit-{name}", count, lambda w=write: w(iter(records), devnull))
+        with redirect_stdout(devnull):
+            stage("cli", count, Application(directory).run)
+
+    def package_licenses() -> list[PackageLicenses]:
+        packages = list(scan_directory(directory))
+        for package in packages:
+            _ = package.licenses
+        return packages
+
+    def package_results() -> list[PackageResult]:
+        return [package.result() for package in scan_directory(directory)]
+
+    memory = {
+        "package_licenses_bytes": footprint(package_licenses) / count,
+        "package_result_bytes": footprint(package_results) / count,
+    }
+
+    # Last, holding every file in memory must not count in the peak RSS of
+    # the other stages.
+    contents = [path.read_bytes() for path in sorted(directory.glob("*.json"))]
+    for name in filter(find_spec, DECODERS):
+        decode = get_decoder(name)
+        stage(f"decode-{name}", count, lambda d=decode: list(map(d, contents)))
+
+    return {"stages": results, "memory": memory}
+
+
+def footprint(func: "Callable[[], object]") -> int:
+    # Bytes still allocated when func returns, that is, held by its result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = func()
+        size, _ = tracemalloc.get_traced_memory()
+        del value
+    finally:
+        tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    argp = ArgumentParser(
+        description=__doc__, formatter_class=RawDescriptionHelpFormatter
+    )
+    argp.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    argp.add_argument("--output", type=Path)
+    argp.add_argument("--measure", type=Path, help=SUPPRESS)
+    args = argp.parse_args()
+
+    if args.measure:
+        json.dump(measure(args.measure), sys.stdout)
+        return
+
+    report: dict[str, object] = {"version": __version__, "corpora": {}}
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            generate(directory, size)
+            result = subprocess.run(  # noqa: S603
+                [sys.executable, __file__, "--measure", str(directory)],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+        measured = json.loads(result.stdout)
+        report["corpora"][str(size)] = measured  # type: ignore[index]
+
+        for name, values in measured["stages"].items():
+            print(
+                f"{size:>8} {name:<14} {values['seconds']:>8.3f}s "
+                f"{values['packages_per_second']:>12.0f} pkg/s "
+                f"{values['peak_rss_kib'] / 1024:>8.1f} MiB"
+            )
+        for name, value in measured["memory"].items():
+            print(f"{size:>8} {name:<24} {value:>8.0f} bytes/package")
+
+    output = args.output or ROOT_DIR / ".cache" / "bench" / f"{__version__}.json"
+    output.parent.mkdir(exist_ok=True, parents=True)
+    output.write_text(json.dumps(report, indent=4))
+    print(f"results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,52 +22,35 @@ $ uv run ./scripts/generate-test-data.py
 This script is meant to be run from the root of the repository.
 """
 
+import asyncio
 from json import dumps as jsondumps
 from pathlib import Path
 
-from packaging.requirements import InvalidRequirement, Requirement
-
-from license_scanner.pypi import Client
+from license_scanner.pypi import AsyncClient
 
 ROOT_DIR = Path(__file__).parent.parent
 
 
-def main() -> None:
+async def main() -> None:
     metadata_dir = ROOT_DIR / "tests" / "top100"
     metadata_dir.mkdir(exist_ok=True, parents=True)
 
-    visited: set[str] = set()
-
-    with Client() as pypi:
-
-        def save_package_metadata(package: str) -> None:
-            if package in visited:
-                return
-
-            metadata = pypi.get_package(package)
-            package_json = jsondumps(metadata._asdict(), indent=4)
-            package_file = metadata_dir / f"{package}.json"
-            package_file.write_text(package_json)
-
-            visited.add(package)
+    cache_dir = ROOT_DIR / ".cache" / "pypi"
+    cache_dir.mkdir(exist_ok=True, parents=True)
 
-            # We don't try to parse requirements correctly, just to ignore
-            # development dependencies to keep the whole list managable.
-            for requirement in metadata.requires_dist or []:
-                try:
-                    if not (r := Requirement(requirement)).marker:
-                        save_package_metadata(r.name)
-                except InvalidRequirement:
-                    pass
+    async with AsyncClient(cache_directory=cache_dir) as pypi:
+        stats = await pypi.get_stats()
+        packages = await pypi.crawl(stats.top_packages)
 
-        stats = pypi.get_stats()
-        for package in stats.top_packages:
-            print(package, len(visited))
-            save_package_metadata(package)
+    for package, metadata in packages.items():
+        print(package)
+        package_json = jsondumps(metadata._asdict(), indent=4)
+        package_file = metadata_dir / f"{package}.json"
+        package_file.write_text(package_json)
 
 
 if __name__ == "__main__":
     from contextlib import suppress
 
     with suppress(KeyboardInterrupt):
-        main()
+        asyncio.run(main())
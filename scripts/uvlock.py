@@ -2,34 +2,29 @@
 
 import json
 import pathlib
-import tomllib
 
-from license_scanner.pypi import Client
+from license_scanner.lockfile import read_lockfile
+from license_scanner.pypi import fetch_releases
 
 ROOT_DIR = pathlib.Path(__file__).parent.parent
 UVLOCK_FILE = pathlib.Path(ROOT_DIR) / "uv.lock"
 
 
-def uvlock_packages() -> list[str]:
-    with UVLOCK_FILE.open(mode="rb") as fd:
-        return [p["name"] for p in tomllib.load(fd)["package"]]
-
-
 def main() -> None:
     metadata_dir = ROOT_DIR / "tests" / "uvlock"
     metadata_dir.mkdir(exist_ok=True, parents=True)
 
-    with Client() as pypi:
-
-        def save_package_metadata(package: str) -> None:
-            metadata = pypi.get_package(package)
-            package_json = json.dumps(metadata._asdict(), indent=4)
-            package_file = metadata_dir / f"{package}.json"
-            package_file.write_text(package_json)
-
-        for package in uvlock_packages():
-            print(package)
-            save_package_metadata(package)
+    cache_dir = ROOT_DIR / ".cache" / "pypi"
+    cache_dir.mkdir(exist_ok=True, parents=True)
+
+    releases = fetch_releases(read_lockfile(UVLOCK_FILE), cache_dir)
+    for (package, _), metadata in releases.items():
+        if metadata is None:
+            continue
+        print(package)
+        package_json = json.dumps(metadata._asdict(), indent=4)
+        package_file = metadata_dir / f"{package}.json"
+        package_file.write_text(package_json)
 
 
 if __name__ == "__main__":
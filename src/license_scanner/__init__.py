@@ -1,13 +1,28 @@
+import sys
 from dataclasses import dataclass
 from enum import StrEnum, auto
 from functools import cached_property
-from hashlib import sha256
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
-import packaging.licenses
-import trove_classifiers
+from license_scanner.instrument import stage
+from license_scanner.spdx import canonicalize, parse
 
-__all__ = ("License", "LicenseSource", "LicenseState", "PackageLicenses")
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from importlib.metadata import Distribution
+    from typing import Any
+
+    from license_scanner.matcher import Match
+    from license_scanner.spdx import And, Leaf, Or
+
+__all__ = (
+    "License",
+    "LicenseSource",
+    "LicenseState",
+    "PackageLicenses",
+    "PackageResult",
+    "classify_batch",
+)
 
 
 class LicenseSource(StrEnum):
@@ -29,6 +44,34 @@ class License(NamedTuple):
     text: str
     source: LicenseSource
     state: LicenseState
+    canonical: str | None = None
+    confidence: float | None = None
+
+    @property
+    def expression(self) -> "Leaf | And | Or | None":
+        # Parsed on first use, the tree is shared by every equal expression.
+        # A canonical with a confidence is a guess of the matcher, not an
+        # expression declared by the package.
+        if self.canonical is None or self.confidence is not None:
+            return None
+        return parse(self.canonical)
+
+
+class PackageResult(NamedTuple):
+    """
+    Memory-lean form of a classified package, see `PackageLicenses.result`.
+    Strings are interned, License values are shared between results and the
+    classifiers are not kept.
+    """
+
+    name: str
+    version: str
+    license: str | None
+    licenses: tuple[License, ...]
+
+
+# Distinct License values are few, results share them through this table.
+_LICENSES: dict[License, License] = {}
 
 
 @dataclass
@@ -45,6 +88,26 @@ class PackageLicenses:
 
     @cached_property
     def licenses(self) -> list[License]:
+        with stage("classify"):
+            return self._classify()
+
+    @cached_property
+    def metadata_digest(self) -> str:
+        # Hash of the fields the licenses are classified from, packages with
+        # the same digest have the same licenses.
+        import hashlib
+        import json
+
+        fields = [
+            self.name,
+            self.version,
+            self.license,
+            self.license_expression,
+            self.classifiers,
+        ]
+        return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+    def _classify(self) -> list[License]:
         if lic := self._parse_license_expression():
             return [lic]
         if lic := self._parse_license():
@@ -53,61 +116,153 @@ class PackageLicenses:
             return lic
         return [License("UNKNOWN", LicenseSource.UNKNOWN, LicenseState.UNKNOWN)]
 
+    def result(self) -> PackageResult:
+        return PackageResult(
+            sys.intern(self.name),
+            sys.intern(self.version),
+            sys.intern(self.license) if self.license else self.license,
+            tuple(_LICENSES.setdefault(lic, lic) for lic in self.licenses),
+        )
+
     def _parse_license_expression(self) -> License | None:
         if self.license_expression:
-            valid = self._parse_spdx_expression(self.license_expression)
+            canonical = self._parse_spdx_expression(self.license_expression)
             return License(
                 self.license_expression,
                 LicenseSource.EXPRESSION,
-                LicenseState.VALID if valid else LicenseState.INVALID,
+                LicenseState.VALID if canonical else LicenseState.INVALID,
+                canonical,
             )
         return None
 
     def _parse_license(self) -> License | None:
         if self.license:
-            if self._parse_spdx_expression(self.license):
-                return License(self.license, LicenseSource.LICENSE, LicenseState.VALID)
+            if canonical := self._parse_spdx_expression(self.license):
+                return License(
+                    self.license, LicenseSource.LICENSE, LicenseState.VALID, canonical
+                )
 
             if len(self.license) >= self.FILE_DETECTION_CUTOFF:
                 digest = self._hash_license()
+                match = self._match_license()
                 return License(
-                    f"sha256:{digest}", LicenseSource.LICENSE, LicenseState.AMBIGUOUS
+                    f"sha256:{digest}",
+                    LicenseSource.LICENSE,
+                    LicenseState.AMBIGUOUS,
+                    match.identifier if match else None,
+                    match.confidence if match else None,
                 )
             return License(self.license, LicenseSource.LICENSE, LicenseState.AMBIGUOUS)
         return None
 
     def _parse_classifiers(self) -> list[License]:
+        from license_scanner.classifiers import classifier_index
+
+        index = classifier_index()
         licenses: list[License] = []
-        for classifier in self.classifiers:
-            if classifier.startswith(self.CLASSIFIER_PREFIX):
-                if classifier in trove_classifiers.classifiers:
-                    text = classifier.split(self.CLASSIFIER_SEPARATOR)[-1].strip()
-                    licenses.append(
-                        License(text, LicenseSource.CLASSIFIER, LicenseState.VALID)
-                    )
-                    continue
-                if classifier in trove_classifiers.deprecated_classifiers:
-                    text = classifier.split(self.CLASSIFIER_SEPARATOR)[-1].strip()
+        with stage("classifiers"):
+            for classifier in self.classifiers:
+                if lic := index.get(classifier):
+                    licenses.append(lic)
+                elif classifier.startswith(self.CLASSIFIER_PREFIX):
                     licenses.append(
-                        License(text, LicenseSource.CLASSIFIER, LicenseState.DEPRECATED)
+                        License(
+                            classifier, LicenseSource.CLASSIFIER, LicenseState.INVALID
+                        )
                     )
-                    continue
-                licenses.append(
-                    License(classifier, LicenseSource.CLASSIFIER, LicenseState.INVALID)
-                )
         return licenses
 
-    def _parse_spdx_expression(self, expression: str) -> bool:
-        try:
-            packaging.licenses.canonicalize_license_expression(expression)
-        except packaging.licenses.InvalidLicenseExpression:
-            return False
-        else:
-            return True
+    def _parse_spdx_expression(self, expression: str) -> str | None:
+        with stage("spdx"):
+            return canonicalize(expression)
+
+    def _match_license(self) -> "Match | None":
+        from license_scanner.matcher import identify
+
+        assert self.license is not None  # noqa: S101
+        with stage("match"):
+            return identify(self.license)
 
     def _hash_license(self) -> str:
+        from hashlib import sha256
+
         # This method is only called when a license is of certain length.
         # self.license should never be None here.
         assert self.license is not None  # noqa: S101
         text = self.license or ""
-        return sha256(text.encode()).hexdigest()
+        with stage("hash"):
+            return sha256(text.encode()).hexdigest()
+
+
+if TYPE_CHECKING:
+    Record = (
+        PackageLicenses
+        | Mapping[str, Any]
+        | tuple[str, str, str | None, str | None, list[str]]
+        | Distribution
+    )
+
+
+def classify_batch(records: "Iterable[Record]") -> list[PackageResult]:
+    """
+    Classify many packages at once, the results are in the order of records.
+
+    Records are PackageLicenses, dicts with the keys of the PyPI JSON files,
+    (name, version, license, license_expression, classifiers) tuples or
+    importlib.metadata distributions. The licenses are decided by the license
+    expression, or the license when there is none, or else the classifiers.
+    Each distinct value of that field is classified once and its result is
+    shared by every package with it.
+    """
+    classified: dict[tuple[str, object], tuple[License, ...]] = {}
+    results: list[PackageResult] = []
+    for record in records:
+        package = _as_package(record)
+        key = _classification_key(package)
+        if (licenses := classified.get(key)) is None:
+            licenses = classified[key] = package.result().licenses
+        results.append(
+            PackageResult(
+                sys.intern(package.name),
+                sys.intern(package.version),
+                sys.intern(package.license) if package.license else package.license,
+                licenses,
+            )
+        )
+    return results
+
+
+def _classification_key(package: PackageLicenses) -> tuple[str, object]:
+    # The first field set decides the licenses, the others are never looked at
+    if package.license_expression:
+        return "expression", package.license_expression
+    if package.license:
+        return "license", package.license
+    return "classifiers", tuple(package.classifiers)
+
+
+def _as_package(record: "Record") -> PackageLicenses:
+    from collections.abc import Mapping
+
+    if isinstance(record, PackageLicenses):
+        return record
+    if isinstance(record, Mapping):
+        return PackageLicenses(
+            name=record.get("name", ""),
+            version=record.get("version", ""),
+            license=record.get("license", None),
+            license_expression=record.get("license_expression", None),
+            classifiers=record.get("classifiers", []),
+        )
+    if isinstance(record, tuple):
+        return PackageLicenses(*record)
+
+    from importlib.metadata import Distribution
+
+    if isinstance(record, Distribution):
+        from license_scanner.scanner import read_distribution
+
+        return read_distribution(record)
+
+    message = f"can't classify a {type(record).__name__}"
+    raise TypeError(message)
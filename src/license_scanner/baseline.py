@@ -0,0 +1,105 @@
+import json
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+    from typing import Self
+
+    from license_scanner import PackageLicenses
+
+    Record = dict[str, str | float | None]
+    Key = tuple[str | float | None, ...]
+
+__all__ = ("COMPARED_FIELDS", "Baseline", "BaselineError")
+
+# Fields that tell whether the licenses of a package changed. Other fields are
+# left out so baselines written by older versions can still be compared.
+COMPARED_FIELDS = ("license", "source", "state")
+
+
+class BaselineError(Exception):
+    pass
+
+
+class Baseline:
+    """
+    Records of a previous run indexed by (environment, package-name,
+    package-version). The environment is only present when scanning
+    site-packages directories, it is None otherwise.
+
+    `diff` consumes the packages of the current run and yields the records of
+    what changed. Packages whose metadata digest matches the one recorded are
+    unchanged and never classified. Every record yielded has a `change` field
+    set to one of `added`, `changed` or `removed`.
+    """
+
+    def __init__(self, records: "Iterable[Record]") -> None:
+        self._index: dict[Key, list[Record]] = {}
+        for record in records:
+            try:
+                key = self._key(record)
+            except (AttributeError, KeyError, TypeError):
+                message = f"invalid record: {record!r}"
+                raise BaselineError(message) from None
+            self._index.setdefault(key, []).append(record)
+
+    @classmethod
+    def load(cls, path: "Path") -> "Self":
+        # Accepts the output of both the json and the ndjson formats
+        try:
+            with path.open(encoding="utf-8") as fd:
+                if fd.read(1) == "[":
+                    fd.seek(0)
+                    records = json.load(fd)
+                else:
+                    fd.seek(0)
+                    records = [json.loads(line) for line in fd if line.strip()]
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise BaselineError(str(exc)) from None
+        return cls(records)
+
+    def diff(
+        self,
+        packages: "Iterable[tuple[PackageLicenses, Path | None]]",
+        records: "Callable[[PackageLicenses, Path | None], list[Record]]",
+    ) -> "Iterator[list[Record]]":
+        seen: set[Key] = set()
+        for package, environment in packages:
+            key = (
+                None if environment is None else str(environment),
+                package.name,
+                package.version,
+            )
+            seen.add(key)
+            previous = self._index.get(key)
+            if previous and all(
+                r.get("metadata-digest") == package.metadata_digest for r in previous
+            ):
+                continue
+            current = records(package, environment)
+            if previous is None:
+                yield self._mark(current, "added")
+            elif self._licenses(previous) != self._licenses(current):
+                yield self._mark(current, "changed")
+
+        for key, previous in self._index.items():
+            if key not in seen:
+                yield self._mark(previous, "removed")
+
+    @staticmethod
+    def _key(record: "Record") -> "Key":
+        return (
+            record.get("environment"),
+            record["package-name"],
+            record["package-version"],
+        )
+
+    @staticmethod
+    def _licenses(records: "list[Record]") -> "Counter[tuple[str | None, ...]]":
+        return Counter(tuple(r.get(f) for f in COMPARED_FIELDS) for r in records)
+
+    @staticmethod
+    def _mark(records: "list[Record]", change: str) -> "list[Record]":
+        return [{**record, "change": change} for record in records]
@@ -0,0 +1,202 @@
+import json
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Self
+
+from license_scanner import License, LicenseSource, LicenseState, PackageLicenses
+
+if TYPE_CHECKING:
+    from os import stat_result
+
+__all__ = ("CACHE_FILE", "CACHE_VERSION", "CacheError", "MemoryCache", "ResultCache")
+
+CACHE_FILE = "results.sqlite3"
+
+# Primary result codes of a file that is not a database, or a damaged one
+CORRUPT = (sqlite3.SQLITE_CORRUPT, sqlite3.SQLITE_NOTADB)
+
+# Seconds to wait for another process holding a lock on the cache
+LOCK_TIMEOUT = 5.0
+
+# Bump when the classification rules or the stored layout change. The versions
+# of packaging and trove-classifiers are checked as well, since the results
+# depend on the SPDX and classifier lists they ship.
+CACHE_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    package TEXT NOT NULL
+);
+"""
+
+
+class CacheError(Exception):
+    pass
+
+
+class ResultCache:
+    """
+    Classified packages keyed by the path of their metadata directory.
+
+    An entry is only used while the mtime and size of the metadata file match
+    the ones recorded with it. Entries for directories that no longer exist
+    are removed by `evict`.
+
+    Every change is committed right away, a scan never holds the write lock
+    while it classifies, so processes sharing the cache only wait for each
+    other's writes. Database errors are raised as CacheError.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        try:
+            try:
+                self._db = self._connect(path)
+            except sqlite3.DatabaseError as exc:
+                # A cache can always be rebuilt, a corrupt one is just
+                # discarded. Any other error, e.g. a lock held by another
+                # process sharing the cache, leaves the file alone.
+                if exc.sqlite_errorcode & 0xFF not in CORRUPT:
+                    raise
+                path.unlink()
+                self._db = self._connect(path)
+        except sqlite3.Error as exc:
+            message = f"Can't open cache {path}. {exc}"
+            raise CacheError(message) from None
+        self._seen: set[str] = set()
+
+    def get(self, path: str, stat: "stat_result") -> PackageLicenses | None:
+        self._seen.add(path)
+        try:
+            row = self._db.execute(
+                "SELECT package FROM results"
+                " WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            raise self._error(exc) from None
+        return self._decode(row[0]) if row else None
+
+    def put(self, path: str, stat: "stat_result", package: PackageLicenses) -> None:
+        self._seen.add(path)
+        try:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, self._encode(package)),
+                )
+        except sqlite3.Error as exc:
+            raise self._error(exc) from None
+
+    def evict(self) -> None:
+        try:
+            rows = self._db.execute("SELECT path FROM results").fetchall()
+            stale = [
+                (path,)
+                for (path,) in rows
+                if path not in self._seen and not Path(path).exists()
+            ]
+            with self._db:
+                self._db.executemany("DELETE FROM results WHERE path = ?", stale)
+        except sqlite3.Error as exc:
+            raise self._error(exc) from None
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _error(self, exc: sqlite3.Error) -> CacheError:
+        return CacheError(f"Can't use cache {self._path}. {exc}")
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        import importlib.metadata
+
+        fingerprint = ":".join(
+            (
+                str(CACHE_VERSION),
+                importlib.metadata.version("packaging"),
+                importlib.metadata.version("trove-classifiers"),
+            )
+        )
+
+        db = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        try:
+            db.executescript(SCHEMA)
+            row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != fingerprint:
+                db.execute("DELETE FROM results")
+                db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (fingerprint,)
+                )
+                db.commit()
+        except sqlite3.DatabaseError:
+            db.close()
+            raise
+        return db
+
+    @staticmethod
+    def _encode(package: PackageLicenses) -> str:
+        return json.dumps(
+            [
+                package.name,
+                package.version,
+                package.license,
+                package.license_expression,
+                package.classifiers,
+                package.licenses,
+            ]
+        )
+
+    @staticmethod
+    def _decode(data: str) -> PackageLicenses:
+        *fields, licenses = json.loads(data)
+        package = PackageLicenses(*fields)
+        package.licenses = [
+            License(
+                text, LicenseSource(source), LicenseState(state), canonical, confidence
+            )
+            for text, source, state, canonical, confidence in licenses
+        ]
+        return package
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        typ: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class MemoryCache:
+    """
+    Same as ResultCache, kept in memory by a process that scans many times,
+    e.g. the server. The PackageLicenses are kept as they are, no copies.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[str, tuple[int, int, PackageLicenses]] = {}
+
+    def get(self, path: str, stat: "stat_result") -> PackageLicenses | None:
+        mtime_ns, size, package = self._results.get(path, (None, None, None))
+        if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+            return package
+        return None
+
+    def put(self, path: str, stat: "stat_result", package: PackageLicenses) -> None:
+        self._results[path] = (stat.st_mtime_ns, stat.st_size, package)
+
+    def evict(self) -> None:
+        for path in [path for path in self._results if not Path(path).exists()]:
+            del self._results[path]
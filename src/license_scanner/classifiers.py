@@ -0,0 +1,151 @@
+from functools import cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import trove_classifiers
+
+from license_scanner import License, LicenseSource, LicenseState, PackageLicenses
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+__all__ = ("SPDX_IDENTIFIERS", "classifier_index")
+
+# Only classifiers that name a single SPDX license are listed. Classifiers like
+# "BSD License" or "Apache Software License" do not state a version and are
+# left without an identifier.
+SPDX_IDENTIFIERS: "Mapping[str, str]" = MappingProxyType(
+    {
+        "License :: Aladdin Free Public License (AFPL)": "Aladdin",
+        "License :: CC0 1.0 Universal (CC0 1.0) Public Domain Dedication": "CC0-1.0",
+        "License :: CeCILL-B Free Software License Agreement (CECILL-B)": "CECILL-B",
+        "License :: CeCILL-C Free Software License Agreement (CECILL-C)": "CECILL-C",
+        "License :: Nokia Open Source License (NOKOS)": "Nokia",
+        "License :: OSI Approved :: Attribution Assurance License": "AAL",
+        "License :: OSI Approved :: Blue Oak Model License (BlueOak-1.0.0)": (
+            "BlueOak-1.0.0"
+        ),
+        "License :: OSI Approved :: Boost Software License 1.0 (BSL-1.0)": "BSL-1.0",
+        (
+            "License :: OSI Approved :: "
+            "CEA CNRS Inria Logiciel Libre License, version 2.1 (CeCILL-2.1)"
+        ): "CECILL-2.1",
+        "License :: OSI Approved :: CMU License (MIT-CMU)": "MIT-CMU",
+        (
+            "License :: OSI Approved :: "
+            "Common Development and Distribution License 1.0 (CDDL-1.0)"
+        ): "CDDL-1.0",
+        "License :: OSI Approved :: Eclipse Public License 1.0 (EPL-1.0)": "EPL-1.0",
+        "License :: OSI Approved :: Eclipse Public License 2.0 (EPL-2.0)": "EPL-2.0",
+        (
+            "License :: OSI Approved :: "
+            "Educational Community License, Version 2.0 (ECL-2.0)"
+        ): "ECL-2.0",
+        "License :: OSI Approved :: European Union Public Licence 1.0 (EUPL 1.0)": (
+            "EUPL-1.0"
+        ),
+        "License :: OSI Approved :: European Union Public Licence 1.1 (EUPL 1.1)": (
+            "EUPL-1.1"
+        ),
+        "License :: OSI Approved :: European Union Public Licence 1.2 (EUPL 1.2)": (
+            "EUPL-1.2"
+        ),
+        "License :: OSI Approved :: GNU Affero General Public License v3": (
+            "AGPL-3.0-only"
+        ),
+        (
+            "License :: OSI Approved :: "
+            "GNU Affero General Public License v3 or later (AGPLv3+)"
+        ): "AGPL-3.0-or-later",
+        "License :: OSI Approved :: GNU General Public License v2 (GPLv2)": (
+            "GPL-2.0-only"
+        ),
+        "License :: OSI Approved :: GNU General Public License v2 or later (GPLv2+)": (
+            "GPL-2.0-or-later"
+        ),
+        "License :: OSI Approved :: GNU General Public License v3 (GPLv3)": (
+            "GPL-3.0-only"
+        ),
+        "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)": (
+            "GPL-3.0-or-later"
+        ),
+        "License :: OSI Approved :: GNU Lesser General Public License v2 (LGPLv2)": (
+            "LGPL-2.0-only"
+        ),
+        (
+            "License :: OSI Approved :: "
+            "GNU Lesser General Public License v2 or later (LGPLv2+)"
+        ): "LGPL-2.0-or-later",
+        "License :: OSI Approved :: GNU Lesser General Public License v3 (LGPLv3)": (
+            "LGPL-3.0-only"
+        ),
+        (
+            "License :: OSI Approved :: "
+            "GNU Lesser General Public License v3 or later (LGPLv3+)"
+        ): "LGPL-3.0-or-later",
+        (
+            "License :: OSI Approved :: "
+            "Historical Permission Notice and Disclaimer (HPND)"
+        ): "HPND",
+        "License :: OSI Approved :: IBM Public License": "IPL-1.0",
+        "License :: OSI Approved :: ISC License (ISCL)": "ISC",
+        "License :: OSI Approved :: MIT License": "MIT",
+        "License :: OSI Approved :: MIT No Attribution License (MIT-0)": "MIT-0",
+        "License :: OSI Approved :: MirOS License (MirOS)": "MirOS",
+        "License :: OSI Approved :: Motosoto License": "Motosoto",
+        "License :: OSI Approved :: Mozilla Public License 1.0 (MPL)": "MPL-1.0",
+        "License :: OSI Approved :: Mozilla Public License 1.1 (MPL 1.1)": "MPL-1.1",
+        "License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)": "MPL-2.0",
+        (
+            "License :: OSI Approved :: "
+            "Mulan Permissive Software License v2 (MulanPSL-2.0)"
+        ): "MulanPSL-2.0",
+        "License :: OSI Approved :: NASA Open Source Agreement v1.3 (NASA-1.3)": (
+            "NASA-1.3"
+        ),
+        "License :: OSI Approved :: Nethack General Public License": "NGPL",
+        "License :: OSI Approved :: Nokia Open Source License": "Nokia",
+        "License :: OSI Approved :: Open Group Test Suite License": "OGTSL",
+        "License :: OSI Approved :: Open Software License 3.0 (OSL-3.0)": "OSL-3.0",
+        "License :: OSI Approved :: PostgreSQL License": "PostgreSQL",
+        "License :: OSI Approved :: Python License (CNRI Python License)": (
+            "CNRI-Python"
+        ),
+        "License :: OSI Approved :: Python Software Foundation License": "PSF-2.0",
+        "License :: OSI Approved :: Ricoh Source Code Public License": "RSCPL",
+        "License :: OSI Approved :: SIL Open Font License 1.1 (OFL-1.1)": "OFL-1.1",
+        "License :: OSI Approved :: Sleepycat License": "Sleepycat",
+        "License :: OSI Approved :: Sun Public License": "SPL-1.0",
+        "License :: OSI Approved :: The Unlicense (Unlicense)": "Unlicense",
+        "License :: OSI Approved :: Universal Permissive License (UPL)": "UPL-1.0",
+        "License :: OSI Approved :: University of Illinois/NCSA Open Source License": (
+            "NCSA"
+        ),
+        "License :: OSI Approved :: Vovida Software License 1.0": "VSL-1.0",
+        "License :: OSI Approved :: W3C License": "W3C",
+        "License :: OSI Approved :: Zero-Clause BSD (0BSD)": "0BSD",
+        "License :: OSI Approved :: zlib/libpng License": "Zlib",
+    }
+)
+
+
+@cache
+def classifier_index() -> "Mapping[str, License]":
+    # Built once per process. Every license classifier maps to the License
+    # reported for it, so classification is a single lookup per classifier.
+    index: dict[str, License] = {}
+
+    def add(classifiers: "Iterable[str]", state: LicenseState) -> None:
+        for classifier in classifiers:
+            if classifier.startswith(PackageLicenses.CLASSIFIER_PREFIX):
+                text = classifier.split(PackageLicenses.CLASSIFIER_SEPARATOR)[-1]
+                index[classifier] = License(
+                    text.strip(),
+                    LicenseSource.CLASSIFIER,
+                    state,
+                    SPDX_IDENTIFIERS.get(classifier),
+                )
+
+    add(trove_classifiers.deprecated_classifiers, LicenseState.DEPRECATED)
+    add(trove_classifiers.classifiers, LicenseState.VALID)
+    return MappingProxyType(index)
@@ -12,6 +12,7 @@ Rules:
 - Trove classifiers may be reported multiple times
 - Large text (>1k) is considered a license file and stored if requested
 - Large text is considered AMBIGUOUS, meaning we don't know what they are
+- Large text is compared with the texts of common licenses to suggest one
 
 License Sources:
 
@@ -25,6 +26,102 @@ License States:
 - DEPRECATED: A deprecated trove classifier is used
 - INVALID: An invalid license expression or trove classifier
 - VALID: A valid license expression or trove classifier
+
+The canonical field holds the normalized SPDX expression of valid licenses,
+or the SPDX identifier of a classifier naming a single license. It is null
+otherwise.
+
+For large text, canonical holds the SPDX identifier of the bundled license
+text it is closest to, if any, and the confidence field how close it is, from
+0.8 to 1.0. The text is still reported as AMBIGUOUS. Case, punctuation,
+whitespace and copyright lines are ignored when comparing. The bundled texts
+are 0BSD, Apache-2.0, BSD-2-Clause, BSD-3-Clause, GPL-2.0-only, GPL-3.0-only,
+ISC, LGPL-2.1-only, LGPL-3.0-only, MIT, MIT-0, MPL-2.0, Unlicense and Zlib.
+The text of a GPL or LGPL license does not tell whether later versions are
+allowed, it is reported as the -only identifier.
+
+With --archive-directory the wheels (.whl) and sdists (.tar.gz, .tgz,
+.tar.bz2, .zip) in a directory are scanned without extracting them. Only the
+metadata file of each archive is read.
+
+With --site-packages the packages installed in other environments are
+scanned instead, without starting their interpreters. The flag may be repeated
+and environments are scanned concurrently. Records get an environment field
+with the path they were found in. Packages with identical metadata in several
+environments are classified once.
+
+With --lockfile the packages pinned by a lockfile are reported instead:
+uv.lock, pylock.toml or a requirements file with every requirement pinned.
+Each one is looked up by name and version in --input-directory, as
+<name>-<version>.json or <name>.json, without listing the directory. With
+--fetch-missing the ones not found are fetched from PyPI, packages found
+nowhere are reported as UNKNOWN.
+
+Directories with many files are expensive to list and read on every run. With
+--index FILE and --input-directory the directory is ingested into a single
+SQLite file, only files changed since the previous run are read again. With
+--index FILE alone the packages are read from the index, without touching the
+directory. Lockfiles are resolved against the index when one is given.
+
+Installed packages rarely change between runs. With --cache-dir the results
+are cached and a package is only read again when its metadata file changes.
+
+With --baseline only the differences with the output of a previous run are
+reported. Packages are matched by environment, name and version, and each
+record gets a change field: added, changed or removed. Records carry a
+metadata-digest field, packages whose digest is the one in the baseline are
+not classified again.
+
+With --policy FILE every license is checked against a TOML policy of the
+SPDX identifiers and states accepted:
+
+    allow = ["MIT", "Apache-2.0", "BSD-*"]
+    deny = ["GPL-*", "AGPL-*", "LGPL-*"]
+    deny-states = ["INVALID", "AMBIGUOUS"]
+
+    [exceptions]
+    example-package = ["GPL-3.0-or-later"]
+
+Patterns ending in * match any identifier starting with them. Expressions are
+accepted when the identifiers allowed satisfy them, MIT OR GPL-3.0-only passes
+the policy above. Records get a violation field, the reason a license breaks
+the policy or null, and the exit status is 3 when any does. Only the records
+reported count, with --baseline those of the packages added or changed. With
+--fail-fast the scan stops at the first violation.
+
+With --profile the time spent in each stage of the scan, reading, decoding,
+classifying, hashing, writing license files..., is printed to stderr when it
+ends: the number of times it ran, the total, and the 50th and 99th
+percentiles. --profile-trace FILE writes every stage run as a Chrome trace,
+to be opened with chrome://tracing or Perfetto. Stages run by the --jobs
+worker processes are not measured.
+
+With `license-scanner serve --socket PATH` a resident process answers scans
+over a Unix socket, keeping its caches warm between them. With
+`license-scanner --connect PATH ARGS...` the scan described by ARGS is done by
+that process instead, paths are relative to the current directory. Installed
+packages are the ones of the environment the server runs in.
+
+With `license-scanner watch` an input directory or site-packages directories
+are scanned once and then watched, with inotify where available. Only the
+packages added, removed or changed are read again, and reported as ndjson
+records with a change field, as with --baseline.
+
+License files are written once per digest. The --output-layout flag selects
+how they are stored:
+
+- flat: <digest>.txt files in the output directory (default)
+- sharded: <digest>.txt files in subdirectories named after the first two
+  characters of the digest
+- pack: members of a single compressed licenses.zip file
+
+Output Formats:
+
+- json: A JSON array of records, written as packages are scanned (default)
+- ndjson: One JSON record per line, suitable for streaming consumers
+- tsv: Tab separated values with a header line, None is an empty field
+- arrow: Arrow IPC stream, in batches, with the license, source and state
+  columns dictionary encoded. Requires pyarrow, the arrow extra
 """
 
 import os
@@ -33,19 +130,35 @@ from argparse import (
     ArgumentError,
     ArgumentParser,
     ArgumentTypeError,
+    Namespace,
     RawDescriptionHelpFormatter,
 )
-from json import dump as jsondump
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from license_scanner.scanner import ScanError, scan_directory, scan_distributions
+from license_scanner import instrument
+from license_scanner.scanner import (
+    ScanError,
+    scan_archives,
+    scan_directory,
+    scan_distributions,
+    scan_environments,
+    scan_locked,
+)
+from license_scanner.store import LAYOUTS, StoreError, open_store
+from license_scanner.writers import WRITERS
 
 if TYPE_CHECKING:
     from collections.abc import Iterator, Sequence
     from typing import NoReturn, Self
 
     from license_scanner import PackageLicenses
+    from license_scanner.baseline import Baseline
+    from license_scanner.cache import MemoryCache
+    from license_scanner.lockfile import LockedPackage
+    from license_scanner.policy import Policy
+
+    Record = dict[str, str | float | None]
 
 
 class CustomArgumentParser(ArgumentParser):
@@ -62,102 +175,523 @@ class ApplicationError(Exception):
         self.message = message
 
 
-class Application:
-    @classmethod
-    def from_args(cls, argv: "Sequence[str] | None" = None) -> "Self":
-        def input_directory(value: str) -> Path:
-            path = Path(value)
-            if path.is_dir() and os.access(path, os.R_OK):
-                return path
-            message = f"invalid input directory: {path}"
-            raise ArgumentTypeError(message)
+def _readable_directory(value: str, kind: str) -> Path:
+    path = Path(value)
+    if path.is_dir() and os.access(path, os.R_OK):
+        return path
+    message = f"invalid {kind} directory: {path}"
+    raise ArgumentTypeError(message)
 
-        def output_directory(value: str) -> Path:
-            path = Path(value)
 
-            try:
-                path.mkdir(exist_ok=True, parents=True)
-            except OSError as exc:
-                message = f"invalid output directory: {path}"
-                raise ArgumentTypeError(message) from exc
+def _input_directory(value: str) -> Path:
+    return _readable_directory(value, "input")
+
+
+def _archive_directory(value: str) -> Path:
+    return _readable_directory(value, "archive")
+
+
+def _site_packages_directory(value: str) -> Path:
+    return _readable_directory(value, "site-packages")
+
+
+def _writable_directory(value: str, kind: str) -> Path:
+    path = Path(value)
+
+    try:
+        path.mkdir(exist_ok=True, parents=True)
+    except OSError as exc:
+        message = f"invalid {kind} directory: {path}"
+        raise ArgumentTypeError(message) from exc
 
-            if os.access(path, os.W_OK):
-                return path
+    if os.access(path, os.W_OK):
+        return path
 
-            message = f"invalid output directory: {path}"
-            raise ArgumentTypeError(message)
+    message = f"invalid {kind} directory: {path}"
+    raise ArgumentTypeError(message)
 
+
+def _output_directory(value: str) -> Path:
+    return _writable_directory(value, "output")
+
+
+def _cache_directory(value: str) -> Path:
+    return _writable_directory(value, "cache")
+
+
+def _input_file(value: str) -> Path:
+    path = Path(value)
+    if path.is_file() and os.access(path, os.R_OK):
+        return path
+    message = f"invalid input file: {path}"
+    raise ArgumentTypeError(message)
+
+
+def _jobs(value: str) -> int:
+    try:
+        if (number := int(value)) > 0:
+            return number
+    except ValueError:
+        pass
+    message = f"invalid number of jobs: {value}"
+    raise ArgumentTypeError(message)
+
+
+def _interval(value: str) -> float:
+    try:
+        if (seconds := float(value)) > 0:
+            return seconds
+    except ValueError:
+        pass
+    message = f"invalid interval: {value}"
+    raise ArgumentTypeError(message)
+
+
+class Application:
+    @classmethod
+    def from_args(
+        cls,
+        argv: "Sequence[str] | None" = None,
+        result_cache: "MemoryCache | None" = None,
+    ) -> "Self":
         argp = CustomArgumentParser(
             prog="license-scanner",
             description=__doc__,
             formatter_class=RawDescriptionHelpFormatter,
             exit_on_error=False,
         )
-        argp.add_argument(
+        source = argp.add_mutually_exclusive_group()
+        source.add_argument(
             "-i",
             "--input-directory",
-            type=input_directory,
+            type=_input_directory,
             help="Directory to scan for license files",
         )
+        source.add_argument(
+            "-a",
+            "--archive-directory",
+            type=_archive_directory,
+            help="Directory to scan for wheels and sdists",
+        )
+        source.add_argument(
+            "--site-packages",
+            action="append",
+            type=_site_packages_directory,
+            default=[],
+            metavar="PATH",
+            help="Scan the packages installed in PATH, may be repeated",
+        )
         argp.add_argument(
             "-o",
             "--output-directory",
-            type=output_directory,
+            type=_output_directory,
             help="Directory to store license files",
         )
+        argp.add_argument(
+            "--output-layout",
+            choices=LAYOUTS,
+            default="flat",
+            help="How license files are stored (default: %(default)s)",
+        )
+        argp.add_argument(
+            "-f",
+            "--format",
+            choices=WRITERS,
+            default="json",
+            help="Output format (default: %(default)s)",
+        )
+        argp.add_argument(
+            "-j",
+            "--jobs",
+            type=_jobs,
+            default=1,
+            help=(
+                "Worker processes used with --input-directory and "
+                "--archive-directory (default: %(default)s)"
+            ),
+        )
+        argp.add_argument(
+            "--cache-dir",
+            type=_cache_directory,
+            help="Directory to cache the results of installed packages",
+        )
+        argp.add_argument(
+            "--index",
+            type=Path,
+            metavar="FILE",
+            help="Metadata index, updated from --input-directory when given",
+        )
+        argp.add_argument(
+            "--lockfile",
+            type=_input_file,
+            help="Report the packages pinned by a lockfile instead",
+        )
+        argp.add_argument(
+            "--fetch-missing",
+            action="store_true",
+            help="Fetch from PyPI the locked packages not in --input-directory",
+        )
+        argp.add_argument(
+            "--baseline",
+            type=_input_file,
+            help="Output of a previous run, report only what changed since then",
+        )
+        argp.add_argument(
+            "--policy",
+            type=_input_file,
+            help="Check the licenses found against a policy file",
+        )
+        argp.add_argument(
+            "--fail-fast",
+            action="store_true",
+            help="Stop at the first license that breaks the --policy",
+        )
+        argp.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print the time spent in each stage of the scan to stderr",
+        )
+        argp.add_argument(
+            "--profile-trace",
+            type=Path,
+            metavar="FILE",
+            help="Write the stages of the scan to FILE as a Chrome trace",
+        )
         try:
             args = argp.parse_args(argv)
-            return cls(args.input_directory, args.output_directory)
         except ArgumentError as exc:
             raise ApplicationError(str(exc), exit_code=2) from exc
 
-    def __init__(
+        cls._check_args(argp, args)
+        return cls(
+            input_directory=args.input_directory,
+            archive_directory=args.archive_directory,
+            site_packages=args.site_packages,
+            output_directory=args.output_directory,
+            output_layout=args.output_layout,
+            output_format=args.format,
+            jobs=args.jobs,
+            cache_directory=args.cache_dir,
+            baseline=cls._load_baseline(args.baseline) if args.baseline else None,
+            locked=cls._load_lockfile(args.lockfile) if args.lockfile else None,
+            fetch_missing=args.fetch_missing,
+            index=args.index,
+            policy=cls._load_policy(args.policy) if args.policy else None,
+            fail_fast=args.fail_fast,
+            profile=args.profile or args.profile_trace is not None,
+            profile_trace=args.profile_trace,
+            result_cache=result_cache,
+        )
+
+    @staticmethod
+    def _check_args(argp: ArgumentParser, args: Namespace) -> None:
+        # Combinations argparse can not express, exit with a usage error
+        other_sources = args.archive_directory or args.site_packages
+        if args.lockfile and other_sources:
+            argp.error("argument --lockfile: only allowed with --input-directory")
+        if args.index and other_sources:
+            argp.error("argument --index: only allowed with --input-directory")
+        if args.index and not args.input_directory and not args.index.is_file():
+            argp.error(f"argument --index: no index at {args.index}")
+        if args.fetch_missing and not args.lockfile:
+            argp.error("argument --fetch-missing: only allowed with --lockfile")
+        if args.fail_fast and not args.policy:
+            argp.error("argument --fail-fast: only allowed with --policy")
+        if args.format == "arrow":
+            from importlib.util import find_spec
+
+            # Not a terminal or file, e.g. the output of a server request
+            if not hasattr(sys.stdout, "buffer"):
+                argp.error("argument --format: arrow needs a binary output")
+            if find_spec("pyarrow") is None:
+                argp.error("argument --format: arrow requires pyarrow")
+
+    @staticmethod
+    def _load_baseline(path: Path) -> "Baseline":
+        from license_scanner.baseline import Baseline, BaselineError
+
+        try:
+            return Baseline.load(path)
+        except BaselineError as exc:
+            message = f"Can't read baseline: {path}. {exc}"
+            raise ApplicationError(message) from None
+
+    @staticmethod
+    def _load_lockfile(path: Path) -> "list[LockedPackage]":
+        from license_scanner.lockfile import LockfileError, read_lockfile
+
+        try:
+            return read_lockfile(path)
+        except LockfileError as exc:
+            message = f"Can't read lockfile: {path}. {exc}"
+            raise ApplicationError(message) from None
+
+    @staticmethod
+    def _load_policy(path: Path) -> "Policy":
+        from license_scanner.policy import Policy, PolicyError
+
+        try:
+            return Policy.load(path)
+        except PolicyError as exc:
+            message = f"Can't read policy: {path}. {exc}"
+            raise ApplicationError(message) from None
+
+    def __init__(  # noqa: PLR0913
         self,
         input_directory: Path | None = None,
         output_directory: Path | None = None,
+        *,
+        archive_directory: Path | None = None,
+        site_packages: "Sequence[Path]" = (),
+        output_layout: str = "flat",
+        output_format: str = "json",
+        jobs: int = 1,
+        cache_directory: Path | None = None,
+        baseline: "Baseline | None" = None,
+        locked: "list[LockedPackage] | None" = None,
+        fetch_missing: bool = False,
+        index: Path | None = None,
+        policy: "Policy | None" = None,
+        fail_fast: bool = False,
+        profile: bool = False,
+        profile_trace: Path | None = None,
+        result_cache: "MemoryCache | None" = None,
     ) -> None:
         self._idir = input_directory
-        self._odir = output_directory
+        self._adir = archive_directory
+        self._site_packages = site_packages
+        self._store = (
+            open_store(output_directory, output_layout) if output_directory else None
+        )
+        self._write = WRITERS[output_format]
+        self._jobs = jobs
+        self._cdir = cache_directory
+        self._baseline = baseline
+        self._locked = locked
+        self._fetch_missing = fetch_missing
+        self._index = index
+        self._policy = policy
+        self._fail_fast = fail_fast
+        self._violations = 0
+        self._profile = profile
+        self._profile_trace = profile_trace
+        self._result_cache = result_cache
 
     def run(self) -> None:
-        licenses = list(self._get_licenses())
-        jsondump(licenses, sys.stdout, indent=4)
+        profile = (
+            instrument.enable(trace=self._profile_trace is not None)
+            if self._profile
+            else None
+        )
+        try:
+            with instrument.stage("run"):
+                self._write(self._get_licenses(), sys.stdout)
+        finally:
+            if self._store:
+                self._store.close()
+            if profile:
+                instrument.disable()
+                self._report_profile(profile)
+        if self._violations:
+            message = f"{self._violations} license(s) break the policy"
+            raise ApplicationError(message, exit_code=3)
 
-    def _get_licenses(self) -> "Iterator[dict[str,str]]":
+    def watch(self, interval: float = 1.0, *, polling: bool = False) -> None:
+        """Write the packages found, then what changes, until interrupted."""
+        from license_scanner.watch import watch
+
+        site_packages = self._idir is None
+        directories = list(self._site_packages) if site_packages else [self._idir]
         try:
-            for package in self._get_packages():
-                for license in package.licenses:  # noqa: A001
-                    yield {
-                        "package-name": package.name,
-                        "package-version": package.version,
-                        "license": license.text,
-                        "source": license.source.capitalize(),
-                        "state": license.state.upper(),
-                    }
-                    self._try_save_license(package.license, license.text)
+            for changes in watch(
+                directories,
+                site_packages=site_packages,
+                interval=interval,
+                polling=polling,
+            ):
+                records = [
+                    {**record, "change": change.change}
+                    for change in changes
+                    for record in self._package_records(
+                        change.package, change.directory if site_packages else None
+                    )
+                ]
+                self._write(records, sys.stdout)
         except ScanError as exc:
-            message = f"Can't scan directory: {self._idir}. {exc}"
+            raise ApplicationError(str(exc)) from None
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self._store:
+                self._store.close()
+
+    def _report_profile(self, profile: "instrument.Profile") -> None:
+        profile.report(sys.stderr)
+        if self._profile_trace:
+            try:
+                profile.write_trace(self._profile_trace)
+            except OSError as exc:
+                message = f"Can't write profile trace: {exc}"
+                raise ApplicationError(message) from None
+
+    def _get_licenses(self) -> "Iterator[Record]":
+        from itertools import starmap
+
+        try:
+            packages = self._get_packages_by_environment()
+            if self._baseline is not None:
+                grouped = self._baseline.diff(packages, self._package_records)
+            else:
+                grouped = starmap(self._package_records, packages)
+            for record in (record for records in grouped for record in records):
+                yield record
+                # Removed records come from the baseline, not from this scan
+                if record.get("violation") and record.get("change") != "removed":
+                    self._violations += 1
+                    if self._fail_fast:
+                        return
+        except ScanError as exc:
+            if directory := self._idir or self._adir:
+                message = f"Can't scan directory: {directory}. {exc}"
+            else:
+                message = f"Can't scan environment. {exc}"
             raise ApplicationError(message) from None
 
+    def _get_packages_by_environment(
+        self,
+    ) -> "Iterator[tuple[PackageLicenses, Path | None]]":
+        if self._site_packages:
+            for environment, package in scan_environments(self._site_packages):
+                yield package, environment
+        else:
+            for package in self._get_packages():
+                yield package, None
+
+    def _package_records(
+        self, package: "PackageLicenses", environment: Path | None = None
+    ) -> "list[Record]":
+        records: list[Record] = []
+        for license in package.licenses:  # noqa: A001
+            record: Record = {
+                "package-name": package.name,
+                "package-version": package.version,
+                "license": license.text,
+                "source": license.source.capitalize(),
+                "state": license.state.upper(),
+                "canonical": license.canonical,
+                "confidence": license.confidence,
+                "metadata-digest": package.metadata_digest,
+            }
+            if environment is not None:
+                record["environment"] = str(environment)
+            if self._policy is not None:
+                with instrument.stage("policy"):
+                    record["violation"] = self._policy.check(package.name, license)
+            records.append(record)
+            self._try_save_license(package.license, license.text)
+        return records
+
     def _get_packages(self) -> "Iterator[PackageLicenses]":
+        if self._index:
+            return self._scan_index(self._index)
+        if self._locked is not None:
+            fetch = self._fetch if self._fetch_missing else None
+            return scan_locked(self._locked, self._idir, fetch)
         if self._idir:
-            return scan_directory(self._idir)
-        return scan_distributions()
+            return scan_directory(self._idir, self._jobs)
+        if self._adir:
+            return scan_archives(self._adir, self._jobs)
+        if self._cdir:
+            return self._scan_cached_distributions(self._cdir)
+        return scan_distributions(self._result_cache)
+
+    def _scan_index(self, path: Path) -> "Iterator[PackageLicenses]":
+        from license_scanner.index import MetadataIndex, MetadataIndexError
+
+        try:
+            index = MetadataIndex(path)
+        except MetadataIndexError as exc:
+            raise ApplicationError(str(exc)) from None
+
+        with index:
+            if self._idir:
+                index.ingest(self._idir)
+            if self._locked is not None:
+                fetch = self._fetch if self._fetch_missing else None
+                yield from scan_locked(self._locked, index, fetch)
+            else:
+                yield from index
+
+    def _fetch(
+        self, missing: "list[LockedPackage]"
+    ) -> "dict[LockedPackage, PackageLicenses | None]":
+        import httpx
+
+        from license_scanner import PackageLicenses
+        from license_scanner.lockfile import LockedPackage
+        from license_scanner.pypi import fetch_releases
+
+        cache = self._cdir / "pypi" if self._cdir else None
+        try:
+            if cache:
+                cache.mkdir(exist_ok=True)
+            releases = fetch_releases(missing, cache)
+        except (OSError, httpx.HTTPError) as exc:
+            message = f"Can't fetch the missing packages from PyPI. {exc}"
+            raise ApplicationError(message) from None
+
+        return {
+            LockedPackage(*release): PackageLicenses(
+                package.name,
+                package.version,
+                package.license,
+                package.license_expression,
+                package.classifiers,
+            )
+            if package
+            else None
+            for release, package in releases.items()
+        }
+
+    def _scan_cached_distributions(self, cdir: Path) -> "Iterator[PackageLicenses]":
+        from license_scanner.cache import CACHE_FILE, CacheError, ResultCache
+
+        try:
+            cache = ResultCache(cdir / CACHE_FILE)
+        except CacheError as exc:
+            raise ApplicationError(str(exc)) from None
+        with cache:
+            try:
+                yield from scan_distributions(cache)
+            except CacheError as exc:
+                raise ApplicationError(str(exc)) from None
 
     def _try_save_license(self, text: str | None, identifier: str) -> None:
-        if self._odir and text and identifier.startswith("sha256:"):
-            digest = identifier[7:]
-            file = self._odir / f"{digest}.txt"
+        if self._store and text and identifier.startswith("sha256:"):
             try:
-                file.write_text(text)
-            except OSError as exc:
-                message = f"Can't write license file: {file}. {exc}"
-                raise ApplicationError(message) from exc
+                with instrument.stage("save"):
+                    self._store.save(identifier[7:], text)
+            except StoreError as exc:
+                raise ApplicationError(str(exc)) from exc
 
 
-def main(argv: "Sequence[str] | None" = None) -> int:
+def main(
+    argv: "Sequence[str] | None" = None, result_cache: "MemoryCache | None" = None
+) -> int:
+    argv = sys.argv[1:] if argv is None else argv
     try:
-        app = Application.from_args(argv)
+        if argv[:1] == ["serve"]:
+            from license_scanner.server import serve_from_args
+
+            return serve_from_args(argv[1:])
+        if argv[:1] == ["watch"]:
+            return _watch(argv[1:])
+        if argv[:1] == ["--connect"]:
+            from license_scanner.server import connect_from_args
+
+            return connect_from_args(argv[1:])
+
+        app = Application.from_args(argv, result_cache)
         app.run()
     except ApplicationError as exc:
         if exc.message:
@@ -165,3 +699,67 @@ def main(argv: "Sequence[str] | None" = None) -> int:
         return exc.exit_code
     else:
         return 0
+
+
+def _watch(argv: "Sequence[str]") -> int:
+    from license_scanner import watch
+
+    argp = CustomArgumentParser(
+        prog="license-scanner watch",
+        description=watch.__doc__,
+        formatter_class=RawDescriptionHelpFormatter,
+        exit_on_error=False,
+    )
+    source = argp.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "-i",
+        "--input-directory",
+        type=_input_directory,
+        help="Directory of PyPI JSON files to watch",
+    )
+    source.add_argument(
+        "--site-packages",
+        action="append",
+        type=_site_packages_directory,
+        default=[],
+        metavar="PATH",
+        help="Watch the packages installed in PATH, may be repeated",
+    )
+    argp.add_argument(
+        "-o",
+        "--output-directory",
+        type=_output_directory,
+        help="Directory to store license files",
+    )
+    argp.add_argument(
+        "--output-layout",
+        choices=LAYOUTS,
+        default="flat",
+        help="How license files are stored (default: %(default)s)",
+    )
+    argp.add_argument(
+        "--interval",
+        type=_interval,
+        default=1.0,
+        metavar="SECONDS",
+        help="Time between checks when polling (default: %(default)s)",
+    )
+    argp.add_argument(
+        "--poll",
+        action="store_true",
+        help="Check every entry at each interval instead of using inotify",
+    )
+    try:
+        args = argp.parse_args(argv)
+    except ArgumentError as exc:
+        raise ApplicationError(str(exc), exit_code=2) from exc
+
+    app = Application(
+        input_directory=args.input_directory,
+        site_packages=args.site_packages,
+        output_directory=args.output_directory,
+        output_layout=args.output_layout,
+        output_format="ndjson",
+    )
+    app.watch(args.interval, polling=args.poll)
+    return 0
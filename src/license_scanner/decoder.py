@@ -0,0 +1,133 @@
+"""
+Decoders for the PyPI JSON files read by scan_directory.
+
+Only name, version, license, license_expression and classifiers are used, the
+rest of the document, mostly the description, is thrown away. The fastest
+backend installed is selected the first time a file is decoded:
+
+- msgspec: decodes into a struct of those fields only. The other values are
+  skipped without being decoded
+- orjson: decodes the whole document, several times faster than json
+- json: the standard library
+
+All of them reject invalid UTF-8 and fields of the wrong type. A null field is
+kept as None, except classifiers, an empty list.
+
+LICENSE_SCANNER_JSON selects a backend by name, e.g. to compare them.
+Reference: <https://jcristharif.com/msgspec/structs.html>.
+"""
+
+import os
+from functools import cache
+from typing import TYPE_CHECKING
+
+from license_scanner import PackageLicenses
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    Decoder = Callable[[bytes], PackageLicenses]
+
+__all__ = ("DECODERS", "DecodeError", "decode", "get_decoder")
+
+# In order of preference
+DECODERS = ("msgspec", "orjson", "json")
+
+
+class DecodeError(Exception):
+    pass
+
+
+def decode(data: bytes) -> PackageLicenses:
+    return get_decoder(os.environ.get("LICENSE_SCANNER_JSON"))(data)
+
+
+@cache
+def get_decoder(name: str | None = None) -> "Decoder":
+    from importlib.util import find_spec
+
+    if name is None:
+        return get_decoder(next(n for n in DECODERS if find_spec(n) is not None))
+    if name not in DECODERS:
+        message = f"unknown JSON decoder: {name!r}, expected one of {DECODERS}"
+        raise DecodeError(message)
+    if name == "msgspec":
+        return _msgspec_decoder()
+
+    # orjson.loads and json.loads take the same bytes and raise ValueError
+    from importlib import import_module
+
+    return _loads_decoder(import_module(name).loads)
+
+
+def _loads_decoder(loads: "Callable[[bytes], object]") -> "Decoder":
+    def decode(data: bytes) -> PackageLicenses:
+        try:
+            document = loads(data)
+        except ValueError as exc:
+            # JSONDecodeError of both json and orjson, and UnicodeDecodeError
+            raise DecodeError(str(exc)) from None
+
+        if not isinstance(document, dict):
+            message = f"expected an object, got {type(document).__name__}"
+            raise DecodeError(message)
+
+        # The checks msgspec does with the Metadata struct
+        classifiers = document.get("classifiers")
+        if classifiers is not None and not (
+            isinstance(classifiers, list)
+            and all(isinstance(c, str) for c in classifiers)
+        ):
+            message = "expected array of str - at `$.classifiers`"
+            raise DecodeError(message)
+        return PackageLicenses(
+            name=_get_str(document, "name", ""),
+            version=_get_str(document, "version", ""),
+            license=_get_str(document, "license"),
+            license_expression=_get_str(document, "license_expression"),
+            classifiers=classifiers or [],
+        )
+
+    return decode
+
+
+def _get_str(
+    document: dict[str, object], field: str, default: str | None = None
+) -> str | None:
+    value = document.get(field, default)
+    if not isinstance(value, str | None):
+        message = f"expected str, got {type(value).__name__} - at `$.{field}`"
+        raise DecodeError(message)
+    return value
+
+
+def _msgspec_decoder() -> "Decoder":
+    # msgspec is not a dependency, only used where it is installed
+    import msgspec
+
+    class Metadata(msgspec.Struct):
+        name: str | None = ""
+        version: str | None = ""
+        license: str | None = None
+        license_expression: str | None = None
+        classifiers: list[str] | None = []
+
+    decoder = msgspec.json.Decoder(Metadata)
+
+    def decode(data: bytes) -> PackageLicenses:
+        try:
+            # Skipped values are not checked for invalid UTF-8 by msgspec
+            data.decode()
+            metadata = decoder.decode(data)
+        except (msgspec.DecodeError, UnicodeDecodeError) as exc:
+            # ValidationError, wrong types or not an object, is a DecodeError
+            raise DecodeError(str(exc)) from None
+        return PackageLicenses(
+            name=metadata.name,
+            version=metadata.version,
+            license=metadata.license,
+            license_expression=metadata.license_expression,
+            classifiers=metadata.classifiers or [],
+        )
+
+    return decode
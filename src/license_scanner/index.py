@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+from license_scanner import PackageLicenses
+from license_scanner.scanner import read_json_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ("INDEX_VERSION", "IngestResult", "MetadataIndex", "MetadataIndexError")
+
+# Bump when the stored layout changes, older indexes have to be ingested again.
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS packages (
+    file TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    name_key TEXT NOT NULL,
+    version_key TEXT NOT NULL,
+    name TEXT,
+    version TEXT,
+    license TEXT,
+    license_expression TEXT,
+    classifiers TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packages_release ON packages (name_key, version_key);
+"""
+
+SELECT = "SELECT name, version, license, license_expression, classifiers FROM packages"
+
+
+class MetadataIndexError(Exception):
+    pass
+
+
+class IngestResult(NamedTuple):
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+class MetadataIndex:
+    """
+    The fields scan_directory needs from a directory of PyPI JSON files, kept
+    in a single SQLite file.
+
+    `ingest` only reads the files whose mtime or size changed since the last
+    time, and forgets the ones removed. Iterating the index yields the same
+    packages, in the same order, as scan_directory over the directory, with
+    a sequential read of one file. `lookup` finds a release by name and
+    version, both compared in their normalized form.
+    """
+
+    def __init__(self, path: Path) -> None:
+        try:
+            self._db = self._connect(path)
+        except sqlite3.DatabaseError as exc:
+            message = f"Can't open index: {path}. {exc}"
+            raise MetadataIndexError(message) from None
+
+    def ingest(self, directory: Path) -> IngestResult:
+        from packaging.utils import canonicalize_name, canonicalize_version
+
+        stored = {
+            file: (mtime_ns, size)
+            for file, mtime_ns, size in self._db.execute(
+                "SELECT file, mtime_ns, size FROM packages"
+            )
+        }
+
+        rows = []
+        added = updated = unchanged = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                previous = stored.pop(entry.name, None)
+                if previous == (stat.st_mtime_ns, stat.st_size):
+                    unchanged += 1
+                    continue
+                if previous is None:
+                    added += 1
+                else:
+                    updated += 1
+                package = read_json_file(Path(entry.path))
+                rows.append(
+                    (
+                        entry.name,
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                        canonicalize_name(package.name or ""),
+                        canonicalize_version(package.version or ""),
+                        package.name,
+                        package.version,
+                        package.license,
+                        package.license_expression,
+                        json.dumps(package.classifiers),
+                    )
+                )
+
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.executemany(
+                "DELETE FROM packages WHERE file = ?", [(file,) for file in stored]
+            )
+        return IngestResult(added, updated, len(stored), unchanged)
+
+    def lookup(self, name: str, version: str | None = None) -> PackageLicenses | None:
+        from packaging.utils import canonicalize_name, canonicalize_version
+
+        query = f"{SELECT} WHERE name_key = ?"
+        params = [canonicalize_name(name)]
+        if version is not None:
+            query += " AND version_key = ?"
+            params.append(canonicalize_version(version))
+        row = self._db.execute(f"{query} ORDER BY file LIMIT 1", params).fetchone()
+        return self._decode(row) if row else None
+
+    def __iter__(self) -> "Iterator[PackageLicenses]":
+        # File names sort the same way here as Paths do in scan_directory
+        rows = self._db.execute(f"{SELECT} ORDER BY file")
+        return map(self._decode, rows)
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        db = sqlite3.connect(path)
+        try:
+            db.executescript(SCHEMA)
+            row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(INDEX_VERSION):
+                db.execute("DELETE FROM packages")
+                db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (str(INDEX_VERSION),),
+                )
+                db.commit()
+        except sqlite3.DatabaseError:
+            db.close()
+            raise
+        return db
+
+    @staticmethod
+    def _decode(row: tuple) -> PackageLicenses:
+        name, version, license, license_expression, classifiers = row  # noqa: A001
+        return PackageLicenses(
+            name, version, license, license_expression, json.loads(classifiers)
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        typ: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,116 @@
+"""
+Timers for the stages of a scan, enabled with --profile.
+
+Code under measure is wrapped in `with stage(name):`. While profiling is
+disabled, the default, stage returns a shared no-op context manager, the cost
+is a function call. Once enabled every stage records its duration, and, if a
+trace was requested, a Chrome trace event too.
+Reference: <https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU>.
+"""
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+    from typing import TextIO
+
+__all__ = ("Profile", "disable", "enable", "stage")
+
+NULL_STAGE = nullcontext()
+
+_profile: "Profile | None" = None
+
+
+class Profile:
+    def __init__(self, *, trace: bool = False) -> None:
+        self.durations: dict[str, list[int]] = {}
+        self.events: list[dict[str, str | int | float]] | None = [] if trace else None
+        self._origin = time.perf_counter_ns()
+
+    def record(self, name: str, start: int, end: int) -> None:
+        """Record a stage, start and end are perf_counter_ns values."""
+        self.durations.setdefault(name, []).append(end - start)
+        if self.events is not None:
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+    def report(self, stream: "TextIO") -> None:
+        """Count, total, p50 and p99 of every stage, the slowest first."""
+        rows = sorted(self.durations.items(), key=lambda item: -sum(item[1]))
+        width = max((len(name) for name, _ in rows), default=5)
+        stream.write(
+            f"{'stage':<{width}} {'count':>9} {'total ms':>11} "
+            f"{'p50 ms':>9} {'p99 ms':>9}\n"
+        )
+        for name, durations in rows:
+            durations.sort()
+            stream.write(
+                f"{name:<{width}} {len(durations):>9} "
+                f"{sum(durations) / 1e6:>11.3f} "
+                f"{self._percentile(durations, 0.50) / 1e6:>9.3f} "
+                f"{self._percentile(durations, 0.99) / 1e6:>9.3f}\n"
+            )
+        stream.flush()
+
+    def write_trace(self, path: "Path") -> None:
+        """Write the events in the Chrome trace event format, see chrome://tracing."""
+        import json
+
+        with path.open(mode="w", encoding="utf-8") as fd:
+            json.dump({"traceEvents": self.events or [], "displayTimeUnit": "ms"}, fd)
+
+    @staticmethod
+    def _percentile(durations: list[int], quantile: float) -> int:
+        # Nearest rank of sorted durations
+        return durations[min(len(durations) - 1, int(quantile * len(durations)))]
+
+
+class _Stage:
+    __slots__ = ("_name", "_profile", "_start")
+
+    def __init__(self, profile: Profile, name: str) -> None:
+        self._profile = profile
+        self._name = name
+        self._start = 0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter_ns()
+
+    def __exit__(
+        self,
+        typ: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._profile.record(self._name, self._start, time.perf_counter_ns())
+
+
+def enable(*, trace: bool = False) -> Profile:
+    global _profile  # noqa: PLW0603
+    _profile = Profile(trace=trace)
+    return _profile
+
+
+def disable() -> None:
+    global _profile  # noqa: PLW0603
+    _profile = None
+
+
+def stage(name: str) -> "AbstractContextManager[None]":
+    if _profile is None:
+        return NULL_STAGE
+    return _Stage(_profile, name)
@@ -0,0 +1,96 @@
+"""
+Readers for the packages pinned by a lockfile.
+
+Supported formats, told apart by the file name:
+
+- uv.lock: the [[package]] tables written by uv. Projects of the workspace
+  itself (editable, virtual and directory sources) are left out
+- pylock.toml, pylock.*.toml: the [[packages]] tables of PEP 751
+- anything else: a requirements file where every requirement is pinned with
+  ==, as written by pip-compile, pip freeze or uv export
+
+Reference: <https://peps.python.org/pep-0751/>.
+"""
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ("LockedPackage", "LockfileError", "read_lockfile")
+
+# uv.lock sources of the projects being locked, not of their dependencies
+LOCAL_SOURCES = frozenset({"directory", "editable", "virtual"})
+
+
+class LockfileError(Exception):
+    pass
+
+
+class LockedPackage(NamedTuple):
+    name: str
+    # None when the lockfile does not pin a version, e.g. pylock.toml VCS
+    # packages. Any version found for the name is accepted then.
+    version: str | None
+
+
+def read_lockfile(path: "Path") -> list[LockedPackage]:
+    try:
+        if path.name == "uv.lock" or (
+            path.name.startswith("pylock.") and path.suffix == ".toml"
+        ):
+            import tomllib
+
+            with path.open(mode="rb") as fd:
+                data = tomllib.load(fd)
+            if path.name == "uv.lock":
+                return _read_uv_lock(data)
+            return _read_pylock(data)
+        return _read_requirements(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, ValueError) as exc:
+        # tomllib.TOMLDecodeError is a ValueError
+        raise LockfileError(str(exc)) from None
+    except (AttributeError, KeyError, TypeError) as exc:
+        message = f"unexpected format. {exc!r}"
+        raise LockfileError(message) from None
+
+
+def _read_uv_lock(data: dict) -> list[LockedPackage]:
+    return [
+        LockedPackage(package["name"], package.get("version"))
+        for package in data.get("package", [])
+        if LOCAL_SOURCES.isdisjoint(package.get("source", {}))
+    ]
+
+
+def _read_pylock(data: dict) -> list[LockedPackage]:
+    return [
+        LockedPackage(package["name"], package.get("version"))
+        for package in data.get("packages", [])
+        if "directory" not in package
+    ]
+
+
+def _read_requirements(text: str) -> list[LockedPackage]:
+    from packaging.requirements import InvalidRequirement, Requirement
+
+    packages: list[LockedPackage] = []
+    for line in text.replace("\\\n", " ").splitlines():
+        # Comments, options (-r, -e, --index-url...) and per requirement
+        # options (--hash) are not part of the requirement
+        requirement = line.partition(" #")[0].partition(" --")[0].strip()
+        if not requirement or requirement.startswith(("#", "-")):
+            continue
+
+        try:
+            specifiers = list((parsed := Requirement(requirement)).specifier)
+        except InvalidRequirement as exc:
+            message = f"invalid requirement: {requirement!r}. {exc}"
+            raise LockfileError(message) from None
+
+        pin = specifiers[0] if len(specifiers) == 1 else None
+        if not pin or pin.operator not in {"==", "==="} or "*" in pin.version:
+            message = f"requirement is not pinned: {requirement!r}"
+            raise LockfileError(message)
+        packages.append(LockedPackage(parsed.name, pin.version))
+    return packages
@@ -0,0 +1,108 @@
+"""
+Identify embedded license texts by comparing them with bundled reference texts.
+
+Texts are normalized before comparing: case, punctuation, whitespace and
+copyright lines are ignored, so the same license written by different authors
+normalizes to the same words. A normalized text equal to a reference is an
+exact match. Otherwise the word shingles of the text are compared with the
+shingles of every reference and the closest one is reported, with the Jaccard
+similarity of both sets as confidence.
+Reference: <https://spdx.github.io/spdx-spec/v2.3/license-matching-guidelines-and-templates/>.
+"""
+
+import re
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+__all__ = (
+    "CACHE_SIZE",
+    "MATCH_THRESHOLD",
+    "SHINGLE_SIZE",
+    "Match",
+    "identify",
+    "normalize",
+    "reference_index",
+)
+
+# Distinct embedded texts are far fewer than packages, most of them are one of
+# a handful of licenses with different copyright lines.
+CACHE_SIZE = 1024
+
+# Minimum similarity reported as a match. Below it texts are left ambiguous.
+MATCH_THRESHOLD = 0.8
+
+# Words per shingle. Three words keep the order of the text without making
+# small edits, like a changed name, spread to too many shingles.
+SHINGLE_SIZE = 3
+
+# Lines are bounded, a text folded into a single line must not be dropped
+# whole because it starts with a copyright notice.
+COPYRIGHT = re.compile(
+    r"^\W*(?:copyright|\(c\)|©)[^\n]{0,160}$", re.IGNORECASE | re.MULTILINE
+)
+WORD = re.compile(r"\w+")
+
+# Spelling variants treated as the same word, as the SPDX guidelines do
+VARIANTS = {"licence": "license", "licences": "licenses", "licenced": "licensed"}
+
+
+class Match(NamedTuple):
+    identifier: str
+    confidence: float
+
+
+class Reference(NamedTuple):
+    identifier: str
+    shingles: frozenset[tuple[str, ...]]
+
+
+class ReferenceIndex(NamedTuple):
+    exact: "Mapping[str, str]"
+    references: tuple[Reference, ...]
+
+
+def normalize(text: str) -> list[str]:
+    text = COPYRIGHT.sub("", text.lower())
+    return [VARIANTS.get(word, word) for word in WORD.findall(text)]
+
+
+def shingles(words: list[str]) -> frozenset[tuple[str, ...]]:
+    return frozenset(zip(*(words[i:] for i in range(SHINGLE_SIZE)), strict=False))
+
+
+@cache
+def reference_index() -> ReferenceIndex:
+    # Built once per process, from the texts shipped in the licenses directory.
+    # Each file is named after the SPDX identifier of its license.
+    from importlib.resources import files
+
+    exact: dict[str, str] = {}
+    references: list[Reference] = []
+    for resource in sorted(files(__package__).joinpath("licenses").iterdir()):
+        identifier = resource.name.removesuffix(".txt")
+        words = normalize(resource.read_text(encoding="utf-8"))
+        exact[" ".join(words)] = identifier
+        references.append(Reference(identifier, shingles(words)))
+    return ReferenceIndex(exact, tuple(references))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def identify(text: str) -> Match | None:
+    index = reference_index()
+    words = normalize(text)
+    if identifier := index.exact.get(" ".join(words)):
+        return Match(identifier, 1.0)
+
+    candidate = shingles(words)
+    best: Match | None = None
+    for reference in index.references:
+        union = len(candidate | reference.shingles)
+        similarity = len(candidate & reference.shingles) / union if union else 0.0
+        if similarity >= MATCH_THRESHOLD and (
+            best is None or similarity > best.confidence
+        ):
+            best = Match(reference.identifier, round(similarity, 3))
+    return best
@@ -0,0 +1,78 @@
+"""
+Minimal reader for core metadata files (METADATA and PKG-INFO).
+
+Only the header block is read, the file is consumed line by line until the
+first blank line so long descriptions are never loaded. Values are returned
+the same way importlib.metadata returns them, folded lines included. Anything
+the reader does not understand raises MetadataError, callers are expected to
+fall back to the email parser.
+Reference: <https://packaging.python.org/en/latest/specifications/core-metadata/>.
+"""
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+__all__ = ("FIELDS", "MetadataError", "parse_headers", "read_headers")
+
+FIELDS = frozenset({"classifier", "license", "license-expression", "name", "version"})
+
+# Same header name rule used by email.feedparser
+HEADER = re.compile(r"([\041-\071\073-\176]+):(.*)", re.DOTALL)
+
+
+class MetadataError(Exception):
+    pass
+
+
+def parse_headers(
+    lines: "Iterable[str]", fields: frozenset[str] = FIELDS
+) -> dict[str, list[str]]:
+    headers: dict[str, list[str]] = {}
+    # [name, first line, continuation lines...] of the header being read, or
+    # None when it is not one of the requested fields.
+    current: list[str] | None = None
+    started = False
+
+    def flush() -> None:
+        if current is not None:
+            name, *parts = current
+            value = "".join(parts).rstrip("\r\n")
+            if "\n" in value:
+                import textwrap
+
+                # Same RFC 822 indentation fix importlib.metadata applies
+                value = textwrap.dedent(" " * 8 + value)
+            headers.setdefault(name, []).append(value)
+
+    for line in lines:
+        if line in {"\n", "\r\n"}:
+            break
+
+        if line[0] in " \t":
+            if not started:
+                message = f"continuation line without a header: {line!r}"
+                raise MetadataError(message)
+            if current is not None:
+                current.append(line)
+            continue
+
+        if not (match := HEADER.fullmatch(line)):
+            message = f"invalid header line: {line!r}"
+            raise MetadataError(message)
+
+        flush()
+        started = True
+        name = match[1].lower()
+        current = [name, match[2].lstrip(" \t")] if name in fields else None
+
+    flush()
+    return headers
+
+
+def read_headers(path: "Path", fields: frozenset[str] = FIELDS) -> dict[str, list[str]]:
+    with path.open(encoding="utf-8") as fd:
+        return parse_headers(fd, fields)
@@ -0,0 +1,195 @@
+"""
+License policies, the licenses a scan accepts and rejects.
+
+A policy is a TOML file, every key is optional:
+
+```toml
+allow = ["MIT", "Apache-2.0", "BSD-*"]
+deny = ["GPL-*", "AGPL-*", "LGPL-*"]
+deny-states = ["INVALID", "AMBIGUOUS"]
+
+[exceptions]
+example-package = ["GPL-3.0-or-later"]
+```
+
+Patterns are SPDX identifiers, compared case insensitively, or prefixes ending
+in *. An identifier is accepted when it is not denied and, if there is an allow
+list, it is in it. A license breaks the policy when its state is denied, or
+when its expression can not be satisfied with the identifiers accepted: every
+operand of an AND is needed, one of an OR is enough. With an allow list,
+licenses without an SPDX expression are not allowed, the identifier guessed
+for a license text by the matcher does not count as one.
+
+The identifiers of a package matching its exceptions are always accepted, and
+the states of a license satisfied by them alone are not checked. The exception
+* accepts any license of the package.
+"""
+
+from typing import TYPE_CHECKING
+
+from license_scanner import License, LicenseState
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from typing import Self
+
+    from license_scanner.spdx import And, Leaf, Or
+
+__all__ = ("Patterns", "Policy", "PolicyError")
+
+KEYS = frozenset({"allow", "deny", "deny-states", "exceptions"})
+
+# Marks the end of a prefix in the trie of Patterns
+END = ""
+
+
+class PolicyError(Exception):
+    pass
+
+
+class Patterns:
+    """
+    Identifiers are kept in a set, prefixes in a trie of characters, so
+    matching costs the same no matter how many patterns there are.
+    """
+
+    def __init__(self, patterns: "Iterable[str]") -> None:
+        self._exact: set[str] = set()
+        self._prefixes: dict[str, dict] = {}
+        for pattern in patterns:
+            prefix, star, rest = pattern.casefold().partition("*")
+            if rest or not (prefix or star):
+                message = f"invalid pattern: {pattern!r}"
+                raise PolicyError(message)
+            if not star:
+                self._exact.add(prefix)
+                continue
+            node = self._prefixes
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[END] = {}
+
+    def match(self, identifier: str) -> bool:
+        identifier = identifier.casefold()
+        if identifier in self._exact:
+            return True
+        node = self._prefixes
+        for char in identifier:
+            if END in node or (node := node.get(char)) is None:
+                break
+        return node is not None and END in node
+
+    def __bool__(self) -> bool:
+        return bool(self._exact or self._prefixes)
+
+
+class Policy:
+    def __init__(
+        self,
+        allow: "Iterable[str] | None" = None,
+        deny: "Iterable[str]" = (),
+        deny_states: "Iterable[str]" = (),
+        exceptions: "dict[str, list[str]] | None" = None,
+    ) -> None:
+        from packaging.utils import canonicalize_name
+
+        self._allow = Patterns(allow) if allow is not None else None
+        self._deny = Patterns(deny)
+        try:
+            self._deny_states = frozenset(LicenseState(s.lower()) for s in deny_states)
+        except ValueError as exc:
+            raise PolicyError(str(exc)) from None
+        self._exceptions = {
+            canonicalize_name(name): Patterns(patterns)
+            for name, patterns in (exceptions or {}).items()
+        }
+
+    @classmethod
+    def load(cls, path: "Path") -> "Self":
+        import tomllib
+
+        try:
+            with path.open(mode="rb") as fd:
+                data = tomllib.load(fd)
+        except (OSError, tomllib.TOMLDecodeError) as exc:
+            raise PolicyError(str(exc)) from None
+
+        if unknown := ", ".join(sorted(data.keys() - KEYS)):
+            message = f"unknown keys: {unknown}"
+            raise PolicyError(message)
+        exceptions = data.get("exceptions", {})
+        if not isinstance(exceptions, dict):
+            message = f"exceptions: expected a table, got {exceptions!r}"
+            raise PolicyError(message)
+        lists = {
+            key: data[key] for key in ("allow", "deny", "deny-states") if key in data
+        }
+        for key, value in [*lists.items(), *exceptions.items()]:
+            if not isinstance(value, list) or not all(
+                isinstance(v, str) for v in value
+            ):
+                message = f"{key}: expected a list of strings, got {value!r}"
+                raise PolicyError(message)
+        return cls(
+            lists.get("allow"),
+            lists.get("deny", ()),
+            lists.get("deny-states", ()),
+            exceptions,
+        )
+
+    def check(self, package: str, license: License) -> str | None:  # noqa: A002
+        """The reason why the license breaks the policy, None if it does not."""
+        expression = license.expression
+        if (excepted := self._excepted(package, expression)) is None:
+            return None
+        if license.state in self._deny_states:
+            return f"state {license.state.upper()} is denied"
+        if expression is None:
+            return "no SPDX expression to allow" if self._allow is not None else None
+        return self._check_expression(expression, excepted)
+
+    def _excepted(
+        self, package: str, expression: "Leaf | And | Or | None"
+    ) -> set[str] | None:
+        # The identifiers accepted by the exceptions of the package, None when
+        # they accept the license whole.
+        from packaging.utils import canonicalize_name
+
+        from license_scanner.spdx import satisfiable
+
+        if not (exception := self._exceptions.get(canonicalize_name(package))):
+            return set()
+        # Only the pattern * matches itself
+        if exception.match("*"):
+            return None
+        if expression is None:
+            return set()
+        excepted = {
+            leaf.identifier
+            for leaf in expression.leaves
+            if exception.match(leaf.identifier)
+        }
+        return None if satisfiable(expression, excepted) else excepted
+
+    def _check_expression(
+        self, expression: "Leaf | And | Or", excepted: set[str]
+    ) -> str | None:
+        from license_scanner.spdx import satisfiable
+
+        found = dict.fromkeys(leaf.identifier for leaf in expression.leaves)
+        rejected = [
+            identifier
+            for identifier in found
+            if identifier not in excepted and not self._accepts(identifier)
+        ]
+        if satisfiable(expression, found.keys() - rejected):
+            return None
+        if self._deny.match(identifier := rejected[0]):
+            return f"{identifier} is denied"
+        return f"{identifier} is not allowed"
+
+    def _accepts(self, identifier: str) -> bool:
+        if self._deny.match(identifier):
+            return False
+        return self._allow is None or self._allow.match(identifier)
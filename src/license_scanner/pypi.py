@@ -1,13 +1,22 @@
+import asyncio
+import json
+from importlib.util import find_spec
 from os import environ
 from types import TracebackType
-from typing import NamedTuple, Self
+from typing import TYPE_CHECKING, NamedTuple, Self
 
 import httpx
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+PYPI_CONCURRENCY = int(environ.get("PYPI_CONCURRENCY", "16"))
 PYPI_RETRIES = int(environ.get("PYPI_RETRIES", "3"))
 PYPI_TIMEOUT = float(environ.get("PYPI_TIMEOUT", "10.0"))
 
 PYPI_PACKAGE = "https://pypi.org/pypi/{package}/json"
+PYPI_RELEASE = "https://pypi.org/pypi/{package}/{version}/json"
 PYPI_STATS = "https://pypi.org/stats/"
 
 
@@ -25,6 +34,23 @@ class Package(NamedTuple):
     requires_dist: list[str] | None
     version: str
 
+    def dependencies(self) -> list[str]:
+        """
+        Names of the requirements without markers. Requirements are not
+        evaluated, this only leaves out extras and platform specific ones to
+        keep dependency walks manageable.
+        """
+        from packaging.requirements import InvalidRequirement, Requirement
+
+        names: list[str] = []
+        for requirement in self.requires_dist or []:
+            try:
+                if not (r := Requirement(requirement)).marker:
+                    names.append(r.name)
+            except InvalidRequirement:
+                pass
+        return names
+
 
 class Stats(NamedTuple):
     """
@@ -73,3 +99,131 @@ class Client:
         tb: TracebackType | None,
     ) -> None:
         self._session.close()
+
+
+class AsyncClient:
+    """
+    Concurrent version of Client, following the same rules plus:
+    - Bound the number of requests in flight
+    - Use HTTP/2 when the h2 package is installed
+    - Revalidate cached responses with ETag/If-None-Match when a cache
+      directory is given
+    """
+
+    def __init__(
+        self,
+        cache_directory: "Path | None" = None,
+        concurrency: int = PYPI_CONCURRENCY,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        http2 = find_spec("h2") is not None
+        self._cache = cache_directory
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = httpx.AsyncClient(
+            follow_redirects=False,
+            headers={"Accept": "application/json"},
+            http2=http2,
+            timeout=PYPI_TIMEOUT,
+            transport=transport
+            or httpx.AsyncHTTPTransport(retries=PYPI_RETRIES, http2=http2),
+        )
+
+    async def get_package(self, package: str) -> Package:
+        data = await self._get(PYPI_PACKAGE.format(package=package), package)
+        return Package(**{f: data["info"][f] for f in Package._fields})
+
+    async def get_release(self, package: str, version: str) -> Package:
+        url = PYPI_RELEASE.format(package=package, version=version)
+        data = await self._get(url, f"{package}-{version}")
+        return Package(**{f: data["info"][f] for f in Package._fields})
+
+    async def get_stats(self) -> Stats:
+        data = await self._get(PYPI_STATS)
+        return Stats(**{f: data[f] for f in Stats._fields})
+
+    async def crawl(self, packages: "Iterable[str]") -> dict[str, Package]:
+        """
+        Fetch the packages and their dependencies breadth first. Every level
+        of the dependency graph is requested concurrently.
+        """
+        found: dict[str, Package] = {}
+        level = list(dict.fromkeys(packages))
+        seen = set(level)
+        while level:
+            results = await asyncio.gather(*map(self.get_package, level))
+            next_level: list[str] = []
+            for name, package in zip(level, results, strict=True):
+                found[name] = package
+                for dependency in package.dependencies():
+                    if dependency not in seen:
+                        seen.add(dependency)
+                        next_level.append(dependency)
+            level = next_level
+        return found
+
+    async def _get(self, url: str, key: str | None = None) -> dict:
+        cache = self._cache / f"{key}.json" if self._cache and key else None
+        cached = self._read_cache(cache) if cache else None
+
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+        async with self._semaphore:
+            response = await self._session.get(url, headers=headers)
+
+        if cached and response.status_code == httpx.codes.NOT_MODIFIED:
+            return cached["data"]
+
+        response.raise_for_status()
+        data = response.json()
+        if cache and (etag := response.headers.get("ETag")):
+            cache.write_text(json.dumps({"etag": etag, "data": data}))
+        return data
+
+    @staticmethod
+    def _read_cache(cache: "Path") -> dict | None:
+        try:
+            return json.loads(cache.read_text())
+        except (OSError, ValueError):
+            return None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        typ: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self._session.aclose()
+
+
+def fetch_releases(
+    releases: "Iterable[tuple[str, str | None]]",
+    cache_directory: "Path | None" = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> "dict[tuple[str, str | None], Package | None]":
+    """
+    Fetch the metadata of each (name, version) release concurrently, the
+    latest release when the version is None. Releases PyPI does not know
+    about are None, any other HTTP error is raised.
+    """
+
+    async def fetch(
+        client: AsyncClient, name: str, version: str | None
+    ) -> Package | None:
+        try:
+            if version is None:
+                return await client.get_package(name)
+            return await client.get_release(name, version)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == httpx.codes.NOT_FOUND:
+                return None
+            raise
+
+    async def fetch_all() -> "dict[tuple[str, str | None], Package | None]":
+        keys = list(dict.fromkeys(releases))
+        async with AsyncClient(cache_directory, transport=transport) as client:
+            results = await asyncio.gather(*(fetch(client, *key) for key in keys))
+        return dict(zip(keys, results, strict=True))
+
+    return asyncio.run(fetch_all())
@@ -2,68 +2,379 @@ import sys
 from typing import TYPE_CHECKING
 
 from license_scanner import PackageLicenses
+from license_scanner.instrument import stage
+from license_scanner.metadata import MetadataError, parse_headers, read_headers
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+    from importlib.metadata import Distribution
+    from os import stat_result
     from pathlib import Path
 
+    from license_scanner.cache import MemoryCache, ResultCache
+    from license_scanner.index import MetadataIndex
+    from license_scanner.lockfile import LockedPackage
+
+    Fetcher = Callable[
+        [list[LockedPackage]], Mapping[LockedPackage, PackageLicenses | None]
+    ]
+
 
 class ScanError(Exception):
     pass
 
 
-def scan_directory(base: "Path") -> "Iterator[PackageLicenses]":
-    import json
+# Suffixes of the archives read by scan_archives
+ARCHIVE_SUFFIXES = (".whl", ".zip", ".tar.gz", ".tgz", ".tar.bz2")
+
+
+def scan_directory(base: "Path", jobs: int = 1) -> "Iterator[PackageLicenses]":
+    # Files are sorted so the output does not depend on the filesystem order,
+    # nor on the order in which the workers finish.
+    with stage("glob"):
+        jsonfiles = sorted(base.glob("*.json"))
+    yield from _scan_files(read_json_file, jsonfiles, jobs)
+
+
+def scan_archives(base: "Path", jobs: int = 1) -> "Iterator[PackageLicenses]":
+    """
+    Scan the wheels and sdists found in a directory without extracting them.
+
+    Only the metadata member of each archive is read: the METADATA file of
+    the .dist-info directory of wheels, the top level PKG-INFO of sdists.
+    Tar archives are read as a stream and stop at PKG-INFO.
+    """
+    with stage("glob"):
+        archives = sorted(
+            path
+            for path in base.iterdir()
+            if path.name.endswith(ARCHIVE_SUFFIXES) and path.is_file()
+        )
+    yield from _scan_files(_read_archive, archives, jobs)
+
+
+def _scan_files(
+    read: "Callable[[Path], PackageLicenses]", files: "list[Path]", jobs: int
+) -> "Iterator[PackageLicenses]":
+    if jobs == 1:
+        yield from map(read, files)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        chunksize = max(1, min(256, len(files) // (jobs * 4)))
+        yield from executor.map(partial(_scan_file, read), files, chunksize=chunksize)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _scan_file(
+    read: "Callable[[Path], PackageLicenses]", file: "Path"
+) -> PackageLicenses:  # pragma: no cover
+    # Runs in a worker process. The licenses are classified here so the
+    # parent only has to unpickle the results.
+    package = read(file)
+    _ = package.licenses
+    return package
+
+
+def read_json_file(jsonfile: "Path") -> PackageLicenses:
+    from license_scanner.decoder import DecodeError, decode
+
+    try:
+        with stage("read"):
+            data = jsonfile.read_bytes()
+    except OSError as exc:
+        message = f"Can't read {jsonfile}. {exc}"
+        raise ScanError(message) from None
+
+    try:
+        with stage("decode"):
+            return decode(data)
+    except DecodeError as exc:
+        message = f"Invalid format {jsonfile}. {exc}"
+        raise ScanError(message) from None
+
+
+def scan_locked(
+    packages: "Sequence[LockedPackage]",
+    base: "Path | MetadataIndex | None" = None,
+    fetch: "Fetcher | None" = None,
+) -> "Iterator[PackageLicenses]":
+    """
+    Resolve locked packages against a directory of PyPI JSON files, the same
+    files scan_directory reads, or against a MetadataIndex of them.
+
+    Every package is a keyed lookup of <name>-<version>.json and <name>.json,
+    with the name as locked and normalized. The directory is never listed, so
+    the cost depends on the size of the lockfile, not of the directory. Files
+    of another version do not match. Packages not found are passed to fetch
+    in a single call, and the ones still missing are reported with no license.
+    """
+    found = {
+        package: _find_locked(base, package) if base else None for package in packages
+    }
+    if fetch and (missing := [p for p, package in found.items() if package is None]):
+        found.update(fetch(missing))
+
+    for package in packages:
+        yield found[package] or PackageLicenses(
+            package.name, package.version or "", None, None, []
+        )
+
+
+def _find_locked(
+    base: "Path | MetadataIndex", package: "LockedPackage"
+) -> PackageLicenses | None:
+    from packaging.utils import canonicalize_name, canonicalize_version
+
+    from license_scanner.index import MetadataIndex
+
+    if isinstance(base, MetadataIndex):
+        return base.lookup(package.name, package.version)
+
+    version = canonicalize_version(package.version) if package.version else None
+    for name in dict.fromkeys((package.name, canonicalize_name(package.name))):
+        names = [f"{name}-{package.version}.json"] if package.version else []
+        for jsonfile in (base / n for n in [*names, f"{name}.json"]):
+            if not jsonfile.is_file():
+                continue
+            found = read_json_file(jsonfile)
+            if version is None:
+                return found
+            # A file with a null version matches no version. Invalid version
+            # strings are compared as they are by canonicalize_version.
+            if found.version and canonicalize_version(found.version) == version:
+                return found
+    return None
+
+
+def _read_archive(archive: "Path") -> PackageLicenses:
+    import tarfile
+    import zipfile
+
+    try:
+        with stage("archive"):
+            if archive.name.endswith((".whl", ".zip")):
+                text = _read_zip_metadata(archive)
+            else:
+                text = _read_tar_metadata(archive)
+    except (OSError, UnicodeDecodeError, tarfile.TarError, zipfile.BadZipFile) as exc:
+        message = f"Can't read {archive}. {exc}"
+        raise ScanError(message) from None
+
+    if text is None:
+        message = f"Can't find the metadata of {archive}"
+        raise ScanError(message)
+    return _parse_metadata(text)
+
+
+def _read_zip_metadata(archive: "Path") -> str | None:
+    import zipfile
+
+    # Wheels have a top level <name>-<version>.dist-info/METADATA member, zip
+    # sdists a <name>-<version>/PKG-INFO one.
+    wheel = archive.name.endswith(".whl")
+    with zipfile.ZipFile(archive) as zf:
+        for name in zf.namelist():
+            top, _, member = name.partition("/")
+            if wheel and member == "METADATA" and top.endswith(".dist-info"):
+                return zf.read(name).decode()
+            if not wheel and member == "PKG-INFO":
+                return zf.read(name).decode()
+    return None
+
 
-    for jsonfile in base.glob("*.json"):
+def _read_tar_metadata(archive: "Path") -> str | None:
+    import tarfile
+
+    # Stream mode decompresses sequentially and never seeks back, members
+    # after PKG-INFO are not read at all.
+    with tarfile.open(archive, mode="r|*") as tf:
+        for info in tf:
+            _, _, member = info.name.partition("/")
+            if member == "PKG-INFO" and (fd := tf.extractfile(info)):
+                return fd.read().decode()
+    return None
+
+
+def _parse_metadata(text: str) -> PackageLicenses:
+    try:
+        return _package_from_headers(parse_headers(text.splitlines(keepends=True)))
+    except MetadataError:
+        from email.parser import HeaderParser
+
+        message = HeaderParser().parsestr(text)
+        return PackageLicenses(
+            name=message.get("Name", ""),
+            version=message.get("Version", ""),
+            license=message.get("License", None),
+            license_expression=message.get("License-Expression", None),
+            classifiers=message.get_all("Classifier", []),
+        )
+
+
+def scan_distributions(
+    cache: "ResultCache | MemoryCache | None" = None,
+) -> "Iterator[PackageLicenses]":
+    import importlib.metadata
+
+    for dist in importlib.metadata.distributions():
+        if cache is None:
+            yield read_distribution(dist)
+        else:
+            yield _read_cached_distribution(dist, cache)
+
+    if cache is not None:
+        cache.evict()
+
+
+def scan_environments(
+    paths: "Sequence[Path]",
+) -> "Iterator[tuple[Path, PackageLicenses]]":
+    """
+    Scan the distributions installed under each path, usually site-packages
+    directories of other environments, and yield them with their path.
+
+    Environments are read concurrently, one thread each. Distributions whose
+    metadata is identical, as installed in many environments, are parsed and
+    classified once and share the same PackageLicenses.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from hashlib import sha256
+
+    packages: dict[bytes, PackageLicenses] = {}
+    with ThreadPoolExecutor() as executor:
+        for path, found in zip(
+            paths, executor.map(_read_environment, paths), strict=True
+        ):
+            for text in found:
+                digest = sha256(text.encode()).digest()
+                if (package := packages.get(digest)) is None:
+                    with stage("metadata"):
+                        package = _parse_metadata(text)
+                    packages[digest] = package
+                yield path, package
+
+
+def _read_environment(path: "Path") -> list[str]:
+    # Runs in a worker thread, only the I/O happens here. The metadata file is
+    # read whole so it can be hashed, in the same order importlib.metadata
+    # looks for it.
+    import importlib.metadata
+
+    found: list[str] = []
+    dists = importlib.metadata.distributions(path=[str(path)])
+    for dist in sorted(dists, key=lambda d: str(getattr(d, "_path", ""))):
         try:
-            with jsonfile.open(mode="rb") as fd:
-                jsondata = json.load(fd)
-        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
-            message = f"Can't read {jsonfile}. {exc}"
+            with stage("environment"):
+                text = (
+                    dist.read_text("METADATA")
+                    or dist.read_text("PKG-INFO")
+                    or dist.read_text("")
+                )
+        except (OSError, UnicodeDecodeError) as exc:
+            message = f"Can't read {getattr(dist, '_path', path)}. {exc}"
             raise ScanError(message) from None
+        if text:
+            found.append(text)
+    return found
+
+
+def _read_cached_distribution(
+    dist: "Distribution", cache: "ResultCache | MemoryCache"
+) -> PackageLicenses:
+    path = getattr(dist, "_path", None)
+    if not path or not (found := _find_metadata_file(path)):
+        return read_distribution(dist)
 
+    _, stat = found
+    if package := cache.get(str(path), stat):
+        return package
+
+    package = read_distribution(dist)
+    _ = package.licenses
+    cache.put(str(path), stat, package)
+    return package
+
+
+def _find_metadata_file(path: "Path") -> "tuple[Path, stat_result] | None":
+    for name in ("METADATA", "PKG-INFO"):
+        metadata = path / name
         try:
-            yield PackageLicenses(
-                name=jsondata.get("name", ""),
-                version=jsondata.get("version", ""),
-                license=jsondata.get("license", None),
-                license_expression=jsondata.get("license_expression", None),
-                classifiers=jsondata.get("classifiers", []),
-            )
-        except AttributeError as exc:
-            message = f"Invalid format {jsonfile}. {exc}"
-            raise ScanError(message) from None
+            return metadata, metadata.stat()
+        except OSError:
+            continue
+    return None
 
 
-if sys.version_info >= (3, 12):  # pragma: >=3.12 cover
+def read_distribution(dist: "Distribution | Path") -> PackageLicenses:
+    """Read a distribution, or the one whose metadata directory is dist."""
+    from os import PathLike
 
-    def scan_distributions() -> "Iterator[PackageLicenses]":
+    if isinstance(dist, PathLike):
         import importlib.metadata
 
+        dist = importlib.metadata.PathDistribution(dist)
+
+    # Only distributions found on the filesystem (PathDistribution) know where
+    # their metadata lives. Those are read with the header-only reader, which
+    # skips the long description, the rest go through importlib.metadata.
+    with stage("metadata"):
+        path = getattr(dist, "_path", None)
+        if path and (found := _find_metadata_file(path)):
+            try:
+                return _read_metadata_file(found[0])
+            except (OSError, UnicodeDecodeError, MetadataError):
+                pass
+        return _read_email_metadata(dist)
+
+
+def _read_metadata_file(metadata: "Path") -> PackageLicenses:
+    return _package_from_headers(read_headers(metadata))
+
+
+def _package_from_headers(headers: dict[str, list[str]]) -> PackageLicenses:
+    try:
+        (name, *_), (version, *_) = headers["name"], headers["version"]
+    except KeyError:
+        message = "metadata has no name or version"
+        raise MetadataError(message) from None
+
+    return PackageLicenses(
+        name=name,
+        version=version,
+        license=headers.get("license", [None])[0],
+        license_expression=headers.get("license-expression", [None])[0],
+        classifiers=headers.get("classifier", []),
+    )
+
+
+if sys.version_info >= (3, 12):  # pragma: >=3.12 cover
+
+    def _read_email_metadata(dist: "Distribution") -> PackageLicenses:
         # Distribution.metadata is an email.message.Message instance.
         # __getitem__ was fixed in 3.12 and a get() was added, we use it
-        for dist in importlib.metadata.distributions():
-            yield PackageLicenses(
-                name=dist.name,
-                version=dist.version,
-                license=dist.metadata.get("License", None),
-                license_expression=dist.metadata.get("License-Expression", None),
-                classifiers=dist.metadata.get_all("Classifier", []),
-            )
+        return PackageLicenses(
+            name=dist.name,
+            version=dist.version,
+            license=dist.metadata.get("License", None),
+            license_expression=dist.metadata.get("License-Expression", None),
+            classifiers=dist.metadata.get_all("Classifier", []),
+        )
 
 else:  # pragma: <3.12 cover
 
-    def scan_distributions() -> "Iterator[PackageLicenses]":
-        import importlib.metadata
-
+    def _read_email_metadata(dist: "Distribution") -> PackageLicenses:
         # Distribution.metadata is an email.message.Message instance.
         # __getitem__ returns None instead of raising KeyError
-        for dist in importlib.metadata.distributions():
-            yield PackageLicenses(
-                name=dist.name,
-                version=dist.version,
-                license=dist.metadata["License"],
-                license_expression=dist.metadata["License-Expression"],
-                classifiers=dist.metadata.get_all("Classifier", []),
-            )
+        return PackageLicenses(
+            name=dist.name,
+            version=dist.version,
+            license=dist.metadata["License"],
+            license_expression=dist.metadata["License-Expression"],
+            classifiers=dist.metadata.get_all("Classifier", []),
+        )
@@ -0,0 +1,166 @@
+"""
+Answer scans from a resident process over a Unix socket.
+
+The server keeps warm what every run of the command builds from scratch: the
+imports, the classifier index, the SPDX and license text caches, and the
+results of the installed distributions. Requests are answered one at a time,
+in the working directory of the client.
+
+The protocol is one JSON object per line, any number of requests can be sent
+over a connection:
+
+- request: {"args": ["-i", "dir", ...], "cwd": "/path"}
+- response: {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+The socket is only accessible by its owner.
+"""
+
+import json
+import os
+import socket
+import sys
+from argparse import RawDescriptionHelpFormatter
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from io import StringIO
+from pathlib import Path
+from socketserver import StreamRequestHandler, UnixStreamServer
+from typing import TYPE_CHECKING
+
+from license_scanner.cache import MemoryCache
+from license_scanner.cli import ApplicationError, CustomArgumentParser, main
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ("ScanServer", "connect", "connect_from_args", "serve_from_args")
+
+# Arguments that start another server or client, or that never return, not
+# allowed in requests
+COMMANDS = ("serve", "watch", "--connect")
+
+
+class ScanRequestHandler(StreamRequestHandler):
+    server: "ScanServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = self.server.answer(line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class ScanServer(UnixStreamServer):
+    def __init__(self, path: Path) -> None:
+        self.cache = MemoryCache()
+        self._remove_stale_socket(path)
+        # The socket is created private, a chmod after the bind would leave a
+        # window where other users can connect.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), ScanRequestHandler)
+        finally:
+            os.umask(umask)
+
+    def answer(self, line: bytes) -> dict[str, str | int]:
+        try:
+            request = json.loads(line)
+            args, cwd = request["args"], Path(request.get("cwd", Path.cwd()))
+            if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+                raise TypeError  # noqa: TRY301
+        except (ValueError, KeyError, TypeError):
+            return self._error(f"invalid request: {line[:80]!r}", exit_code=2)
+        if args[:1] and args[0] in COMMANDS:
+            return self._error(f"{args[0]} is not allowed in a request", exit_code=2)
+
+        previous = Path.cwd()
+        try:
+            os.chdir(cwd)
+        except OSError as exc:
+            return self._error(f"Can't change directory: {exc}", exit_code=1)
+
+        stdout, stderr = StringIO(), StringIO()
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exit_code = main(args, result_cache=self.cache)
+        finally:
+            os.chdir(previous)
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    @staticmethod
+    def _error(message: str, exit_code: int) -> dict[str, str | int]:
+        return {"exit_code": exit_code, "stdout": "", "stderr": f"ERROR: {message}\n"}
+
+    def server_close(self) -> None:
+        super().server_close()
+        with suppress(OSError):
+            Path(self.server_address).unlink()  # type: ignore[arg-type]
+
+    @staticmethod
+    def _remove_stale_socket(path: Path) -> None:
+        # Left behind by a server that did not exit cleanly. A socket in use
+        # is kept, binding to it fails.
+        if not path.is_socket():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(path))
+            except ConnectionRefusedError:
+                path.unlink()
+
+
+def connect(path: Path, args: "Sequence[str]") -> int:
+    """Send a request to the server, print its output and return its exit code."""
+    request = {"args": list(args), "cwd": str(Path.cwd())}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            with sock.makefile(mode="rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                response = json.loads(stream.readline())
+    except (OSError, ValueError) as exc:
+        message = f"Can't connect to server: {path}. {exc}"
+        raise ApplicationError(message) from None
+
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.stderr.flush()
+    return response["exit_code"]
+
+
+def connect_from_args(argv: "Sequence[str]") -> int:
+    if not argv:
+        message = "argument --connect: expected one argument"
+        raise ApplicationError(message, exit_code=2)
+    return connect(Path(argv[0]), argv[1:])
+
+
+def serve_from_args(argv: "Sequence[str]") -> int:
+    argp = CustomArgumentParser(
+        prog="license-scanner serve",
+        description=__doc__,
+        formatter_class=RawDescriptionHelpFormatter,
+    )
+    argp.add_argument(
+        "--socket",
+        type=Path,
+        required=True,
+        metavar="PATH",
+        help="Unix socket to listen on",
+    )
+    args = argp.parse_args(argv)
+
+    try:
+        server = ScanServer(args.socket)
+    except OSError as exc:
+        message = f"Can't listen on {args.socket}. {exc}"
+        raise ApplicationError(message) from None
+
+    with server, suppress(KeyboardInterrupt):
+        server.serve_forever()
+    return 0
@@ -0,0 +1,143 @@
+"""
+SPDX license expressions, canonicalized and parsed.
+
+Expressions are parsed once per canonical form into an immutable tree of Or,
+And and Leaf nodes, so every spelling of an expression shares the same tree.
+WITH binds tighter than AND, and AND tighter than OR. Operands of nested
+operators of the same kind are flattened, (A AND B) AND C is And((A, B, C)).
+Reference: <https://spdx.github.io/spdx-spec/v2.3/SPDX-license-expressions/>.
+"""
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Container
+    from functools import _CacheInfo
+
+__all__ = (
+    "CACHE_SIZE",
+    "And",
+    "Leaf",
+    "Or",
+    "cache_info",
+    "canonicalize",
+    "parse",
+    "satisfiable",
+)
+
+# Real world metadata uses a few hundred distinct expressions, the cache is
+# bounded anyway to keep memory flat on pathological inputs.
+CACHE_SIZE = 4096
+
+TOKEN = re.compile(r"[()]|[^\s()]+")
+
+
+class Leaf(NamedTuple):
+    identifier: str
+    exception: str | None = None
+
+    @property
+    def leaves(self) -> tuple["Leaf", ...]:
+        return (self,)
+
+
+class And(NamedTuple):
+    operands: tuple["Leaf | And | Or", ...]
+
+    @property
+    def leaves(self) -> tuple[Leaf, ...]:
+        return tuple(leaf for operand in self.operands for leaf in operand.leaves)
+
+
+class Or(NamedTuple):
+    operands: tuple["Leaf | And | Or", ...]
+
+    @property
+    def leaves(self) -> tuple[Leaf, ...]:
+        return tuple(leaf for operand in self.operands for leaf in operand.leaves)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalize(expression: str) -> str | None:
+    # Imported here, only cache misses pay for it and the CLI startup doesn't.
+    import packaging.licenses
+
+    try:
+        return packaging.licenses.canonicalize_license_expression(expression)
+    except packaging.licenses.InvalidLicenseExpression:
+        return None
+
+
+def cache_info() -> "_CacheInfo":
+    return canonicalize.cache_info()
+
+
+def parse(expression: str) -> Leaf | And | Or | None:
+    """The tree of a valid expression, None for invalid ones."""
+    canonical = canonicalize(expression)
+    return _parse_canonical(canonical) if canonical else None
+
+
+def satisfiable(node: Leaf | And | Or, allowed: "Container[str]") -> bool:
+    """
+    Whether the licenses allowed are enough to comply with the expression:
+    every operand of an And, at least one of an Or. Exceptions only add
+    permissions and are not checked.
+    """
+    if isinstance(node, Leaf):
+        return node.identifier in allowed
+    if isinstance(node, And):
+        return all(satisfiable(operand, allowed) for operand in node.operands)
+    return any(satisfiable(operand, allowed) for operand in node.operands)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_canonical(canonical: str) -> Leaf | And | Or:
+    # Canonical expressions are valid and their operators upper case, the
+    # parser does not check the syntax again. Tokens are popped from the end.
+    tokens = TOKEN.findall(canonical)[::-1]
+    return _parse_or(tokens)
+
+
+def _parse_or(tokens: list[str]) -> Leaf | And | Or:
+    operands = [_parse_and(tokens)]
+    while tokens and tokens[-1] == "OR":
+        tokens.pop()
+        operands.append(_parse_and(tokens))
+    if len(operands) == 1:
+        return operands[0]
+    return Or(tuple(_flatten(Or, operands)))
+
+
+def _parse_and(tokens: list[str]) -> Leaf | And | Or:
+    operands = [_parse_term(tokens)]
+    while tokens and tokens[-1] == "AND":
+        tokens.pop()
+        operands.append(_parse_term(tokens))
+    if len(operands) == 1:
+        return operands[0]
+    return And(tuple(_flatten(And, operands)))
+
+
+def _parse_term(tokens: list[str]) -> Leaf | And | Or:
+    term = tokens.pop()
+    if term == "(":
+        node = _parse_or(tokens)
+        tokens.pop()  # the closing parenthesis
+        return node
+    if tokens and tokens[-1] == "WITH":
+        tokens.pop()
+        return Leaf(term, tokens.pop())
+    return Leaf(term)
+
+
+def _flatten(
+    kind: type[And | Or], operands: "list[Leaf | And | Or]"
+) -> "list[Leaf | And | Or]":
+    return [
+        nested
+        for operand in operands
+        for nested in (operand.operands if isinstance(operand, kind) else (operand,))
+    ]
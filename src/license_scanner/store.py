@@ -0,0 +1,146 @@
+import os
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from zipfile import ZipFile
+
+__all__ = (
+    "LAYOUTS",
+    "PACK_FILE",
+    "DirectoryStore",
+    "LicenseStore",
+    "PackStore",
+    "StoreError",
+    "open_store",
+)
+
+PACK_FILE = "licenses.zip"
+
+
+class StoreError(Exception):
+    pass
+
+
+class LicenseStore(ABC):
+    """
+    Content addressed storage for license texts, keyed by their sha256 digest.
+
+    Digests already stored in this run are remembered, each text is checked
+    and written at most once no matter how many packages embed it.
+    """
+
+    def __init__(self) -> None:
+        self._stored: set[str] = set()
+
+    def save(self, digest: str, text: str) -> None:
+        if digest in self._stored:
+            return
+        if not self._exists(digest):
+            self._write(digest, text)
+        self._stored.add(digest)
+
+    def close(self) -> None:  # noqa: B027
+        pass
+
+    @abstractmethod
+    def _exists(self, digest: str) -> bool: ...
+
+    @abstractmethod
+    def _write(self, digest: str, text: str) -> None: ...
+
+
+class DirectoryStore(LicenseStore):
+    """
+    One `<digest>.txt` file per text. With `shard`, files are spread over
+    subdirectories named after the first two characters of the digest.
+    Files are written to a temporary file and renamed, so readers never see a
+    partial text.
+    """
+
+    def __init__(self, directory: Path, *, shard: bool = False) -> None:
+        super().__init__()
+        self._directory = directory
+        self._shard = shard
+
+    def path(self, digest: str) -> Path:
+        if self._shard:
+            return self._directory / digest[:2] / f"{digest}.txt"
+        return self._directory / f"{digest}.txt"
+
+    def _exists(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    def _write(self, digest: str, text: str) -> None:
+        file = self.path(digest)
+        tmp = file.with_name(f".{file.name}.{os.getpid()}.tmp")
+        try:
+            file.parent.mkdir(exist_ok=True)
+            tmp.write_text(text)
+            tmp.replace(file)
+        except OSError as exc:
+            with suppress(OSError):
+                tmp.unlink()
+            message = f"Can't write license file: {file}. {exc}"
+            raise StoreError(message) from exc
+
+
+class PackStore(LicenseStore):
+    """
+    Every text as a `<digest>.txt` member of a single deflate compressed zip
+    file. The file is opened on the first write and appended to if it exists.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self._path = path
+        self._pack: ZipFile | None = None
+        self._members: set[str] = set()
+
+    def _open(self) -> "ZipFile":
+        import zipfile
+
+        if self._pack is None:
+            try:
+                self._pack = zipfile.ZipFile(
+                    self._path, mode="a", compression=zipfile.ZIP_DEFLATED
+                )
+            except (
+                OSError,
+                ValueError,
+                NotImplementedError,
+                zipfile.BadZipFile,
+            ) as exc:
+                # Besides BadZipFile, a pack damaged by an interrupted run can
+                # fail with invalid names or unsupported versions
+                message = f"Can't write license file: {self._path}. {exc}"
+                raise StoreError(message) from exc
+            self._members = set(self._pack.namelist())
+        return self._pack
+
+    def _exists(self, digest: str) -> bool:
+        self._open()
+        return f"{digest}.txt" in self._members
+
+    def _write(self, digest: str, text: str) -> None:
+        try:
+            self._open().writestr(f"{digest}.txt", text)
+        except OSError as exc:
+            message = f"Can't write license file: {self._path}. {exc}"
+            raise StoreError(message) from exc
+
+    def close(self) -> None:
+        if self._pack is not None:
+            self._pack.close()
+            self._pack = None
+
+
+LAYOUTS = ("flat", "sharded", "pack")
+
+
+def open_store(directory: Path, layout: str = "flat") -> LicenseStore:
+    if layout == "pack":
+        return PackStore(directory / PACK_FILE)
+    return DirectoryStore(directory, shard=layout == "sharded")
@@ -0,0 +1,284 @@
+"""
+Keep the results of a scan current while the scanned directories change.
+
+The directories are scanned once, then only the entries that changed are read
+and classified again: the *.json files of an input directory, the *.dist-info
+and *.egg-info directories of site-packages. An entry changed when the mtime
+or size of its file, or of its METADATA or PKG-INFO file, did.
+
+On Linux the directories are watched with inotify, through ctypes, and only
+the entries named by its events are checked. Elsewhere, or when inotify is
+not available, every entry is checked with a stat call at a fixed interval.
+A directory entry created before its metadata file is written, as installers
+do, is checked again at that interval until the file shows up.
+Reference: <https://man7.org/linux/man-pages/man7/inotify.7.html>.
+"""
+
+import os
+import time
+from contextlib import suppress
+from types import TracebackType
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+from license_scanner.scanner import ScanError, read_distribution, read_json_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from pathlib import Path
+
+    from license_scanner import PackageLicenses
+
+    Key = tuple[Path, str]
+
+__all__ = ("Change", "InotifyWatcher", "PollingWatcher", "Tracker", "watch")
+
+# Events of the watched directories that add, remove or replace an entry
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+
+# Events keep coming while a package is being written, they are read until
+# the directories are quiet for this long, in seconds.
+SETTLE_TIME = 0.1
+
+METADATA_FILES = ("METADATA", "PKG-INFO")
+
+
+class Change(NamedTuple):
+    change: str
+    directory: "Path"
+    package: "PackageLicenses"
+
+
+class Entry(NamedTuple):
+    signature: tuple[int, int]
+    package: "PackageLicenses"
+
+
+class Tracker:
+    """The packages found in the directories, by directory and entry name."""
+
+    def __init__(self, directories: "Sequence[Path]", *, site_packages: bool) -> None:
+        self._directories = directories
+        self._site_packages = site_packages
+        self._entries: dict[Key, Entry] = {}
+        # Entries without a metadata file yet
+        self.pending: set[Key] = set()
+
+    def update(self, keys: "Iterable[Key] | None" = None) -> list[Change]:
+        """
+        Check the entries given, or all of them when keys is None, and return
+        what changed since the previous update.
+        """
+        if keys is None:
+            keys = {*self._entries, *self._list()}
+        changes: list[Change] = []
+        for directory, name in sorted({*keys, *self.pending}):
+            if self._tracked(name):
+                changes.extend(self._check(directory, name))
+        return changes
+
+    def _list(self) -> "Iterator[Key]":
+        for directory in self._directories:
+            with os.scandir(directory) as entries:
+                yield from ((directory, entry.name) for entry in entries)
+
+    def _tracked(self, name: str) -> bool:
+        if self._site_packages:
+            return name.endswith((".dist-info", ".egg-info"))
+        return name.endswith(".json")
+
+    def _check(self, directory: "Path", name: str) -> list[Change]:
+        key = (directory, name)
+        previous = self._entries.get(key)
+        signature = self._signature(directory / name)
+        self.pending.discard(key)
+        if signature is None:
+            if self._site_packages and (directory / name).is_dir():
+                self.pending.add(key)
+            if previous is None:
+                return []
+            del self._entries[key]
+            return [Change("removed", directory, previous.package)]
+        if previous and previous.signature == signature:
+            return []
+
+        try:
+            package = self._read(directory / name)
+        except ScanError:
+            # Most likely still being written, tried again later
+            self.pending.add(key)
+            return []
+        _ = package.licenses
+        self._entries[key] = Entry(signature, package)
+        if previous is None:
+            return [Change("added", directory, package)]
+        return self._compare(directory, previous.package, package)
+
+    @staticmethod
+    def _compare(
+        directory: "Path", previous: "PackageLicenses", package: "PackageLicenses"
+    ) -> list[Change]:
+        # Packages are told apart by name and version, as in baselines
+        if (previous.name, previous.version) != (package.name, package.version):
+            return [
+                Change("removed", directory, previous),
+                Change("added", directory, package),
+            ]
+        if previous.licenses != package.licenses:
+            return [Change("changed", directory, package)]
+        return []
+
+    def _signature(self, path: "Path") -> tuple[int, int] | None:
+        from stat import S_ISREG
+
+        files = (
+            [path / name for name in METADATA_FILES] if self._site_packages else [path]
+        )
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            if S_ISREG(stat.st_mode):
+                return stat.st_mtime_ns, stat.st_size
+        return None
+
+    def _read(self, path: "Path") -> "PackageLicenses":
+        if self._site_packages:
+            return read_distribution(path)
+        return read_json_file(path)
+
+
+class PollingWatcher:
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+
+    def wait(self, timeout: float | None = None) -> "set[Key] | None":
+        """Sleep for the interval, every entry may have changed then."""
+        time.sleep(self._interval if timeout is None else min(timeout, self._interval))
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        typ: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class InotifyWatcher:
+    def __init__(self, directories: "Sequence[Path]") -> None:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        try:
+            init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except AttributeError:
+            message = "inotify is not available"
+            raise OSError(message) from None
+
+        self._fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, Path] = {}
+        for directory in directories:
+            wd = add_watch(self._fd, os.fsencode(directory), MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                self.close()
+                raise OSError(errno, os.strerror(errno), str(directory))
+            self._directories[wd] = directory
+
+    def wait(self, timeout: float | None = None) -> "set[Key] | None":
+        """
+        Wait for events and return the entries they name, None when the kernel
+        dropped events and every entry may have changed.
+        """
+        import select
+        import struct
+
+        keys: set[Key] = set()
+        overflow = False
+        while select.select([self._fd], [], [], timeout)[0]:
+            data = os.read(self._fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                name = data[offset + 16 : offset + 16 + length].rstrip(b"\0")
+                offset += 16 + length
+                overflow |= bool(mask & IN_Q_OVERFLOW)
+                if wd in self._directories and name:
+                    keys.add((self._directories[wd], os.fsdecode(name)))
+            timeout = SETTLE_TIME
+        return None if overflow else keys
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        typ: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def watch(
+    directories: "Sequence[Path]",
+    *,
+    site_packages: bool = False,
+    interval: float = 1.0,
+    polling: bool = False,
+) -> "Iterator[list[Change]]":
+    """
+    Yield every package found as added, then the changes of each update that
+    found any, forever.
+    """
+    tracker = Tracker(directories, site_packages=site_packages)
+    watcher: InotifyWatcher | PollingWatcher = PollingWatcher(interval)
+    if not polling:
+        # Watching starts before the first scan, nothing is missed.
+        with suppress(OSError):
+            watcher = InotifyWatcher(directories)
+
+    with watcher:
+        try:
+            yield tracker.update()
+            while True:
+                timeout = interval if tracker.pending else None
+                if changes := tracker.update(watcher.wait(timeout)):
+                    yield changes
+        except OSError as exc:
+            message = f"Can't watch {', '.join(map(str, directories))}. {exc}"
+            raise ScanError(message) from None
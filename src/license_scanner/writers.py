@@ -0,0 +1,128 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from typing import TextIO
+
+    Record = dict[str, str | float | None]
+    Writer = Callable[[Iterable[Record], TextIO], None]
+
+__all__ = (
+    "COLUMNS",
+    "FLUSH_EVERY",
+    "WRITERS",
+    "write_arrow",
+    "write_json",
+    "write_ndjson",
+    "write_tsv",
+)
+
+FLUSH_EVERY = 1000
+
+# Every field a record can have, the optional ones last. Which of them are
+# present depends on the options and, with a baseline, on each record.
+COLUMNS = (
+    "package-name",
+    "package-version",
+    "license",
+    "source",
+    "state",
+    "canonical",
+    "confidence",
+    "metadata-digest",
+    "environment",
+    "violation",
+    "change",
+)
+
+# Columns with a handful of distinct values, stored once per batch by arrow
+DICTIONARY_COLUMNS = ("license", "source", "state")
+FLOAT_COLUMNS = ("confidence",)
+
+
+def write_json(records: "Iterable[Record]", stream: "TextIO") -> None:
+    # Produces the same output as json.dump(list(records), stream, indent=4)
+    # without holding the whole list in memory.
+    import json
+
+    separator = "[\n    "
+    for record in _flush_in_chunks(records, stream):
+        stream.write(separator)
+        stream.write(json.dumps(record, indent=4).replace("\n", "\n    "))
+        separator = ",\n    "
+    stream.write("[]" if separator == "[\n    " else "\n]")
+    stream.flush()
+
+
+def write_ndjson(records: "Iterable[Record]", stream: "TextIO") -> None:
+    import json
+
+    for record in _flush_in_chunks(records, stream):
+        stream.write(json.dumps(record, separators=(",", ":")))
+        stream.write("\n")
+    stream.flush()
+
+
+def write_tsv(records: "Iterable[Record]", stream: "TextIO") -> None:
+    # The columns are fixed, so records with different fields line up. Missing
+    # fields and None are written as empty fields.
+    import csv
+
+    writer = csv.DictWriter(
+        stream,
+        fieldnames=COLUMNS,
+        restval="",
+        extrasaction="ignore",
+        dialect="excel-tab",
+        lineterminator="\n",
+    )
+    writer.writeheader()
+    for record in _flush_in_chunks(records, stream):
+        writer.writerow(record)
+    stream.flush()
+
+
+def write_arrow(  # pragma: no cover
+    records: "Iterable[Record]", stream: "TextIO"
+) -> None:
+    # Arrow IPC stream format, written to the binary buffer under stream. One
+    # record batch per FLUSH_EVERY records, the schema is taken from the
+    # first record.
+    from itertools import islice
+
+    import pyarrow as pa
+
+    iterator = iter(records)
+    batch = list(islice(iterator, FLUSH_EVERY))
+    schema = pa.schema(
+        [
+            (name, pa.dictionary(pa.int32(), pa.string()))
+            if name in DICTIONARY_COLUMNS
+            else (name, pa.float64() if name in FLOAT_COLUMNS else pa.string())
+            for name in (batch[0] if batch else ())
+        ]
+    )
+
+    stream.flush()
+    with pa.ipc.new_stream(stream.buffer, schema) as writer:
+        while batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            batch = list(islice(iterator, FLUSH_EVERY))
+    stream.buffer.flush()
+
+
+def _flush_in_chunks(
+    records: "Iterable[Record]", stream: "TextIO"
+) -> "Iterator[Record]":
+    for count, record in enumerate(records, start=1):
+        yield record
+        if count % FLUSH_EVERY == 0:
+            stream.flush()
+
+
+WRITERS: "dict[str, Writer]" = {
+    "json": write_json,
+    "ndjson": write_ndjson,
+    "tsv": write_tsv,
+    "arrow": write_arrow,
+}
@@ -0,0 +1,126 @@
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import PackageLicenses
+from license_scanner.baseline import Baseline, BaselineError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def record(name: str, version: str, lic: str, **extra: str) -> dict[str, str]:
+    return {
+        "package-name": name,
+        "package-version": version,
+        "license": lic,
+        "source": "Expression",
+        "state": "VALID",
+        **extra,
+    }
+
+
+def package(name: str, version: str, lic: str) -> PackageLicenses:
+    return PackageLicenses(name, version, None, lic, [])
+
+
+def records(
+    package: PackageLicenses, environment: "Path | None"
+) -> list[dict[str, str]]:
+    extra = {"environment": str(environment)} if environment else {}
+    lic = package.license_expression or ""
+    result = record(package.name, package.version, lic, **extra)
+    result["metadata-digest"] = package.metadata_digest
+    return [result]
+
+
+def diff(baseline: Baseline, current: list[PackageLicenses]) -> list[dict[str, str]]:
+    changes = baseline.diff([(p, None) for p in current], records)
+    return [r for rs in changes for r in rs]
+
+
+BASELINE = [
+    record("unchanged", "1.0.0", "MIT"),
+    record("changed", "1.0.0", "MIT"),
+    record("removed", "1.0.0", "MIT"),
+    record("upgraded", "1.0.0", "MIT"),
+]
+
+
+def test_diff() -> None:
+    current = [
+        package("unchanged", "1.0.0", "MIT"),
+        package("changed", "1.0.0", "Apache-2.0"),
+        package("upgraded", "2.0.0", "MIT"),
+        package("added", "1.0.0", "MIT"),
+    ]
+    result = diff(Baseline(BASELINE), current)
+    assert [(r["package-name"], r["package-version"], r["change"]) for r in result] == [
+        ("changed", "1.0.0", "changed"),
+        ("upgraded", "2.0.0", "added"),
+        ("added", "1.0.0", "added"),
+        ("removed", "1.0.0", "removed"),
+        ("upgraded", "1.0.0", "removed"),
+    ]
+    assert result[0]["license"] == "Apache-2.0"
+
+
+def test_diff_skips_unchanged_metadata() -> None:
+    current = [
+        package("unchanged", "1.0.0", "MIT"),
+        package("changed", "1.0.0", "Apache-2.0"),
+    ]
+    baseline = Baseline(
+        [*records(current[0], None), *records(package("changed", "1.0.0", "MIT"), None)]
+    )
+
+    classified: list[str] = []
+
+    def counting(
+        package: PackageLicenses, environment: "Path | None"
+    ) -> list[dict[str, str]]:
+        classified.append(package.name)
+        return records(package, environment)
+
+    changes = baseline.diff([(p, None) for p in current], counting)
+    assert [(r["package-name"], r["change"]) for rs in changes for r in rs] == [
+        ("changed", "changed"),
+    ]
+    assert classified == ["changed"]
+
+
+def test_diff_environments(tmp_path: "Path") -> None:
+    baseline = [
+        record("shared", "1.0.0", "MIT", environment=str(tmp_path / "first")),
+        record("shared", "1.0.0", "MIT", environment=str(tmp_path / "second")),
+    ]
+    current = [
+        (package("shared", "1.0.0", "MIT"), tmp_path / "first"),
+        (package("shared", "1.0.0", "MIT"), tmp_path / "third"),
+    ]
+    changes = Baseline(baseline).diff(current, records)
+    assert [(r["environment"], r["change"]) for rs in changes for r in rs] == [
+        (str(tmp_path / "third"), "added"),
+        (str(tmp_path / "second"), "removed"),
+    ]
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_load(ndjson: bool, tmp_path: "Path") -> None:  # noqa: FBT001
+    path = tmp_path / "baseline.json"
+    if ndjson:
+        path.write_text("\n".join(json.dumps(r) for r in BASELINE) + "\n")
+    else:
+        path.write_text(json.dumps(BASELINE, indent=4))
+
+    current = [package(r["package-name"], "1.0.0", "MIT") for r in BASELINE]
+    assert diff(Baseline.load(path), current) == []
+
+
+@pytest.mark.parametrize("content", ["[{]", "[1, 2]", '[{"license": "MIT"}]', "{"])
+def test_load_errors(content: str, tmp_path: "Path") -> None:
+    path = tmp_path / "baseline.json"
+    path.write_text(content)
+    with pytest.raises(BaselineError):
+        Baseline.load(path)
@@ -0,0 +1,217 @@
+import importlib.metadata
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import LicenseState, PackageLicenses, scanner
+from license_scanner import cache as cache_module
+from license_scanner.cache import CACHE_FILE, CacheError, MemoryCache, ResultCache
+from license_scanner.cli import main
+from license_scanner.scanner import scan_distributions
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_distribution(base: "Path", name: str, license_expression: str) -> "Path":
+    path = base / f"{name}-1.0.0.dist-info"
+    path.mkdir()
+    (path / "METADATA").write_text(
+        f"Metadata-Version: 2.4\n"
+        f"Name: {name}\n"
+        f"Version: 1.0.0\n"
+        f"License-Expression: {license_expression}\n"
+    )
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    names: list[str] = []
+    read_distribution = scanner.read_distribution
+
+    def counting(dist: importlib.metadata.Distribution) -> PackageLicenses:
+        package = read_distribution(dist)
+        names.append(package.name)
+        return package
+
+    monkeypatch.setattr(scanner, "read_distribution", counting)
+    return names
+
+
+def scan(
+    paths: "list[Path]", cache: ResultCache | MemoryCache
+) -> list[PackageLicenses]:
+    dists = [importlib.metadata.PathDistribution(path) for path in paths]
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("importlib.metadata.distributions", lambda: dists)
+        return list(scan_distributions(cache))
+
+
+def test_warm_run_skips_metadata(tmp_path: "Path", reads: list[str]) -> None:
+    dist = make_distribution(tmp_path, "example", "mit")
+
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        cold = scan([dist], cache)
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        warm = scan([dist], cache)
+
+    assert reads == ["example"]
+    assert warm[0].name == cold[0].name == "example"
+    assert warm[0].licenses == cold[0].licenses
+    assert warm[0].licenses[0].state == LicenseState.VALID
+    assert warm[0].licenses[0].canonical == "MIT"
+
+
+def test_changed_metadata_is_read(tmp_path: "Path", reads: list[str]) -> None:
+    dist = make_distribution(tmp_path, "example", "MIT")
+
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        scan([dist], cache)
+        (dist / "METADATA").write_text(
+            "Metadata-Version: 2.4\nName: example\nVersion: 1.0.0\n"
+        )
+        result = scan([dist], cache)
+
+    assert reads == ["example", "example"]
+    assert result[0].licenses[0].state == LicenseState.UNKNOWN
+
+
+def test_missing_distributions_are_evicted(tmp_path: "Path") -> None:
+    kept = make_distribution(tmp_path, "kept", "MIT")
+    removed = make_distribution(tmp_path, "removed", "MIT")
+
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        scan([kept, removed], cache)
+    (removed / "METADATA").unlink()
+    removed.rmdir()
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        scan([kept], cache)
+
+    db = sqlite3.connect(tmp_path / "cache.sqlite3")
+    assert db.execute("SELECT path FROM results").fetchall() == [(str(kept),)]
+    db.close()
+
+
+def test_distributions_without_metadata_file(
+    tmp_path: "Path", reads: list[str]
+) -> None:
+    dist = tmp_path / "broken-1.0.0.dist-info"
+    dist.mkdir()
+
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        scan([dist, dist], cache)
+    assert len(reads) == 2
+
+
+def test_corrupt_cache_is_discarded(tmp_path: "Path") -> None:
+    dist = make_distribution(tmp_path, "example", "MIT")
+    (tmp_path / "cache.sqlite3").write_text("not a database" * 100)
+
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        assert len(scan([dist], cache)) == 1
+
+
+def test_locked_cache_is_kept(
+    tmp_path: "Path",
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    path = tmp_path / CACHE_FILE
+    ResultCache(path).close()
+    monkeypatch.setattr(cache_module, "LOCK_TIMEOUT", 0)
+
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute("INSERT INTO meta VALUES ('marker', 'kept')")
+    db.execute("BEGIN EXCLUSIVE")
+    try:
+        with pytest.raises(CacheError, match="database is locked"):
+            ResultCache(path)
+        assert main(["--cache-dir", str(tmp_path)]) == 1
+        assert "Can't open cache" in capsys.readouterr().err
+    finally:
+        db.execute("ROLLBACK")
+    assert db.execute("SELECT value FROM meta WHERE key = 'marker'").fetchone() == (
+        "kept",
+    )
+    db.close()
+
+
+def test_shared_cache(tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    dist = make_distribution(tmp_path, "example", "MIT")
+    stat = (dist / "METADATA").stat()
+    package = PackageLicenses("example", "1.0.0", None, "MIT", [])
+    monkeypatch.setattr(cache_module, "LOCK_TIMEOUT", 0)
+
+    # A put doesn't hold the write lock until the scan ends
+    path = tmp_path / CACHE_FILE
+    with ResultCache(path) as cache, ResultCache(path) as other:
+        cache.put(str(dist), stat, package)
+        other.put(str(dist), stat, package)
+        assert cache.get(str(dist), stat) == package
+
+
+def test_locked_cache_errors(
+    tmp_path: "Path",
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    dist = make_distribution(tmp_path, "example", "MIT")
+    path = tmp_path / CACHE_FILE
+    ResultCache(path).close()
+    monkeypatch.setattr(cache_module, "LOCK_TIMEOUT", 0)
+
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        with ResultCache(path) as cache:
+            with pytest.raises(CacheError, match="Can't use cache"):
+                scan([dist], cache)
+            db.execute("COMMIT")
+            db.execute("BEGIN EXCLUSIVE")
+            with pytest.raises(CacheError, match="Can't use cache"):
+                scan([dist], cache)
+            with pytest.raises(CacheError, match="Can't use cache"):
+                cache.evict()
+        db.execute("ROLLBACK")
+
+        db.execute("BEGIN IMMEDIATE")
+        assert main(["--cache-dir", str(tmp_path)]) == 1
+        assert "Can't use cache" in capsys.readouterr().err
+    finally:
+        db.execute("ROLLBACK")
+    db.close()
+
+
+def test_fingerprint_mismatch_clears_results(tmp_path: "Path") -> None:
+    dist = make_distribution(tmp_path, "example", "MIT")
+    with ResultCache(tmp_path / "cache.sqlite3") as cache:
+        scan([dist], cache)
+
+    db = sqlite3.connect(tmp_path / "cache.sqlite3")
+    db.execute("UPDATE meta SET value = 'outdated'")
+    db.commit()
+    db.close()
+
+    ResultCache(tmp_path / "cache.sqlite3").close()
+    db = sqlite3.connect(tmp_path / "cache.sqlite3")
+    assert db.execute("SELECT count(*) FROM results").fetchone() == (0,)
+    db.close()
+
+
+def test_memory_cache(tmp_path: "Path", reads: list[str]) -> None:
+    kept = make_distribution(tmp_path, "kept", "MIT")
+    removed = make_distribution(tmp_path, "removed", "MIT")
+
+    cache = MemoryCache()
+    cold = scan([kept, removed], cache)
+    (removed / "METADATA").unlink()
+    removed.rmdir()
+    warm = scan([kept], cache)
+    assert reads == ["kept", "removed"]
+    assert warm[0] is cold[0]
+
+    (kept / "METADATA").write_text("Metadata-Version: 2.4\nName: kept\nVersion: 2\n")
+    assert scan([kept], cache)[0].version == "2"
+    assert reads == ["kept", "removed", "kept"]
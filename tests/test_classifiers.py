@@ -0,0 +1,45 @@
+import pytest
+import trove_classifiers
+
+from license_scanner import LicenseSource, LicenseState, spdx
+from license_scanner.classifiers import SPDX_IDENTIFIERS, classifier_index
+
+
+def test_index_covers_license_classifiers() -> None:
+    index = classifier_index()
+    expected = {
+        c
+        for c in trove_classifiers.classifiers
+        | set(trove_classifiers.deprecated_classifiers)
+        if c.startswith("License")
+    }
+    assert set(index) == expected
+    assert all(lic.source == LicenseSource.CLASSIFIER for lic in index.values())
+    assert classifier_index() is index
+
+
+def test_index_is_read_only() -> None:
+    with pytest.raises(TypeError):
+        classifier_index()["License :: Example"] = None  # type: ignore[index]
+
+
+def test_index_entries() -> None:
+    index = classifier_index()
+
+    lic = index["License :: OSI Approved :: MIT License"]
+    assert lic.text == "MIT License"
+    assert lic.state == LicenseState.VALID
+    assert lic.canonical == "MIT"
+
+    lic = index["License :: OSI Approved :: BSD License"]
+    assert lic.text == "BSD License"
+    assert lic.canonical is None
+
+    lic = index["License :: OSI Approved :: Intel Open Source License"]
+    assert lic.state == LicenseState.DEPRECATED
+
+
+@pytest.mark.parametrize(("classifier", "identifier"), SPDX_IDENTIFIERS.items())
+def test_spdx_identifiers(classifier: str, identifier: str) -> None:
+    assert classifier in trove_classifiers.classifiers
+    assert spdx.canonicalize(identifier) == identifier
@@ -1,9 +1,15 @@
+import zipfile
 from json import dumps as jsondumps
+from json import loads as jsonloads
 from pathlib import Path
 
+import httpx
 import pytest
 
+from license_scanner import PackageLicenses
 from license_scanner.cli import Application, ApplicationError, main
+from license_scanner.pypi import Package
+from license_scanner.writers import COLUMNS, WRITERS
 
 
 def test_parameters() -> None:
@@ -53,6 +59,347 @@ def test_input_directory_errors(
     verify(idir)
 
 
+def metadata_digest(name: str, license: str) -> str:  # noqa: A002
+    return PackageLicenses(name, "1.0.0", license, None, []).metadata_digest
+
+
+def test_format_tsv(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    package = {"name": "example-package", "version": "1.0.0", "license": "MIT"}
+    (tmp_path / "example-package.json").write_text(jsondumps(package))
+
+    assert main(["--format", "tsv", "-i", str(tmp_path)]) == 0
+    digest = metadata_digest("example-package", "MIT")
+    assert capsys.readouterr().out.splitlines() == [
+        "\t".join(COLUMNS),
+        f"example-package\t1.0.0\tMIT\tLicense\tVALID\tMIT\t\t{digest}\t\t\t",
+    ]
+
+
+def test_format_tsv_baseline(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    idir = tmp_path / "input"
+    idir.mkdir()
+    for name in ("a-package", "b-package"):
+        package = {"name": name, "version": "1.0.0", "license": "MIT"}
+        (idir / f"{name}.json").write_text(jsondumps(package))
+    policy = tmp_path / "policy.toml"
+    policy.write_text('allow = ["MIT"]\n')
+    assert main(["-i", str(idir), "--policy", str(policy)]) == 0
+    baseline = tmp_path / "base.json"
+    baseline.write_text(capsys.readouterr().out)
+
+    # The removed record has a violation field the added record doesn't have
+    (idir / "b-package.json").unlink()
+    package = {"name": "c-package", "version": "1.0.0", "license": "MIT"}
+    (idir / "c-package.json").write_text(jsondumps(package))
+    args = ["-i", str(idir), "--baseline", str(baseline), "--format", "tsv"]
+    assert main(args) == 0
+    added, removed = (metadata_digest(n, "MIT") for n in ("c-package", "b-package"))
+    assert capsys.readouterr().out.splitlines()[1:] == [
+        f"c-package\t1.0.0\tMIT\tLicense\tVALID\tMIT\t\t{added}\t\t\tadded",
+        f"b-package\t1.0.0\tMIT\tLicense\tVALID\tMIT\t\t{removed}\t\t\tremoved",
+    ]
+
+
+def test_format_arrow(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("importlib.util.find_spec", lambda _: None)
+    assert main(["--format", "arrow"]) == 2
+    assert "arrow requires pyarrow" in capsys.readouterr().err
+
+    monkeypatch.setattr("importlib.util.find_spec", lambda _: object())
+    monkeypatch.setitem(WRITERS, "arrow", WRITERS["ndjson"])
+    assert main(["--format", "arrow", "-i", str(tmp_path)]) == 0
+
+
+@pytest.mark.parametrize("args", [["-f"], ["--format"]])
+def test_format(
+    args: list[str], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    package = {"name": "example-package", "version": "1.0.0", "license": "MIT"}
+    (tmp_path / "example-package.json").write_text(jsondumps(package))
+
+    assert main([*args, "ndjson", "-i", str(tmp_path)]) == 0
+    output = capsys.readouterr()
+    assert [jsonloads(line) for line in output.out.splitlines()] == [
+        {
+            "package-name": "example-package",
+            "package-version": "1.0.0",
+            "license": "MIT",
+            "source": "License",
+            "state": "VALID",
+            "canonical": "MIT",
+            "confidence": None,
+            "metadata-digest": metadata_digest("example-package", "MIT"),
+        }
+    ]
+
+    assert main([*args, "json", "-i", str(tmp_path)]) == 0
+    output = capsys.readouterr()
+    assert len(jsonloads(output.out)) == 1
+
+    assert main([*args, "invalid"]) == 2
+
+
+@pytest.mark.parametrize("args", [["-j"], ["--jobs"]])
+def test_jobs(args: list[str], tmp_path: Path) -> None:
+    (tmp_path / "example-package.json").write_text("{}")
+    assert main([*args, "2", "-i", str(tmp_path)]) == 0
+    assert main([*args, "0"]) == 2
+    assert main([*args, "invalid"]) == 2
+
+
+def test_cache_dir(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    cdir = tmp_path / "cache"
+    assert main(["--cache-dir", str(cdir)]) == 0
+    cold = capsys.readouterr()
+    assert (cdir / "results.sqlite3").is_file()
+
+    assert main(["--cache-dir", str(cdir)]) == 0
+    warm = capsys.readouterr()
+    assert warm.out == cold.out
+
+
+@pytest.mark.parametrize("args", [["-a"], ["--archive-directory"]])
+def test_archive_directory(
+    args: list[str], tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with zipfile.ZipFile(tmp_path / "example-1.0.0-py3-none-any.whl", "w") as zf:
+        zf.writestr(
+            "example-1.0.0.dist-info/METADATA",
+            "Name: example\nVersion: 1.0.0\nLicense-Expression: MIT\n",
+        )
+
+    assert main([*args, str(tmp_path)]) == 0
+    output = jsonloads(capsys.readouterr().out)
+    assert [(r["package-name"], r["canonical"]) for r in output] == [("example", "MIT")]
+
+    (tmp_path / "broken-1.0.0.tar.gz").write_text("not a tar file")
+    assert main([*args, str(tmp_path)]) == 1
+    assert f"Can't scan directory: {tmp_path}" in capsys.readouterr().err
+
+    assert main([*args, str(tmp_path / "missing")]) == 2
+    assert "invalid archive directory" in capsys.readouterr().err
+
+
+def test_site_packages(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    environments = [tmp_path / "first", tmp_path / "second"]
+    for environment in environments:
+        dist = environment / "example_package-1.0.0.dist-info"
+        dist.mkdir(parents=True)
+        (dist / "METADATA").write_text(
+            "Name: example-package\nVersion: 1.0.0\nLicense: MIT\n"
+        )
+
+    args = [f"--site-packages={environment}" for environment in environments]
+    assert main(args) == 0
+    output = jsonloads(capsys.readouterr().out)
+    assert [(r["package-name"], r["environment"]) for r in output] == [
+        ("example-package", str(environments[0])),
+        ("example-package", str(environments[1])),
+    ]
+
+    assert main(["--site-packages", str(tmp_path / "missing")]) == 2
+    assert "invalid site-packages directory" in capsys.readouterr().err
+
+    assert main(["--site-packages", str(tmp_path), "-i", str(tmp_path)]) == 2
+    assert "not allowed with" in capsys.readouterr().err
+
+    (dist / "METADATA").write_bytes(b"Name: \x80\n")
+    assert main(args) == 1
+    assert "Can't scan environment" in capsys.readouterr().err
+
+
+def test_lockfile(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package = {"name": "local", "version": "1.0.0", "license_expression": "MIT"}
+    (tmp_path / "local.json").write_text(jsondumps(package))
+    lockfile = tmp_path / "requirements.txt"
+    lockfile.write_text("local==1.0.0\nremote==2.0.0\n")
+
+    args = ["-i", str(tmp_path), "--lockfile", str(lockfile)]
+    assert main(args) == 0
+    output = jsonloads(capsys.readouterr().out)
+    assert [(r["package-name"], r["state"]) for r in output] == [
+        ("local", "VALID"),
+        ("remote", "UNKNOWN"),
+    ]
+
+    def fetch_releases(
+        releases: list[tuple[str, str]], cache: Path | None
+    ) -> dict[tuple[str, str], Package]:
+        assert cache == tmp_path / "cache" / "pypi"
+        return {
+            (name, version): Package([], None, "BSD-3-Clause", name, None, version)
+            for name, version in releases
+        }
+
+    monkeypatch.setattr("license_scanner.pypi.fetch_releases", fetch_releases)
+    cache = ["--cache-dir", str(tmp_path / "cache")]
+    assert main([*args, "--fetch-missing", *cache]) == 0
+    output = jsonloads(capsys.readouterr().out)
+    assert [(r["package-version"], r["canonical"]) for r in output] == [
+        ("1.0.0", "MIT"),
+        ("2.0.0", "BSD-3-Clause"),
+    ]
+
+    def unavailable(*_: object) -> None:
+        message = "unavailable"
+        raise httpx.ConnectError(message)
+
+    monkeypatch.setattr("license_scanner.pypi.fetch_releases", unavailable)
+    assert main([*args, "--fetch-missing"]) == 1
+    assert "Can't fetch the missing packages" in capsys.readouterr().err
+
+
+def test_lockfile_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    lockfile = tmp_path / "requirements.txt"
+    lockfile.write_text("unpinned\n")
+    assert main(["--lockfile", str(lockfile)]) == 1
+    assert "Can't read lockfile" in capsys.readouterr().err
+
+    assert main(["--lockfile", str(lockfile), "-a", str(tmp_path)]) == 2
+    assert "only allowed with --input-directory" in capsys.readouterr().err
+
+    assert main(["--fetch-missing"]) == 2
+    assert "only allowed with --lockfile" in capsys.readouterr().err
+
+
+def test_index(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    idir = tmp_path / "input"
+    idir.mkdir()
+    package = {"name": "example-package", "version": "1.0.0", "license": "MIT"}
+    (idir / "example-package.json").write_text(jsondumps(package))
+    index = tmp_path / "index.sqlite3"
+
+    assert main(["-i", str(idir)]) == 0
+    scanned = capsys.readouterr().out
+    assert main(["-i", str(idir), "--index", str(index)]) == 0
+    assert capsys.readouterr().out == scanned
+
+    (idir / "example-package.json").unlink()
+    assert main(["--index", str(index)]) == 0
+    assert capsys.readouterr().out == scanned
+
+    lockfile = tmp_path / "requirements.txt"
+    lockfile.write_text("example-package==1.0.0\n")
+    assert main(["--index", str(index), "--lockfile", str(lockfile)]) == 0
+    assert capsys.readouterr().out == scanned
+
+
+def test_index_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    index = tmp_path / "index.sqlite3"
+    assert main(["--index", str(index)]) == 2
+    assert "no index at" in capsys.readouterr().err
+
+    assert main(["--index", str(index), "-a", str(tmp_path)]) == 2
+    assert "only allowed with --input-directory" in capsys.readouterr().err
+
+    index.write_text("not a database" * 100)
+    assert main(["--index", str(index)]) == 1
+    assert "Can't open index" in capsys.readouterr().err
+
+
+def test_baseline(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    idir = tmp_path / "input"
+    idir.mkdir()
+    package = {"name": "example-package", "version": "1.0.0", "license": "MIT"}
+    (idir / "example-package.json").write_text(jsondumps(package))
+
+    assert main(["-i", str(idir)]) == 0
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(capsys.readouterr().out)
+
+    assert main(["-i", str(idir), "--baseline", str(baseline)]) == 0
+    assert jsonloads(capsys.readouterr().out) == []
+
+    package["version"] = "2.0.0"
+    (idir / "example-package.json").write_text(jsondumps(package))
+    assert main(["-i", str(idir), "--baseline", str(baseline)]) == 0
+    changes = jsonloads(capsys.readouterr().out)
+    assert [(r["package-version"], r["change"]) for r in changes] == [
+        ("2.0.0", "added"),
+        ("1.0.0", "removed"),
+    ]
+
+
+def test_baseline_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["--baseline", str(tmp_path)]) == 2
+    assert "invalid input file" in capsys.readouterr().err
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text("[invalid")
+    assert main(["--baseline", str(baseline)]) == 1
+    assert "Can't read baseline" in capsys.readouterr().err
+
+
+def test_policy(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    idir = tmp_path / "input"
+    idir.mkdir()
+    for name, expression in [("a-package", "MIT"), ("b-package", "GPL-3.0-only")]:
+        package = {"name": name, "version": "1.0.0", "license_expression": expression}
+        (idir / f"{name}.json").write_text(jsondumps(package))
+    (idir / "c-package.json").write_text(jsondumps({"name": "c-package"}))
+    policy = tmp_path / "policy.toml"
+    policy.write_text('deny = ["GPL-*"]\ndeny-states = ["UNKNOWN"]\n')
+
+    assert main(["-i", str(idir), "--policy", str(policy)]) == 3
+    output = capsys.readouterr()
+    assert [r["violation"] for r in jsonloads(output.out)] == [
+        None,
+        "GPL-3.0-only is denied",
+        "state UNKNOWN is denied",
+    ]
+    assert "2 license(s) break the policy" in output.err
+
+    assert main(["-i", str(idir), "--policy", str(policy), "--fail-fast"]) == 3
+    output = capsys.readouterr()
+    assert [r["package-name"] for r in jsonloads(output.out)] == [
+        "a-package",
+        "b-package",
+    ]
+    assert "1 license(s) break the policy" in output.err
+
+    policy.write_text('allow = ["*"]\n')
+    assert main(["-i", str(idir), "--policy", str(policy), "--fail-fast"]) == 3
+
+
+def test_policy_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["--fail-fast"]) == 2
+    assert "only allowed with --policy" in capsys.readouterr().err
+
+    policy = tmp_path / "policy.toml"
+    policy.write_text('allow = "MIT"\n')
+    assert main(["--policy", str(policy)]) == 1
+    assert "Can't read policy" in capsys.readouterr().err
+
+
+def test_profile(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    idir = tmp_path / "input"
+    idir.mkdir()
+    package = {"name": "example-package", "version": "1.0.0", "license": "MIT"}
+    (idir / "example-package.json").write_text(jsondumps(package))
+
+    assert main(["-i", str(idir), "--profile"]) == 0
+    report = capsys.readouterr().err.splitlines()
+    assert report[0].split()[:2] == ["stage", "count"]
+    assert {line.split()[0] for line in report[1:]} >= {"run", "read", "decode"}
+
+    trace = tmp_path / "trace.json"
+    assert main(["-i", str(idir), "--profile-trace", str(trace)]) == 0
+    assert "decode" in capsys.readouterr().err
+    events = jsonloads(trace.read_text())["traceEvents"]
+    assert "decode" in {event["name"] for event in events}
+
+    assert main(["-i", str(idir), "--profile-trace", str(tmp_path)]) == 1
+    assert "Can't write profile trace" in capsys.readouterr().err
+
+
 @pytest.mark.parametrize("args", [["-o"], ["--output-directory"]])
 def test_output_directory(args: list[str], tmp_path: Path) -> None:
     odir = tmp_path / "present"
@@ -63,6 +410,32 @@ def test_output_directory(args: list[str], tmp_path: Path) -> None:
     assert main([*args, str(odir)]) == 0
 
 
+@pytest.mark.parametrize(
+    ("layout", "expected"),
+    [
+        ("flat", "{digest}.txt"),
+        ("sharded", "{shard}/{digest}.txt"),
+        ("pack", "licenses.zip"),
+    ],
+)
+def test_output_layout(
+    layout: str, expected: str, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    text = "very-big-string" * 200
+    for number in range(2):
+        package = {"name": f"package-{number}", "version": "1.0.0", "license": text}
+        (tmp_path / f"package-{number}.json").write_text(jsondumps(package))
+
+    odir = tmp_path / "output"
+    args = ["-i", str(tmp_path), "-o", str(odir), "--output-layout", layout]
+    assert main(args) == 0
+    digest = jsonloads(capsys.readouterr().out)[0]["license"][7:]
+
+    files = [p.relative_to(odir) for p in odir.rglob("*") if p.is_file()]
+    assert files == [Path(expected.format(digest=digest, shard=digest[:2]))]
+    assert main(["--output-layout", "invalid"]) == 2
+
+
 @pytest.mark.parametrize("args", [["-o"], ["--output-directory"]])
 def test_output_directory_errors(
     args: list[str], tmp_path: Path, capsys: pytest.CaptureFixture[str]
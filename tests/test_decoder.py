@@ -0,0 +1,105 @@
+from importlib.util import find_spec
+from json import dumps as jsondumps
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.decoder import DECODERS, DecodeError, decode, get_decoder
+from license_scanner.scanner import ScanError, scan_directory
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+INSTALLED = [name for name in DECODERS if find_spec(name) is not None]
+
+METADATA = {
+    "name": "example-package",
+    "version": "1.0.0",
+    "license": "BSD",
+    "license_expression": "MIT",
+    "classifiers": ["License :: OSI Approved :: MIT License"],
+    "description": "A long description " * 1000,
+    "requires_dist": ["other-package>=1.0"],
+}
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+def test_decode(name: str) -> None:
+    package = get_decoder(name)(jsondumps(METADATA).encode())
+    assert package.name == "example-package"
+    assert package.version == "1.0.0"
+    assert package.license == "BSD"
+    assert package.license_expression == "MIT"
+    assert package.classifiers == ["License :: OSI Approved :: MIT License"]
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+def test_decode_defaults(name: str) -> None:
+    package = get_decoder(name)(b"{}")
+    assert package.name == ""
+    assert package.version == ""
+    assert package.license is None
+    assert package.license_expression is None
+    assert package.classifiers == []
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"invalid json"}',
+        b'{"name": "invalid utf-8 \x80"}',
+        b'{"description": "invalid utf-8 \x80"}',
+        b"[]",
+        b"null",
+    ],
+)
+def test_decode_errors(name: str, data: bytes) -> None:
+    with pytest.raises(DecodeError):
+        get_decoder(name)(data)
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"name": 1}',
+        b'{"license": ["MIT"]}',
+        b'{"classifiers": "License :: OSI Approved :: MIT License"}',
+        b'{"classifiers": [1]}',
+    ],
+)
+def test_decode_wrong_types(name: str, data: bytes) -> None:
+    with pytest.raises(DecodeError, match=r"\$\."):
+        get_decoder(name)(data)
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+def test_decode_nulls(name: str) -> None:
+    package = get_decoder(name)(jsondumps(dict.fromkeys(METADATA)).encode())
+    assert package.name is None
+    assert package.version is None
+    assert package.license is None
+    assert package.license_expression is None
+    assert package.classifiers == []
+
+
+def test_default_decoder() -> None:
+    assert get_decoder() is get_decoder(INSTALLED[0])
+
+
+def test_unknown_decoder() -> None:
+    with pytest.raises(DecodeError, match="unknown JSON decoder: 'yaml'"):
+        get_decoder("yaml")
+
+
+def test_decoder_from_environment(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: "Path"
+) -> None:
+    monkeypatch.setenv("LICENSE_SCANNER_JSON", "json")
+    assert decode(b'{"name": "example-package"}').name == "example-package"
+
+    monkeypatch.setenv("LICENSE_SCANNER_JSON", "yaml")
+    (tmp_path / "example-package.json").write_text("{}")
+    with pytest.raises(ScanError, match="unknown JSON decoder"):
+        list(scan_directory(tmp_path))
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.index import (
+    IngestResult,
+    MetadataIndex,
+    MetadataIndexError,
+)
+from license_scanner.lockfile import LockedPackage
+from license_scanner.scanner import scan_directory, scan_locked
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def write(base: "Path", name: str, version: str = "1.0.0", **fields: object) -> None:
+    package = {"name": name, "version": version, **fields}
+    (base / f"{name}.json").write_text(json.dumps(package))
+
+
+@pytest.fixture
+def directory(tmp_path: "Path") -> "Path":
+    base = tmp_path / "metadata"
+    base.mkdir()
+    write(base, "PyYAML", "6.0.2", license="MIT")
+    write(base, "httpx", "0.28.1", license_expression="BSD-3-Clause")
+    write(
+        base,
+        "classifiers",
+        classifiers=["License :: OSI Approved :: MIT License"],
+        description="not stored" * 100,
+    )
+    (base / "not-metadata.txt").write_text("ignored")
+    return base
+
+
+def test_iteration_matches_scan_directory(directory: "Path", tmp_path: "Path") -> None:
+    with MetadataIndex(tmp_path / "index.sqlite3") as index:
+        assert index.ingest(directory) == IngestResult(3, 0, 0, 0)
+        indexed = list(index)
+
+    expected = list(scan_directory(directory))
+    assert indexed == expected
+    assert [p.licenses for p in indexed] == [p.licenses for p in expected]
+
+
+def test_incremental_ingest(directory: "Path", tmp_path: "Path") -> None:
+    with MetadataIndex(tmp_path / "index.sqlite3") as index:
+        index.ingest(directory)
+
+    write(directory, "httpx", "0.28.2", license_expression="BSD-3-Clause")
+    write(directory, "added")
+    (directory / "classifiers.json").unlink()
+
+    with MetadataIndex(tmp_path / "index.sqlite3") as index:
+        assert index.ingest(directory) == IngestResult(1, 1, 1, 1)
+        assert index.ingest(directory) == IngestResult(0, 0, 0, 3)
+        assert [(p.name, p.version) for p in index] == [
+            ("PyYAML", "6.0.2"),
+            ("added", "1.0.0"),
+            ("httpx", "0.28.2"),
+        ]
+
+
+def test_lookup(directory: "Path", tmp_path: "Path") -> None:
+    (directory / "directory.json").mkdir()
+    with MetadataIndex(tmp_path / "index.sqlite3") as index:
+        assert index.ingest(directory).added == 3
+
+        package = index.lookup("pyyaml", "6.0.2.0")
+        assert package is not None
+        assert (package.name, package.license) == ("PyYAML", "MIT")
+        assert index.lookup("py_yaml") is None
+        assert index.lookup("PyYAML", "7.0") is None
+        assert index.lookup("httpx") is not None
+
+        locked = [LockedPackage("httpx", "0.28.1"), LockedPackage("missing", None)]
+        assert [p.licenses[0].text for p in scan_locked(locked, index)] == [
+            "BSD-3-Clause",
+            "UNKNOWN",
+        ]
+
+
+def test_version_change_empties_index(directory: "Path", tmp_path: "Path") -> None:
+    path = tmp_path / "index.sqlite3"
+    with MetadataIndex(path) as index:
+        index.ingest(directory)
+
+    db = sqlite3.connect(path)
+    db.execute("UPDATE meta SET value = '0' WHERE key = 'version'")
+    db.commit()
+    db.close()
+
+    with MetadataIndex(path) as index:
+        assert list(index) == []
+
+
+def test_errors(tmp_path: "Path") -> None:
+    path = tmp_path / "index.sqlite3"
+    path.write_text("not a database" * 100)
+    with pytest.raises(MetadataIndexError, match="Can't open index"):
+        MetadataIndex(path)
@@ -0,0 +1,63 @@
+import io
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import instrument
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def _disable() -> "Iterator[None]":
+    yield
+    instrument.disable()
+
+
+def test_disabled() -> None:
+    assert instrument.stage("read") is instrument.stage("decode")
+    with instrument.stage("read"):
+        pass
+
+
+def test_report() -> None:
+    profile = instrument.enable()
+    for _ in range(3):
+        with instrument.stage("read"):
+            pass
+    for duration in range(100):
+        profile.record("decode", 0, (duration + 1) * 1_000_000)
+    assert profile.events is None
+
+    stream = io.StringIO()
+    profile.report(stream)
+    header, decode, read = stream.getvalue().splitlines()
+    assert header.split() == ["stage", "count", "total", "ms", "p50", "ms", "p99", "ms"]
+    assert decode.split() == ["decode", "100", "5050.000", "51.000", "100.000"]
+    assert read.split()[:2] == ["read", "3"]
+
+
+def test_empty_report() -> None:
+    stream = io.StringIO()
+    instrument.Profile().report(stream)
+    assert stream.getvalue().split() == [
+        *("stage", "count", "total", "ms", "p50", "ms", "p99", "ms")
+    ]
+
+
+def test_trace(tmp_path: "Path") -> None:
+    profile = instrument.enable(trace=True)
+    with instrument.stage("outer"), instrument.stage("inner"):
+        pass
+
+    trace = tmp_path / "trace.json"
+    profile.write_trace(trace)
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["inner", "outer"]
+    inner, outer = events
+    assert inner["ph"] == outer["ph"] == "X"
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
@@ -17,7 +17,16 @@ def verify_output(odir: Path, output: str) -> None:
     result: list[dict[str, str]] = json.loads(output)
     assert isinstance(result, list)
 
-    expected_fields = {"package-name", "package-version", "license", "source", "state"}
+    expected_fields = {
+        "package-name",
+        "package-version",
+        "license",
+        "source",
+        "state",
+        "canonical",
+        "confidence",
+        "metadata-digest",
+    }
     for lic in result:
         assert isinstance(lic, dict)
         assert set(lic.keys()) == expected_fields
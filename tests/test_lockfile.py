@@ -0,0 +1,119 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.lockfile import LockedPackage, LockfileError, read_lockfile
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+UV_LOCK = """\
+version = 1
+requires-python = ">=3.11"
+
+[[package]]
+name = "example"
+version = "0.1.0"
+source = { editable = "." }
+
+[[package]]
+name = "httpx"
+version = "0.28.1"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "workspace-member"
+source = { virtual = "member" }
+
+[[package]]
+name = "from-git"
+version = "1.0.0"
+source = { git = "https://example.com/from-git.git" }
+"""
+
+PYLOCK = """\
+lock-version = "1.0"
+created-by = "example"
+
+[[packages]]
+name = "httpx"
+version = "0.28.1"
+
+[[packages]]
+name = "local"
+directory = { path = "." }
+
+[[packages]]
+name = "from-vcs"
+vcs = { type = "git", url = "https://example.com/from-vcs.git" }
+"""
+
+REQUIREMENTS = """\
+# This file was autogenerated
+--index-url https://pypi.org/simple
+-r other.txt
+
+httpx==0.28.1 \\
+    --hash=sha256:0000 \\
+    --hash=sha256:1111
+    # via example
+PyYAML===6.0.2  # comment
+tomli==2.2.1 ; python_version < "3.11"
+"""
+
+
+@pytest.mark.parametrize(
+    ("name", "text", "expected"),
+    [
+        (
+            "uv.lock",
+            UV_LOCK,
+            [LockedPackage("httpx", "0.28.1"), LockedPackage("from-git", "1.0.0")],
+        ),
+        (
+            "pylock.toml",
+            PYLOCK,
+            [LockedPackage("httpx", "0.28.1"), LockedPackage("from-vcs", None)],
+        ),
+        ("pylock.dev.toml", PYLOCK, [LockedPackage("httpx", "0.28.1")]),
+        (
+            "requirements.txt",
+            REQUIREMENTS,
+            [
+                LockedPackage("httpx", "0.28.1"),
+                LockedPackage("PyYAML", "6.0.2"),
+                LockedPackage("tomli", "2.2.1"),
+            ],
+        ),
+    ],
+)
+def test_read_lockfile(
+    name: str, text: str, expected: list[LockedPackage], tmp_path: "Path"
+) -> None:
+    path = tmp_path / name
+    path.write_text(text)
+    assert read_lockfile(path)[: len(expected)] == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "text", "error"),
+    [
+        ("requirements.txt", "httpx>=0.28\n", "not pinned"),
+        ("requirements.txt", "httpx==0.28.*\n", "not pinned"),
+        ("requirements.txt", "httpx==0.28,!=0.28.1\n", "not pinned"),
+        ("requirements.txt", "httpx\n", "not pinned"),
+        ("requirements.txt", "not a requirement!\n", "invalid requirement"),
+        ("requirements.txt", "\udc80\n", "codec"),
+        ("uv.lock", "[[package]\n", "Expected"),
+        ("uv.lock", '[[package]]\nversion = "1.0.0"\n', "unexpected format"),
+        ("pylock.toml", "packages = 1\n", "unexpected format"),
+    ],
+)
+def test_errors(name: str, text: str, error: str, tmp_path: "Path") -> None:
+    path = tmp_path / name
+    path.write_bytes(text.encode(errors="surrogateescape"))
+    with pytest.raises(LockfileError, match=error):
+        read_lockfile(path)
+
+    with pytest.raises(LockfileError):
+        read_lockfile(tmp_path / "missing.txt")
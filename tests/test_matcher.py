@@ -0,0 +1,89 @@
+from importlib.resources import files
+
+import pytest
+
+from license_scanner.matcher import (
+    MATCH_THRESHOLD,
+    Match,
+    identify,
+    normalize,
+    reference_index,
+)
+
+
+def reference(identifier: str) -> str:
+    resource = files("license_scanner").joinpath("licenses", f"{identifier}.txt")
+    return resource.read_text(encoding="utf-8")
+
+
+def test_normalize() -> None:
+    text = """
+        Copyright (c) 2025 Example Authors
+        (C) 2024 Someone Else
+        © 2023 Yet Another
+
+        THE SOFTWARE IS PROVIDED "AS IS",   without   licence.
+    """
+    assert normalize(text) == [
+        *("the", "software", "is", "provided", "as", "is"),
+        *("without", "license"),
+    ]
+
+
+def test_long_lines_are_not_copyright_lines() -> None:
+    text = reference("MIT").replace("\n", " ")
+    assert normalize(text)[:3] == ["mit", "license", "copyright"]
+    match = identify(text)
+    assert match is not None
+    assert match.identifier == "MIT"
+
+
+@pytest.mark.parametrize("identifier", sorted(reference_index().exact.values()))
+def test_references_match_themselves(identifier: str) -> None:
+    assert identify(reference(identifier)) == Match(identifier, 1.0)
+
+
+def test_exact_match_ignores_copyright_and_layout() -> None:
+    text = reference("BSD-3-Clause").replace(
+        "Copyright (c) <year>, <copyright holders>",
+        "Copyright (c) 2010-2025, Example Authors\n(c) 2025, Other Authors",
+    )
+    text = "\n".join(line.upper() for line in text.splitlines())
+    assert identify(text) == Match("BSD-3-Clause", 1.0)
+
+
+def test_similar_text_matches() -> None:
+    text = reference("BSD-3-Clause").replace("copyright holder nor", "Example nor")
+    match = identify(text)
+    assert match is not None
+    assert match.identifier == "BSD-3-Clause"
+    assert MATCH_THRESHOLD <= match.confidence < 1.0
+
+
+def test_closest_reference_wins() -> None:
+    # MIT-0 is MIT without the attribution condition
+    text = reference("MIT").replace("The above copyright notice", "The notice")
+    match = identify(text)
+    assert match is not None
+    assert match.identifier == "MIT"
+
+
+@pytest.mark.parametrize(
+    ("identifier", "appendix"),
+    [
+        ("GPL-2.0-only", "How to Apply These Terms"),
+        ("GPL-3.0-only", "How to Apply These Terms"),
+        ("LGPL-2.1-only", "How to Apply These Terms"),
+    ],
+)
+def test_copyleft_without_appendix(identifier: str, appendix: str) -> None:
+    # Projects often embed the terms alone, without the instructions
+    text = reference(identifier).partition(appendix)[0]
+    match = identify(text)
+    assert match is not None
+    assert match.identifier == identifier
+
+
+def test_unknown_text() -> None:
+    assert identify("lorem ipsum dolor sit amet " * 100) is None
+    assert identify("") is None
@@ -0,0 +1,118 @@
+import email
+import importlib.metadata
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.metadata import MetadataError, parse_headers, read_headers
+from license_scanner.scanner import scan_distributions
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+METADATA = """\
+Metadata-Version: 2.1
+Name: example
+Version: 1.0.0
+Summary: not requested,
+ even when folded
+License: BSD 3-Clause License
+{blank}
+        Copyright (c) 2001, Example
+        All rights reserved.
+Classifier: License :: OSI Approved :: BSD License
+classifier: Programming Language :: Python :: 3
+Description-Content-Type: text/markdown
+
+# example
+
+License: this is the body, not a header
+""".format(blank=" " * 8)
+
+
+def test_parse_headers() -> None:
+    headers = parse_headers(METADATA.splitlines(keepends=True))
+    assert headers == {
+        "name": ["example"],
+        "version": ["1.0.0"],
+        "license": [
+            "BSD 3-Clause License\n\nCopyright (c) 2001, Example\nAll rights reserved."
+        ],
+        "classifier": [
+            "License :: OSI Approved :: BSD License",
+            "Programming Language :: Python :: 3",
+        ],
+    }
+
+
+def test_matches_importlib_metadata(tmp_path: "Path") -> None:
+    dist_info = tmp_path / "example-1.0.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(METADATA)
+
+    headers = read_headers(dist_info / "METADATA")
+    metadata = importlib.metadata.PathDistribution(dist_info).metadata
+    assert headers["license"] == metadata.get_all("License")
+    assert headers["classifier"] == metadata.get_all("Classifier")
+    assert headers["name"] == [metadata["Name"]]
+
+
+def test_stops_at_the_body() -> None:
+    def lines() -> "Iterator[str]":
+        yield "Name: example\n"
+        yield "\n"
+        pytest.fail("the body was read")
+
+    assert parse_headers(lines()) == {"name": ["example"]}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "  Name: continuation without a header\n",
+        "Name: example\nnot a header line\n",
+        "Invalid Name: example\n",
+    ],
+)
+def test_malformed(text: str) -> None:
+    with pytest.raises(MetadataError):
+        parse_headers(text.splitlines(keepends=True))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Name: example\nInvalid Header: value\n",
+        "Version: 1.0.0\nLicense: MIT\n",
+    ],
+)
+def test_scanner_falls_back_to_email(
+    text: str, tmp_path: "Path", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    dist_info = tmp_path / "example-1.0.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(text)
+    dist = importlib.metadata.PathDistribution(dist_info)
+    monkeypatch.setattr("importlib.metadata.distributions", lambda: [dist])
+
+    expected = email.message_from_string(text)
+    (package,) = scan_distributions()
+    assert package.name == expected["Name"]
+    assert package.license == expected["License"]
+
+
+def test_scanner_reads_pkg_info(
+    tmp_path: "Path", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    egg_info = tmp_path / "example.egg-info"
+    egg_info.mkdir()
+    (egg_info / "PKG-INFO").write_text(METADATA)
+    dist = importlib.metadata.PathDistribution(egg_info)
+    monkeypatch.setattr("importlib.metadata.distributions", lambda: [dist])
+
+    (package,) = scan_distributions()
+    assert package.name == "example"
+    assert package.version == "1.0.0"
+    assert package.license_expression is None
+    assert package.license == dist.metadata["License"]
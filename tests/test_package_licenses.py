@@ -1,4 +1,16 @@
-from license_scanner import LicenseSource, LicenseState, PackageLicenses
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import (
+    LicenseSource,
+    LicenseState,
+    PackageLicenses,
+    classify_batch,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 def test_valid_license_expression() -> None:
@@ -13,6 +25,20 @@ def test_valid_license_expression() -> None:
     assert package.licenses[0].text == "MIT"
     assert package.licenses[0].source == LicenseSource.EXPRESSION
     assert package.licenses[0].state == LicenseState.VALID
+    assert package.licenses[0].canonical == "MIT"
+
+
+def test_canonical_license_expression() -> None:
+    package = PackageLicenses(
+        name="test-package",
+        version="1.0.0",
+        license=None,
+        license_expression="mit or apache-2.0",
+        classifiers=[],
+    )
+    assert len(package.licenses) == 1
+    assert package.licenses[0].text == "mit or apache-2.0"
+    assert package.licenses[0].canonical == "MIT OR Apache-2.0"
 
 
 def test_invalid_license_expression() -> None:
@@ -27,6 +53,7 @@ def test_invalid_license_expression() -> None:
     assert package.licenses[0].text == "INVALID"
     assert package.licenses[0].source == LicenseSource.EXPRESSION
     assert package.licenses[0].state == LicenseState.INVALID
+    assert package.licenses[0].canonical is None
 
 
 def test_valid_license() -> None:
@@ -57,6 +84,33 @@ def test_file_detection_cutoff() -> None:
     assert package.licenses[0].state == LicenseState.AMBIGUOUS
 
 
+def test_license_file_is_identified() -> None:
+    package = PackageLicenses(
+        name="test-package",
+        version="1.0.0",
+        license=(
+            "Copyright (c) 2025 Example Authors\n\n"
+            "Permission to use, copy, modify, and/or distribute this software "
+            "for any purpose with or without fee is hereby granted.\n\n"
+            'THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL '
+            "WARRANTIES WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED "
+            "WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE "
+            "AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL "
+            "DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR "
+            "PROFITS, WHETHER IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER "
+            "TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE USE OR "
+            "PERFORMANCE OF THIS SOFTWARE."
+        ),
+        license_expression=None,
+        classifiers=[],
+    )
+    assert len(package.licenses) == 1
+    assert package.licenses[0].text.startswith("sha256:")
+    assert package.licenses[0].state == LicenseState.AMBIGUOUS
+    assert package.licenses[0].canonical == "0BSD"
+    assert package.licenses[0].confidence == 1.0
+
+
 def test_ambiguous_license() -> None:
     package = PackageLicenses(
         name="test-package",
@@ -97,6 +151,20 @@ def test_valid_license_classifier() -> None:
     assert package.licenses[0].text == "GNU General Public License (GPL)"
     assert package.licenses[0].source == LicenseSource.CLASSIFIER
     assert package.licenses[0].state == LicenseState.VALID
+    assert package.licenses[0].canonical is None
+
+
+def test_spdx_license_classifier() -> None:
+    package = PackageLicenses(
+        name="test-package",
+        version="1.0.0",
+        license=None,
+        license_expression=None,
+        classifiers=["License :: OSI Approved :: MIT License"],
+    )
+    assert len(package.licenses) == 1
+    assert package.licenses[0].text == "MIT License"
+    assert package.licenses[0].canonical == "MIT"
 
 
 def test_invalid_classifier() -> None:
@@ -153,3 +221,77 @@ def test_unknown() -> None:
     assert package.licenses[0].text == "UNKNOWN"
     assert package.licenses[0].source == LicenseSource.UNKNOWN
     assert package.licenses[0].state == LicenseState.UNKNOWN
+
+
+def test_result() -> None:
+    def package() -> PackageLicenses:
+        # bytes.decode returns a new string object on every call
+        return PackageLicenses(
+            name=b"test-package".decode(),
+            version=b"1.0.0".decode(),
+            license=None,
+            license_expression=b"MIT".decode(),
+            classifiers=["License :: OSI Approved :: MIT License"],
+        )
+
+    first, second = package().result(), package().result()
+    assert first == ("test-package", "1.0.0", None, tuple(package().licenses))
+    assert first.name is second.name
+    assert first.version is second.version
+    assert first.licenses[0] is second.licenses[0]
+    assert not hasattr(first, "classifiers")
+    assert not hasattr(first, "__dict__")
+
+
+def test_classify_batch(tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    import importlib.metadata
+
+    dist = tmp_path / "example-4.0.0.dist-info"
+    dist.mkdir()
+    (dist / "METADATA").write_text(
+        "Metadata-Version: 2.4\nName: example\nVersion: 4.0.0\n"
+        "License-Expression: mit\n"
+    )
+    classified: list[PackageLicenses] = []
+    classify = PackageLicenses._classify  # noqa: SLF001
+
+    def counting(self: PackageLicenses) -> list:
+        classified.append(self)
+        return classify(self)
+
+    monkeypatch.setattr(PackageLicenses, "_classify", counting)
+    results = classify_batch(
+        [
+            {"name": "example", "version": "1.0.0", "license_expression": "mit"},
+            ("example", "2.0.0", None, "mit", []),
+            ("example", "2.1.0", "BSD", "mit", ["Private :: Do Not Upload"]),
+            PackageLicenses("example", "3.0.0", None, "mit", []),
+            importlib.metadata.PathDistribution(dist),
+            {"name": "other", "version": "1.0.0", "license": "Apache-2.0"},
+            {"name": "unknown"},
+        ]
+    )
+    assert [(r.name, r.version) for r in results] == [
+        ("example", "1.0.0"),
+        ("example", "2.0.0"),
+        ("example", "2.1.0"),
+        ("example", "3.0.0"),
+        ("example", "4.0.0"),
+        ("other", "1.0.0"),
+        ("unknown", ""),
+    ]
+    assert [[lic.canonical for lic in r.licenses] for r in results] == [
+        ["MIT"],
+        ["MIT"],
+        ["MIT"],
+        ["MIT"],
+        ["MIT"],
+        ["Apache-2.0"],
+        [None],
+    ]
+    assert results[0].licenses is results[2].licenses is results[4].licenses
+    assert len(classified) == 3
+    assert classify_batch([]) == []
+
+    with pytest.raises(TypeError, match="can't classify a str"):
+        classify_batch(["example"])  # type: ignore[list-item]
@@ -0,0 +1,141 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import License, LicenseSource, LicenseState
+from license_scanner.policy import Patterns, Policy, PolicyError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def spdx(expression: str | None, state: LicenseState = LicenseState.VALID) -> License:
+    return License(expression or "", LicenseSource.EXPRESSION, state, expression)
+
+
+def test_patterns() -> None:
+    patterns = Patterns(["MIT", "GPL-*", "LGPL-2.1-*"])
+    assert patterns.match("MIT")
+    assert patterns.match("mit")
+    assert patterns.match("GPL-3.0-only")
+    assert patterns.match("LGPL-2.1-or-later")
+    assert not patterns.match("MIT-0")
+    assert not patterns.match("GPL")
+    assert not patterns.match("LGPL-3.0-only")
+    assert not patterns.match("AGPL-3.0-only")
+
+    assert Patterns(["*"]).match("anything")
+    assert not Patterns([])
+
+
+@pytest.mark.parametrize("pattern", ["", "GPL-*-only", "**"])
+def test_invalid_patterns(pattern: str) -> None:
+    with pytest.raises(PolicyError, match="invalid pattern"):
+        Patterns([pattern])
+
+
+def test_deny() -> None:
+    policy = Policy(deny=["GPL-*"], deny_states=["invalid", "AMBIGUOUS"])
+    assert policy.check("example", spdx("MIT OR Apache-2.0")) is None
+    assert policy.check("example", spdx("MIT OR GPL-3.0-only")) is None
+    assert policy.check("example", spdx("MIT AND GPL-3.0-only")) == (
+        "GPL-3.0-only is denied"
+    )
+    assert policy.check("example", spdx("GPL-2.0-only OR GPL-3.0-only")) == (
+        "GPL-2.0-only is denied"
+    )
+    assert policy.check("example", spdx(None, LicenseState.INVALID)) == (
+        "state INVALID is denied"
+    )
+    assert policy.check("example", spdx(None, LicenseState.UNKNOWN)) is None
+
+
+def test_allow() -> None:
+    policy = Policy(allow=["MIT", "BSD-*"])
+    assert policy.check("example", spdx("MIT AND BSD-3-Clause")) is None
+    assert policy.check("example", spdx("MIT AND ISC")) == "ISC is not allowed"
+    assert policy.check("example", spdx("(MIT OR ISC) AND BSD-2-Clause")) is None
+    assert policy.check("example", spdx("Apache-2.0 WITH LLVM-exception")) == (
+        "Apache-2.0 is not allowed"
+    )
+    assert policy.check("example", spdx(None, LicenseState.UNKNOWN)) == (
+        "no SPDX expression to allow"
+    )
+
+
+def test_matched_license_text() -> None:
+    # The matcher guess of an AMBIGUOUS text is not an SPDX expression
+    guess = License(
+        "sha256:0123", LicenseSource.LICENSE, LicenseState.AMBIGUOUS, "MIT", 0.936
+    )
+    assert Policy(allow=["MIT"]).check("example", guess) == (
+        "no SPDX expression to allow"
+    )
+    assert Policy(deny_states=["AMBIGUOUS"]).check("example", guess) == (
+        "state AMBIGUOUS is denied"
+    )
+
+
+def test_exceptions() -> None:
+    policy = Policy(
+        allow=["MIT"],
+        deny_states=["UNKNOWN"],
+        exceptions={"Example_Package": ["GPL-3.0-only"], "anything": ["*"]},
+    )
+    assert policy.check("example-package", spdx("GPL-3.0-only")) is None
+    assert policy.check("example-package", spdx("GPL-3.0-only AND MIT")) is None
+    assert policy.check("example-package", spdx("GPL-3.0-only AND ISC")) == (
+        "ISC is not allowed"
+    )
+    assert policy.check("example-package", spdx("GPL-2.0-only")) == (
+        "GPL-2.0-only is not allowed"
+    )
+    assert policy.check("example-package", spdx(None, LicenseState.UNKNOWN)) == (
+        "state UNKNOWN is denied"
+    )
+    assert policy.check("anything", spdx(None, LicenseState.UNKNOWN)) is None
+    assert policy.check("other-package", spdx("GPL-3.0-only")) == (
+        "GPL-3.0-only is not allowed"
+    )
+
+
+def test_load(tmp_path: "Path") -> None:
+    path = tmp_path / "policy.toml"
+    path.write_text(
+        'allow = ["MIT"]\n'
+        'deny = ["GPL-*"]\n'
+        'deny-states = ["INVALID"]\n'
+        "[exceptions]\n"
+        'example-package = ["GPL-3.0-only"]\n'
+    )
+    policy = Policy.load(path)
+    assert policy.check("example-package", spdx("GPL-3.0-only")) is None
+    assert policy.check("other-package", spdx("GPL-3.0-only")) == (
+        "GPL-3.0-only is denied"
+    )
+
+    path.write_text("")
+    assert Policy.load(path).check("example", spdx(None, LicenseState.INVALID)) is None
+
+
+@pytest.mark.parametrize(
+    ("content", "error"),
+    [
+        ("[invalid", "Expected"),
+        ("allows = []", "unknown keys: allows"),
+        ('deny = "GPL-3.0-only"', "deny: expected a list of strings"),
+        ("allow = [1]", "allow: expected a list of strings"),
+        ('exceptions = ["example"]', "exceptions: expected a table"),
+        ('exceptions = {example = "MIT"}', "example: expected a list of strings"),
+        ('deny-states = ["BROKEN"]', "'broken' is not a valid LicenseState"),
+        ('deny = ["GPL-*-only"]', "invalid pattern"),
+    ],
+)
+def test_load_errors(tmp_path: "Path", content: str, error: str) -> None:
+    path = tmp_path / "policy.toml"
+    path.write_text(content)
+    with pytest.raises(PolicyError, match=error):
+        Policy.load(path)
+
+    with pytest.raises(PolicyError):
+        Policy.load(tmp_path / "missing.toml")
@@ -0,0 +1,169 @@
+import asyncio
+import json
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from license_scanner.pypi import AsyncClient, Package, fetch_releases
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PACKAGES = {
+    "root": ["child-a", "child-b", "extra; extra == 'dev'", "invalid requirement!"],
+    "child-a": ["grandchild", "child-b"],
+    "child-b": [],
+    "grandchild": [],
+}
+
+
+def package_info(name: str) -> dict[str, object]:
+    return {
+        "classifiers": [],
+        "license": None,
+        "license_expression": "MIT",
+        "name": name,
+        "requires_dist": PACKAGES[name],
+        "version": "1.0.0",
+    }
+
+
+class PyPI:
+    """Local stand-in for the PyPI JSON API."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if request.url.path == "/stats/":
+            data = {"top_packages": {"root": {}}, "total_packages_size": 1}
+            return httpx.Response(200, json=data)
+
+        _, _, name, version, *_ = request.url.path.split("/")
+        if name == "unavailable":
+            return httpx.Response(503)
+        if name not in PACKAGES or version not in {"json", "1.0.0"}:
+            return httpx.Response(404)
+        if request.headers.get("If-None-Match") == f'"{name}"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json={"info": package_info(name)}, headers={"ETag": f'"{name}"'}
+        )
+
+
+def client(pypi: PyPI, **kwargs: "Path | int") -> AsyncClient:
+    return AsyncClient(transport=httpx.MockTransport(pypi), **kwargs)  # type: ignore[arg-type]
+
+
+def test_get_package() -> None:
+    async def run() -> Package:
+        async with client(PyPI()) as session:
+            return await session.get_package("child-a")
+
+    package = asyncio.run(run())
+    assert package.name == "child-a"
+    assert package.license_expression == "MIT"
+    assert package.dependencies() == ["grandchild", "child-b"]
+
+
+def test_get_release() -> None:
+    async def run() -> Package:
+        async with client(PyPI()) as session:
+            return await session.get_release("child-b", "1.0.0")
+
+    package = asyncio.run(run())
+    assert (package.name, package.version) == ("child-b", "1.0.0")
+
+
+def test_fetch_releases() -> None:
+    pypi = PyPI()
+    releases = fetch_releases(
+        [("root", "1.0.0"), ("child-a", None), ("root", "2.0.0"), ("root", "1.0.0")],
+        transport=httpx.MockTransport(pypi),
+    )
+    assert {key: p.name if p else None for key, p in releases.items()} == {
+        ("root", "1.0.0"): "root",
+        ("child-a", None): "child-a",
+        ("root", "2.0.0"): None,
+    }
+    assert len(pypi.requests) == 3
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch_releases([("unavailable", "1.0.0")], transport=httpx.MockTransport(pypi))
+
+
+def test_get_stats() -> None:
+    async def run() -> dict[str, dict[str, int]]:
+        async with client(PyPI()) as session:
+            return (await session.get_stats()).top_packages
+
+    assert asyncio.run(run()) == {"root": {}}
+
+
+def test_http_errors() -> None:
+    async def run() -> Package:
+        async with client(PyPI()) as session:
+            return await session.get_package("does-not-exist")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+
+def test_crawl_is_breadth_first() -> None:
+    pypi = PyPI()
+
+    async def run() -> dict[str, Package]:
+        async with client(pypi) as session:
+            return await session.crawl(["root", "root"])
+
+    packages = asyncio.run(run())
+    assert list(packages) == ["root", "child-a", "child-b", "grandchild"]
+    assert len(pypi.requests) == 4
+
+
+def test_concurrency_is_bounded() -> None:
+    pypi = PyPI()
+
+    async def run() -> None:
+        async with client(pypi, concurrency=2) as session:
+            await asyncio.gather(*(session.get_package("root") for _ in range(8)))
+
+    asyncio.run(run())
+    assert pypi.max_in_flight == 2
+
+
+def test_etag_revalidation(tmp_path: "Path") -> None:
+    pypi = PyPI()
+
+    async def run() -> Package:
+        async with client(pypi, cache_directory=tmp_path) as session:
+            return await session.get_package("root")
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+
+    assert first == second
+    assert "If-None-Match" not in pypi.requests[0].headers
+    assert pypi.requests[1].headers["If-None-Match"] == '"root"'
+    assert json.loads((tmp_path / "root.json").read_text())["etag"] == '"root"'
+
+
+def test_invalid_cache_is_ignored(tmp_path: "Path") -> None:
+    pypi = PyPI()
+    (tmp_path / "root.json").write_text("invalid")
+
+    async def run() -> Package:
+        async with client(pypi, cache_directory=tmp_path) as session:
+            return await session.get_package("root")
+
+    assert asyncio.run(run()).name == "root"
+    assert "If-None-Match" not in pypi.requests[0].headers
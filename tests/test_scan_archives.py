@@ -0,0 +1,129 @@
+import io
+import tarfile
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.scanner import ScanError, scan_archives
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+METADATA = "Metadata-Version: 2.4\nName: {name}\nVersion: 1.0.0\n{headers}\n"
+
+
+def metadata(name: str, headers: str = "License-Expression: MIT\n") -> str:
+    return METADATA.format(name=name, headers=headers)
+
+
+def make_zip(path: "Path", members: dict[str, str]) -> None:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in members.items():
+            zf.writestr(name, text)
+
+
+def make_tar(path: "Path", members: dict[str, str], mode: str = "w:gz") -> None:
+    with tarfile.open(path, mode) as tf:  # type: ignore[call-overload]
+        for name, text in members.items():
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+def test_archives(tmp_path: "Path") -> None:
+    make_zip(
+        tmp_path / "wheel-1.0.0-py3-none-any.whl",
+        {
+            "wheel/__init__.py": "",
+            "wheel.egg-info/PKG-INFO": metadata("wrong"),
+            "wheel-1.0.0.dist-info/METADATA": metadata("wheel"),
+        },
+    )
+    make_zip(
+        tmp_path / "zipped-1.0.0.zip",
+        {"zipped-1.0.0/setup.py": "", "zipped-1.0.0/PKG-INFO": metadata("zipped")},
+    )
+    make_tar(
+        tmp_path / "sdist-1.0.0.tar.gz",
+        {
+            "sdist-1.0.0/src/sdist.egg-info/PKG-INFO": metadata("wrong"),
+            "sdist-1.0.0/PKG-INFO": metadata("sdist", "License: BSD\n"),
+            "sdist-1.0.0/setup.py": "",
+        },
+    )
+    make_tar(
+        tmp_path / "bzipped-1.0.0.tar.bz2",
+        {"bzipped-1.0.0/PKG-INFO": metadata("bzipped")},
+        "w:bz2",
+    )
+    (tmp_path / "README.txt").write_text("not an archive")
+    (tmp_path / "directory.whl").mkdir()
+
+    result = [
+        (package.name, package.licenses[0].text) for package in scan_archives(tmp_path)
+    ]
+    assert result == [
+        ("bzipped", "MIT"),
+        ("sdist", "BSD"),
+        ("wheel", "MIT"),
+        ("zipped", "MIT"),
+    ]
+
+
+def test_email_fallback(tmp_path: "Path") -> None:
+    make_zip(
+        tmp_path / "folded-1.0.0-py3-none-any.whl",
+        {"folded-1.0.0.dist-info/METADATA": " folded\n" + metadata("folded")},
+    )
+    [package] = scan_archives(tmp_path)
+    assert (package.name, package.version) == ("folded", "1.0.0")
+    assert package.license_expression == "MIT"
+
+
+def test_jobs(tmp_path: "Path") -> None:
+    for number in range(10):
+        make_tar(
+            tmp_path / f"package-{number}.tar.gz",
+            {f"package-{number}/PKG-INFO": metadata(f"package-{number}")},
+        )
+
+    sequential = list(scan_archives(tmp_path))
+    parallel = list(scan_archives(tmp_path, jobs=4))
+    assert [p.name for p in parallel] == [p.name for p in sequential]
+    assert [p.licenses for p in parallel] == [p.licenses for p in sequential]
+
+
+@pytest.mark.parametrize(
+    ("name", "members", "error"),
+    [
+        ("missing-1.0.0.tar.gz", {"missing-1.0.0/setup.py": ""}, "Can't find"),
+        ("missing-1.0.0.whl", {"missing/__init__.py": ""}, "Can't find"),
+        ("missing-1.0.0.zip", {"missing-1.0.0/setup.py": ""}, "Can't find"),
+        ("encoding-1.0.0.whl", {"e.dist-info/METADATA": "\udc80"}, "Can't read"),
+    ],
+)
+def test_errors(
+    name: str, members: dict[str, str], error: str, tmp_path: "Path"
+) -> None:
+    if name.endswith(".tar.gz"):
+        make_tar(tmp_path / name, members)
+    else:
+        with zipfile.ZipFile(tmp_path / name, "w") as zf:
+            for member, text in members.items():
+                zf.writestr(member, text.encode(errors="surrogateescape"))
+
+    with pytest.raises(ScanError, match=error):
+        list(scan_archives(tmp_path))
+
+
+def test_invalid_archive(tmp_path: "Path") -> None:
+    (tmp_path / "invalid-1.0.0.whl").write_text("not a zip file")
+    with pytest.raises(ScanError, match="Can't read"):
+        list(scan_archives(tmp_path))
+
+    (tmp_path / "invalid-1.0.0.whl").unlink()
+    (tmp_path / "invalid-1.0.0.tar.gz").write_text("not a tar file")
+    with pytest.raises(ScanError, match="Can't read"):
+        list(scan_archives(tmp_path))
@@ -70,3 +70,24 @@ def test_invalid_object(tmp_path: "Path") -> None:
     file.write_text("[]")
     with pytest.raises(ScanError):
         list(scan_directory(tmp_path))
+
+
+def test_jobs(tmp_path: "Path") -> None:
+    for number in range(20):
+        example = {"name": f"package-{number:02}", "license_expression": "MIT"}
+        json_file = tmp_path / f"package-{number:02}.json"
+        json_file.write_text(jsondumps(example))
+
+    serial = list(scan_directory(tmp_path))
+    parallel = list(scan_directory(tmp_path, jobs=4))
+
+    assert [p.name for p in serial] == [f"package-{n:02}" for n in range(20)]
+    assert [p.name for p in parallel] == [p.name for p in serial]
+    assert [p.licenses for p in parallel] == [p.licenses for p in serial]
+
+
+def test_jobs_error(tmp_path: "Path") -> None:
+    (tmp_path / "a-valid.json").write_text("{}")
+    (tmp_path / "b-invalid.json").write_bytes(b'{"invalid json"}')
+    with pytest.raises(ScanError, match=r"b-invalid\.json"):
+        list(scan_directory(tmp_path, jobs=2))
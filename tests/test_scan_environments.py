@@ -0,0 +1,104 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import LicenseState
+from license_scanner.scanner import ScanError, scan_environments
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+METADATA = """\
+Metadata-Version: 2.4
+Name: {name}
+Version: {version}
+License-Expression: {license}
+
+A long description that is not a header: {name}
+"""
+
+
+def install(
+    environment: "Path", name: str, version: str = "1.0.0", expression: str = "MIT"
+) -> None:
+    path = environment / f"{name}-{version}.dist-info"
+    path.mkdir(parents=True)
+    (path / "METADATA").write_text(
+        METADATA.format(name=name, version=version, license=expression)
+    )
+
+
+def test_environments(tmp_path: "Path") -> None:
+    first, second = tmp_path / "first", tmp_path / "second"
+    install(first, "shared")
+    install(first, "only-first", expression="Apache-2.0")
+    install(second, "shared")
+    install(second, "only-second", "2.0.0", "invalid")
+
+    result = [
+        (path.name, package.name, package.version, package.licenses[0].state)
+        for path, package in scan_environments([first, second])
+    ]
+    assert result == [
+        ("first", "only-first", "1.0.0", LicenseState.VALID),
+        ("first", "shared", "1.0.0", LicenseState.VALID),
+        ("second", "only-second", "2.0.0", LicenseState.INVALID),
+        ("second", "shared", "1.0.0", LicenseState.VALID),
+    ]
+
+
+def test_identical_metadata_is_classified_once(tmp_path: "Path") -> None:
+    for environment in ("first", "second"):
+        install(tmp_path / environment, "shared")
+    install(tmp_path / "third", "shared", expression="BSD-3-Clause")
+
+    packages = [
+        package
+        for _, package in scan_environments(
+            [tmp_path / "first", tmp_path / "second", tmp_path / "third"]
+        )
+    ]
+    assert packages[0] is packages[1]
+    assert packages[2] is not packages[0]
+    assert packages[2].licenses[0].canonical == "BSD-3-Clause"
+
+
+def test_egg_info(tmp_path: "Path") -> None:
+    (tmp_path / "directory.egg-info").mkdir()
+    (tmp_path / "directory.egg-info" / "PKG-INFO").write_text(
+        METADATA.format(name="directory", version="1.0.0", license="MIT")
+    )
+    (tmp_path / "file.egg-info").write_text(
+        METADATA.format(name="file", version="2.0.0", license="ISC")
+    )
+    (tmp_path / "empty.dist-info").mkdir()
+
+    result = [
+        (package.name, package.licenses[0].canonical)
+        for _, package in scan_environments([tmp_path])
+    ]
+    assert result == [("directory", "MIT"), ("file", "ISC")]
+
+
+def test_invalid_headers_fall_back(tmp_path: "Path") -> None:
+    path = tmp_path / "folded-1.0.0.dist-info"
+    path.mkdir()
+    (path / "METADATA").write_text(
+        " continuation\nName: folded\nVersion: 1.0.0\nLicense: MIT\n"
+    )
+
+    [(_, package)] = scan_environments([tmp_path])
+    assert (package.name, package.version, package.license) == (
+        "folded",
+        "1.0.0",
+        "MIT",
+    )
+
+
+def test_errors(tmp_path: "Path") -> None:
+    path = tmp_path / "broken-1.0.0.dist-info"
+    path.mkdir()
+    (path / "METADATA").write_bytes(b"Name: broken \x80\n")
+
+    with pytest.raises(ScanError, match=r"broken-1\.0\.0\.dist-info"):
+        list(scan_environments([tmp_path]))
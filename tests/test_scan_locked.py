@@ -0,0 +1,82 @@
+import json
+from typing import TYPE_CHECKING
+
+from license_scanner import LicenseState, PackageLicenses
+from license_scanner.lockfile import LockedPackage
+from license_scanner.scanner import scan_locked
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+
+def write(base: "Path", filename: str, name: str, version: str) -> None:
+    package = {"name": name, "version": version, "license_expression": "MIT"}
+    (base / filename).write_text(json.dumps(package))
+
+
+def test_lookup(tmp_path: "Path") -> None:
+    write(tmp_path, "httpx.json", "httpx", "0.28.1")
+    write(tmp_path, "pyyaml-6.0.2.json", "PyYAML", "6.0.2")
+    write(tmp_path, "pyyaml.json", "PyYAML", "7.0.0")
+    write(tmp_path, "any-version.json", "any-version", "3.0")
+
+    locked = [
+        LockedPackage("httpx", "0.28.1"),
+        LockedPackage("PyYAML", "6.0.2"),
+        LockedPackage("any_version", None),
+        LockedPackage("httpx", "0.28.1.0"),
+    ]
+    result = [(p.name, p.version) for p in scan_locked(locked, tmp_path)]
+    assert result == [
+        ("httpx", "0.28.1"),
+        ("PyYAML", "6.0.2"),
+        ("any-version", "3.0"),
+        ("httpx", "0.28.1"),
+    ]
+
+
+def test_files_without_version(tmp_path: "Path") -> None:
+    package = {"name": "example", "version": None, "license_expression": "MIT"}
+    (tmp_path / "example.json").write_text(json.dumps(package))
+
+    locked = [LockedPackage("example", "1.0.0"), LockedPackage("example", None)]
+    result = [(p.name, p.version) for p in scan_locked(locked, tmp_path)]
+    assert result == [("example", "1.0.0"), ("example", None)]
+
+
+def test_misses_are_fetched(tmp_path: "Path") -> None:
+    write(tmp_path, "local.json", "local", "1.0.0")
+    write(tmp_path, "outdated.json", "outdated", "1.0.0")
+    requested: list[list[LockedPackage]] = []
+
+    def fetch(
+        missing: list[LockedPackage],
+    ) -> "Mapping[LockedPackage, PackageLicenses | None]":
+        requested.append(missing)
+        return {
+            LockedPackage("outdated", "2.0.0"): PackageLicenses(
+                "outdated", "2.0.0", None, "Apache-2.0", []
+            ),
+            LockedPackage("unknown", "1.0.0"): None,
+        }
+
+    locked = [
+        LockedPackage("local", "1.0.0"),
+        LockedPackage("outdated", "2.0.0"),
+        LockedPackage("unknown", "1.0.0"),
+    ]
+    result = list(scan_locked(locked, tmp_path, fetch))
+
+    assert requested == [locked[1:]]
+    assert [(p.name, p.version, p.licenses[0].text) for p in result] == [
+        ("local", "1.0.0", "MIT"),
+        ("outdated", "2.0.0", "Apache-2.0"),
+        ("unknown", "1.0.0", "UNKNOWN"),
+    ]
+
+
+def test_without_directory() -> None:
+    [package] = scan_locked([LockedPackage("unpinned", None)])
+    assert (package.name, package.version) == ("unpinned", "")
+    assert package.licenses[0].state == LicenseState.UNKNOWN
@@ -0,0 +1,150 @@
+import json
+import os
+import socket
+import threading
+from json import dumps as jsondumps
+from json import loads as jsonloads
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.cli import main
+from license_scanner.server import ScanServer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def server(tmp_path: "Path") -> "Iterator[Path]":
+    path = tmp_path / "scanner.sock"
+    with ScanServer(path) as scan_server:
+        thread = threading.Thread(target=scan_server.serve_forever)
+        thread.start()
+        try:
+            yield path
+        finally:
+            scan_server.shutdown()
+            thread.join()
+    assert not path.exists()
+
+
+def request(path: "Path", *lines: bytes) -> list[dict]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        with sock.makefile(mode="rwb") as stream:
+            stream.writelines(lines)
+            stream.flush()
+            return [json.loads(stream.readline()) for _ in lines]
+
+
+def test_connect(
+    server: "Path",
+    tmp_path: "Path",
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    idir = tmp_path / "input"
+    idir.mkdir()
+    package = {"name": "example-package", "version": "1.0.0", "license": "MIT"}
+    (idir / "example-package.json").write_text(jsondumps(package))
+
+    assert main(["-i", str(idir)]) == 0
+    scanned = capsys.readouterr().out
+
+    assert main(["--connect", str(server), "-i", str(idir)]) == 0
+    assert capsys.readouterr().out == scanned
+
+    # Paths are relative to the directory of the client
+    monkeypatch.chdir(tmp_path)
+    assert main(["--connect", str(server), "-i", "input"]) == 0
+    assert capsys.readouterr().out == scanned
+
+    assert main(["--connect", str(server), "-i", "missing"]) == 2
+    assert "invalid input directory" in capsys.readouterr().err
+
+
+def test_installed_packages_are_cached(server: "Path") -> None:
+    line = jsondumps({"args": ["-f", "ndjson"]}).encode() + b"\n"
+    first, second = request(server, line, line)
+    assert first["exit_code"] == second["exit_code"] == 0
+    assert first["stdout"] == second["stdout"]
+    assert jsonloads(first["stdout"].splitlines()[0])["package-name"]
+
+
+@pytest.mark.parametrize(
+    ("line", "error"),
+    [
+        (b"invalid\n", "invalid request"),
+        (b'{"args": "-i"}\n', "invalid request"),
+        (b'{"args": [1]}\n', "invalid request"),
+        (b'{"args": ["serve", "--socket", "other"]}\n', "serve is not allowed"),
+        (b'{"args": ["watch", "-i", "."]}\n', "watch is not allowed"),
+        (b'{"args": ["--format", "arrow"]}\n', "arrow needs a binary output"),
+        (b'{"args": [], "cwd": "/missing"}\n', "Can't change directory"),
+    ],
+)
+def test_invalid_requests(server: "Path", line: bytes, error: str) -> None:
+    (response,) = request(server, line)
+    assert response["exit_code"] in {1, 2}
+    assert error in response["stderr"]
+
+
+def test_connect_errors(tmp_path: "Path", capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["--connect"]) == 2
+    assert "expected one argument" in capsys.readouterr().err
+
+    assert main(["--connect", str(tmp_path / "missing.sock")]) == 1
+    assert "Can't connect to server" in capsys.readouterr().err
+
+
+def test_serve(tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    def interrupt(*_: object) -> None:
+        raise KeyboardInterrupt
+
+    path = tmp_path / "scanner.sock"
+    monkeypatch.setattr(ScanServer, "serve_forever", interrupt)
+    assert main(["serve", "--socket", str(path)]) == 0
+    assert not path.exists()
+
+
+def test_serve_errors(tmp_path: "Path", capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["serve"]) == 2
+    assert "--socket" in capsys.readouterr().err
+
+    assert main(["serve", "--socket", str(tmp_path / "missing" / "s.sock")]) == 1
+    assert "Can't listen on" in capsys.readouterr().err
+
+
+def test_stale_socket(tmp_path: "Path") -> None:
+    path = tmp_path / "scanner.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+    assert path.is_socket()
+
+    with ScanServer(path):
+        pass
+
+    with ScanServer(path), pytest.raises(OSError, match="in use"):
+        ScanServer(path)
+
+
+def test_socket_is_private(tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "scanner.sock"
+    modes: list[int] = []
+    server_bind = ScanServer.server_bind
+
+    def recording(self: ScanServer) -> None:
+        server_bind(self)
+        modes.append(path.stat().st_mode & 0o777)
+
+    monkeypatch.setattr(ScanServer, "server_bind", recording)
+    umask = os.umask(0o022)
+    try:
+        with ScanServer(path):
+            pass
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+    assert modes == [0o600]
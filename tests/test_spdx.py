@@ -0,0 +1,94 @@
+import pytest
+
+from license_scanner import License, LicenseSource, LicenseState, spdx
+from license_scanner.spdx import And, Leaf, Or
+
+
+def test_canonicalize() -> None:
+    assert spdx.canonicalize("mit") == "MIT"
+    assert spdx.canonicalize("mit or apache-2.0") == "MIT OR Apache-2.0"
+    assert spdx.canonicalize("INVALID") is None
+
+
+def test_cache_info() -> None:
+    spdx.canonicalize.cache_clear()
+    for _ in range(3):
+        spdx.canonicalize("BSD-3-Clause")
+    spdx.canonicalize("INVALID")
+
+    info = spdx.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+    assert info.maxsize == spdx.CACHE_SIZE
+
+
+@pytest.mark.parametrize(
+    ("expression", "tree"),
+    [
+        ("mit", Leaf("MIT")),
+        ("GPL-2.0+", Leaf("GPL-2.0+")),
+        ("MIT OR Apache-2.0", Or((Leaf("MIT"), Leaf("Apache-2.0")))),
+        (
+            "(MIT OR Apache-2.0) AND BSD-3-Clause WITH LLVM-exception",
+            And(
+                (
+                    Or((Leaf("MIT"), Leaf("Apache-2.0"))),
+                    Leaf("BSD-3-Clause", "LLVM-exception"),
+                )
+            ),
+        ),
+        (
+            "MIT AND ISC OR Zlib",
+            Or((And((Leaf("MIT"), Leaf("ISC"))), Leaf("Zlib"))),
+        ),
+        (
+            "(MIT AND ISC) AND (Zlib OR (0BSD OR MIT-0))",
+            And(
+                (
+                    Leaf("MIT"),
+                    Leaf("ISC"),
+                    Or((Leaf("Zlib"), Leaf("0BSD"), Leaf("MIT-0"))),
+                )
+            ),
+        ),
+        ("INVALID", None),
+    ],
+)
+def test_parse(expression: str, tree: Leaf | And | Or | None) -> None:
+    assert spdx.parse(expression) == tree
+
+
+def test_parse_is_shared() -> None:
+    tree = spdx.parse("MIT OR Apache-2.0")
+    assert spdx.parse("mit or apache-2.0") is tree
+    assert spdx.parse("(MIT OR Apache-2.0)") == tree
+
+    lic = License("mit", LicenseSource.EXPRESSION, LicenseState.VALID, "MIT")
+    assert lic.expression is spdx.parse("MIT")
+    assert lic._replace(canonical=None).expression is None
+    assert lic._replace(confidence=0.9).expression is None
+
+
+def test_leaves() -> None:
+    tree = spdx.parse("(MIT OR Apache-2.0 WITH LLVM-exception) AND MIT")
+    assert tree is not None
+    assert [leaf.identifier for leaf in tree.leaves] == ["MIT", "Apache-2.0", "MIT"]
+    assert [leaf.exception for leaf in tree.leaves if leaf.exception] == [
+        "LLVM-exception"
+    ]
+
+
+@pytest.mark.parametrize(
+    ("allowed", "expected"),
+    [
+        ({"MIT", "BSD-3-Clause"}, True),
+        ({"Apache-2.0", "BSD-3-Clause"}, True),
+        ({"MIT"}, False),
+        ({"BSD-3-Clause"}, False),
+        (set(), False),
+    ],
+)
+def test_satisfiable(allowed: set[str], expected: bool) -> None:  # noqa: FBT001
+    tree = spdx.parse("(MIT OR Apache-2.0) AND BSD-3-Clause WITH LLVM-exception")
+    assert tree is not None
+    assert spdx.satisfiable(tree, allowed) is expected
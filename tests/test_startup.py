@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+# Cumulative import time of license_scanner.cli, in microseconds. The budget
+# is generous on purpose, it is meant to catch heavy imports sneaking into the
+# startup path rather than to measure small variations.
+IMPORT_BUDGET_US = 50_000
+
+DEFERRED_MODULES = (
+    "hashlib",
+    "importlib.metadata",
+    "json",
+    "packaging.licenses",
+    "trove_classifiers",
+)
+
+
+def importtime(code: str) -> dict[str, int]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    modules: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[module.strip()] = int(cumulative)
+    return modules
+
+
+def test_heavy_modules_are_deferred() -> None:
+    interpreter = importtime("pass")
+    for code in (
+        "import license_scanner.cli",
+        "from license_scanner.cli import main; main(['--help'])",
+    ):
+        imported = importtime(code).keys() - interpreter.keys()
+        assert imported.isdisjoint(DEFERRED_MODULES), code
+
+
+def test_import_budget() -> None:
+    elapsed = min(
+        importtime("import license_scanner.cli")["license_scanner.cli"]
+        for _ in range(3)
+    )
+    assert elapsed < IMPORT_BUDGET_US
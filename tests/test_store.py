@@ -0,0 +1,125 @@
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner.store import (
+    DirectoryStore,
+    LicenseStore,
+    PackStore,
+    StoreError,
+    open_store,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+DIGEST = "ab" + "0" * 62
+
+
+class CountingStore(LicenseStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[str] = []
+
+    def _exists(self, digest: str) -> bool:
+        return digest == "existing"
+
+    def _write(self, digest: str, text: str) -> None:  # noqa: ARG002
+        self.writes.append(digest)
+
+
+def test_each_digest_is_written_once() -> None:
+    store = CountingStore()
+    for digest in ["first", "first", "existing", "second", "first"]:
+        store.save(digest, "text")
+    assert store.writes == ["first", "second"]
+
+
+def test_base_store_is_abstract() -> None:
+    with pytest.raises(TypeError, match="abstract"):
+        LicenseStore()  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize(
+    ("layout", "expected"),
+    [("flat", f"{DIGEST}.txt"), ("sharded", f"ab/{DIGEST}.txt")],
+)
+def test_directory_store(layout: str, expected: str, tmp_path: "Path") -> None:
+    store = open_store(tmp_path, layout)
+    store.save(DIGEST, "license text")
+    store.close()
+
+    assert (tmp_path / expected).read_text() == "license text"
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [f"{DIGEST}.txt"]
+
+
+def test_directory_store_skips_existing_files(tmp_path: "Path") -> None:
+    (tmp_path / f"{DIGEST}.txt").write_text("already there")
+    DirectoryStore(tmp_path).save(DIGEST, "license text")
+    assert (tmp_path / f"{DIGEST}.txt").read_text() == "already there"
+
+
+def test_directory_store_errors(tmp_path: "Path") -> None:
+    (tmp_path / "ab").write_text("not a directory")
+    with pytest.raises(StoreError, match="Can't write license file"):
+        DirectoryStore(tmp_path, shard=True).save(DIGEST, "license text")
+
+    (tmp_path / f"{DIGEST}.txt").mkdir()
+    (tmp_path / f"{DIGEST}.txt" / "busy").touch()
+    with pytest.raises(StoreError, match="Can't write license file"):
+        DirectoryStore(tmp_path)._write(DIGEST, "license text")  # noqa: SLF001
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_pack_store(tmp_path: "Path") -> None:
+    store = open_store(tmp_path, "pack")
+    store.save(DIGEST, "license text")
+    store.save(DIGEST, "license text")
+    store.close()
+
+    store = PackStore(tmp_path / "licenses.zip")
+    store.save(DIGEST, "license text")
+    store.save("cd" + "0" * 62, "other license text")
+    store.close()
+    store.close()
+
+    with zipfile.ZipFile(tmp_path / "licenses.zip") as pack:
+        assert pack.namelist() == [f"{DIGEST}.txt", f"cd{'0' * 62}.txt"]
+        assert pack.read(f"{DIGEST}.txt") == b"license text"
+        assert pack.getinfo(f"{DIGEST}.txt").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_pack_store_errors(tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "licenses.zip").mkdir()
+    with pytest.raises(StoreError, match="Can't write license file"):
+        open_store(tmp_path, "pack").save(DIGEST, "license text")
+
+    # A pack damaged by an interrupted run, its central directory is unreadable
+    damaged = tmp_path / "damaged"
+    damaged.mkdir()
+    with zipfile.ZipFile(damaged / "licenses.zip", mode="w") as pack:
+        pack.writestr(f"{DIGEST}.txt", "license text")
+    data = bytearray((damaged / "licenses.zip").read_bytes())
+    data[data.index(b"PK\x01\x02") + 6] = 0xFF  # version needed to extract
+    (damaged / "licenses.zip").write_bytes(data)
+    with pytest.raises(StoreError, match="zip file version"):
+        open_store(damaged, "pack").save(DIGEST, "license text")
+
+    def bad_zip(*_: object, **__: object) -> None:
+        message = "Truncated file header"
+        raise zipfile.BadZipFile(message)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(zipfile, "ZipFile", bad_zip)
+        with pytest.raises(StoreError, match="Truncated file header"):
+            PackStore(tmp_path / "truncated.zip").save(DIGEST, "license text")
+
+    def writestr(*_: object) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(zipfile.ZipFile, "writestr", writestr)
+    store = PackStore(tmp_path / "other.zip")
+    with pytest.raises(StoreError, match="No space left on device"):
+        store.save(DIGEST, "license text")
+    store.close()
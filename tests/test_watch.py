@@ -0,0 +1,250 @@
+import os
+import threading
+from json import dumps as jsondumps
+from json import loads as jsonloads
+from typing import TYPE_CHECKING
+
+import pytest
+
+from license_scanner import watch as watch_module
+from license_scanner.cli import main
+from license_scanner.scanner import ScanError
+from license_scanner.watch import (
+    Change,
+    InotifyWatcher,
+    PollingWatcher,
+    Tracker,
+    watch,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def write(
+    directory: "Path", name: str, version: str = "1.0.0", spdx: str = "MIT"
+) -> None:
+    package = {"name": name, "version": version, "license_expression": spdx}
+    (directory / f"{name}.json").write_text(jsondumps(package))
+
+
+def install(environment: "Path", name: str, *, metadata: bool = True) -> "Path":
+    path = environment / f"{name}-1.0.0.dist-info"
+    path.mkdir()
+    if metadata:
+        (path / "METADATA").write_text(
+            f"Metadata-Version: 2.4\nName: {name}\nVersion: 1.0.0\n"
+            "License-Expression: MIT\n"
+        )
+    return path
+
+
+def summary(changes: list[Change]) -> list[tuple[str, str, str]]:
+    return [(c.change, c.package.name, c.package.version) for c in changes]
+
+
+def touch(path: "Path") -> None:
+    # Ensure a different mtime even on filesystems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_tracker(tmp_path: "Path") -> None:
+    write(tmp_path, "a-package")
+    write(tmp_path, "b-package")
+    (tmp_path / "ignored.txt").write_text("")
+    tracker = Tracker([tmp_path], site_packages=False)
+    assert summary(tracker.update()) == [
+        ("added", "a-package", "1.0.0"),
+        ("added", "b-package", "1.0.0"),
+    ]
+    assert tracker.update() == []
+
+    write(tmp_path, "a-package", spdx="Apache-2.0")
+    touch(tmp_path / "a-package.json")
+    write(tmp_path, "b-package", version="2.0.0")
+    touch(tmp_path / "b-package.json")
+    assert summary(tracker.update()) == [
+        ("changed", "a-package", "1.0.0"),
+        ("removed", "b-package", "1.0.0"),
+        ("added", "b-package", "2.0.0"),
+    ]
+
+    # Same licenses, nothing to report
+    write(tmp_path, "a-package", spdx="Apache-2.0")
+    touch(tmp_path / "a-package.json")
+    assert tracker.update([(tmp_path, "a-package.json")]) == []
+
+    (tmp_path / "a-package.json").unlink()
+    assert summary(tracker.update([(tmp_path, "a-package.json")])) == [
+        ("removed", "a-package", "1.0.0"),
+    ]
+    assert tracker.update([(tmp_path, "a-package.json")]) == []
+
+
+def test_tracker_pending(tmp_path: "Path") -> None:
+    (tmp_path / "partial.json").write_text('{"name": "partial"')
+    tracker = Tracker([tmp_path], site_packages=False)
+    assert tracker.update() == []
+    assert tracker.pending == {(tmp_path, "partial.json")}
+
+    (tmp_path / "partial.json").write_text('{"name": "partial"}')
+    assert summary(tracker.update([])) == [("added", "partial", "")]
+    assert not tracker.pending
+
+
+def test_tracker_site_packages(tmp_path: "Path") -> None:
+    tracker = Tracker([tmp_path], site_packages=True)
+    dist = install(tmp_path, "example", metadata=False)
+    (dist / "METADATA").mkdir()
+    assert tracker.update() == []
+    assert tracker.pending == {(tmp_path, dist.name)}
+    (dist / "METADATA").rmdir()
+
+    (dist / "PKG-INFO").write_text("Metadata-Version: 2.1\nName: example\nVersion: 1\n")
+    assert summary(tracker.update([])) == [("added", "example", "1")]
+
+    (dist / "PKG-INFO").unlink()
+    dist.rmdir()
+    assert summary(tracker.update([(tmp_path, dist.name)])) == [
+        ("removed", "example", "1"),
+    ]
+
+
+def test_inotify_watcher(tmp_path: "Path") -> None:
+    with InotifyWatcher([tmp_path]) as watcher:
+        assert watcher.wait(0) == set()
+        write(tmp_path, "example")
+        assert watcher.wait(1) == {(tmp_path, "example.json")}
+        # Events of the directory itself name no entry
+        tmp_path.chmod(0o700)
+        assert watcher.wait(1) == set()
+    watcher.close()
+
+
+def test_inotify_watcher_errors(
+    tmp_path: "Path", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with pytest.raises(FileNotFoundError):
+        InotifyWatcher([tmp_path / "missing"])
+
+    class Libc:
+        def __init__(self, *_: object, **__: object) -> None:
+            self.inotify_add_watch = lambda *_: -1
+
+        def inotify_init1(self, flags: int) -> int:
+            return -1 if flags else os.open(os.devnull, os.O_RDONLY)
+
+    monkeypatch.setattr("ctypes.CDLL", Libc)
+    with pytest.raises(OSError, match="inotify_init1 failed"):
+        InotifyWatcher([tmp_path])
+
+    monkeypatch.setattr("ctypes.CDLL", lambda *_, **__: object())
+    with pytest.raises(OSError, match="inotify is not available"):
+        InotifyWatcher([tmp_path])
+
+
+def test_polling_watcher() -> None:
+    with PollingWatcher(0.01) as watcher:
+        assert watcher.wait() is None
+        assert watcher.wait(0) is None
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watch(tmp_path: "Path", polling: bool) -> None:  # noqa: FBT001
+    write(tmp_path, "a-package")
+    changes = watch([tmp_path], interval=0.01, polling=polling)
+    assert summary(next(changes)) == [("added", "a-package", "1.0.0")]
+
+    write(tmp_path, "b-package")
+    assert summary(next(changes)) == [("added", "b-package", "1.0.0")]
+    changes.close()
+
+
+def test_watch_pending(tmp_path: "Path") -> None:
+    changes = watch([tmp_path], site_packages=True, interval=0.01)
+    assert next(changes) == []
+
+    dist = install(tmp_path, "example", metadata=False)
+    metadata = "Metadata-Version: 2.4\nName: example\nVersion: 1.0.0\n"
+    timer = threading.Timer(0.2, (dist / "METADATA").write_text, (metadata,))
+    timer.start()
+    try:
+        assert summary(next(changes)) == [("added", "example", "1.0.0")]
+    finally:
+        timer.join()
+        changes.close()
+
+
+def test_watch_errors(tmp_path: "Path") -> None:
+    directory = tmp_path / "watched"
+    directory.mkdir()
+    changes = watch([directory], interval=0.01, polling=True)
+    assert next(changes) == []
+    directory.rmdir()
+    with pytest.raises(ScanError, match="Can't watch"):
+        next(changes)
+
+
+@pytest.fixture
+def changes(monkeypatch: pytest.MonkeyPatch) -> list[list[Change]]:
+    batches: list[list[Change]] = []
+
+    def fake_watch(*_: object, **__: object) -> "Iterator[list[Change]]":
+        yield from batches
+        if batches:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch_module, "watch", fake_watch)
+    return batches
+
+
+def test_cli(
+    tmp_path: "Path", capsys: pytest.CaptureFixture[str], changes: list[list[Change]]
+) -> None:
+    write(tmp_path, "example")
+    tracker = Tracker([tmp_path], site_packages=False)
+    changes.append(tracker.update())
+    (tmp_path / "example.json").unlink()
+    changes.append(tracker.update())
+
+    assert main(["watch", "-i", str(tmp_path)]) == 0
+    records = [jsonloads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["package-name"], r["change"]) for r in records] == [
+        ("example", "added"),
+        ("example", "removed"),
+    ]
+    assert "environment" not in records[0]
+
+    args = ["watch", "--site-packages", str(tmp_path), "--poll", "--interval", "5"]
+    assert main(args) == 0
+    assert capsys.readouterr().out.count("\n") == 2
+
+    changes.clear()
+    assert main(["watch", "-i", str(tmp_path)]) == 0
+    assert not capsys.readouterr().out
+
+
+def test_cli_errors(
+    tmp_path: "Path",
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert main(["watch"]) == 2
+    assert "one of the arguments" in capsys.readouterr().err
+
+    assert main(["watch", "-i", str(tmp_path), "--interval", "0"]) == 2
+    assert "invalid interval" in capsys.readouterr().err
+
+    assert main(["watch", "-i", str(tmp_path), "--interval", "x"]) == 2
+    assert "invalid interval" in capsys.readouterr().err
+
+    def failing(*_: object, **__: object) -> "Iterator[list[Change]]":
+        message = "Can't watch the directory"
+        raise ScanError(message)
+        yield []
+
+    monkeypatch.setattr(watch_module, "watch", failing)
+    assert main(["watch", "-i", str(tmp_path), "-o", str(tmp_path / "out")]) == 1
+    assert "Can't watch the directory" in capsys.readouterr().err
@@ -0,0 +1,103 @@
+import io
+import json
+
+import pytest
+
+from license_scanner import writers
+from license_scanner.writers import (
+    COLUMNS,
+    write_arrow,
+    write_json,
+    write_ndjson,
+    write_tsv,
+)
+
+RECORDS = [
+    {
+        "package-name": "example-package",
+        "package-version": "1.0.0",
+        "license": "MIT",
+        "source": "Expression",
+        "state": "VALID",
+        "canonical": "MIT",
+    },
+    {
+        "package-name": "other-package",
+        "package-version": "2.0.0",
+        "license": "UNKNOWN",
+        "source": "Unknown",
+        "state": "UNKNOWN",
+        "canonical": None,
+    },
+]
+
+
+@pytest.mark.parametrize("records", [[], RECORDS[:1], RECORDS])
+def test_json_matches_json_dump(records: list[dict[str, str | None]]) -> None:
+    stream = io.StringIO()
+    write_json(iter(records), stream)
+    assert stream.getvalue() == json.dumps(records, indent=4)
+
+
+def test_ndjson() -> None:
+    stream = io.StringIO()
+    write_ndjson(iter(RECORDS), stream)
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_tsv() -> None:
+    stream = io.StringIO()
+    write_tsv(iter(RECORDS), stream)
+    assert stream.getvalue().splitlines() == [
+        "\t".join(COLUMNS),
+        "example-package\t1.0.0\tMIT\tExpression\tVALID\tMIT\t\t\t\t\t",
+        "other-package\t2.0.0\tUNKNOWN\tUnknown\tUNKNOWN\t\t\t\t\t\t",
+    ]
+
+    # Fields missing from the first record, or unknown, don't break the rows
+    stream = io.StringIO()
+    write_tsv(iter([RECORDS[0], {**RECORDS[1], "change": "removed", "x": 1}]), stream)
+    assert stream.getvalue().splitlines()[2].endswith("\tremoved")
+
+    stream = io.StringIO()
+    write_tsv(iter([]), stream)
+    assert stream.getvalue().splitlines() == ["\t".join(COLUMNS)]
+
+
+def test_arrow(monkeypatch: pytest.MonkeyPatch) -> None:
+    pa = pytest.importorskip("pyarrow")
+    records = [
+        {**record, "confidence": confidence}
+        for record, confidence in zip(
+            [*RECORDS, RECORDS[0]], [None, None, 0.9], strict=True
+        )
+    ]
+    monkeypatch.setattr(writers, "FLUSH_EVERY", 2)
+    stream = io.TextIOWrapper(io.BytesIO())
+    write_arrow(iter(records), stream)
+    table = pa.ipc.open_stream(stream.buffer.getvalue()).read_all()
+
+    for name in ("license", "source", "state"):
+        assert pa.types.is_dictionary(table.schema.field(name).type)
+    assert pa.types.is_string(table.schema.field("package-name").type)
+    assert pa.types.is_float64(table.schema.field("confidence").type)
+    assert table.column("state").num_chunks == 2
+    assert table.to_pylist() == records
+
+    stream = io.TextIOWrapper(io.BytesIO())
+    write_arrow(iter([]), stream)
+    assert pa.ipc.open_stream(stream.buffer.getvalue()).read_all().num_rows == 0
+
+
+def test_flush_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    class CountingStream(io.StringIO):
+        flushes = 0
+
+        def flush(self) -> None:
+            self.flushes += 1
+
+    monkeypatch.setattr(writers, "FLUSH_EVERY", 1)
+    stream = CountingStream()
+    write_ndjson(iter(RECORDS), stream)
+    assert stream.flushes == len(RECORDS) + 1